@@ -0,0 +1,99 @@
+"""
+Recall@k and latency of the IVF index against exact search.
+
+Generates a synthetic corpus of unit-length embeddings drawn around topic
+centres, which is how sentence embeddings of posts on a few dozen themes
+are distributed. It then builds an ``IVFIndex`` and compares its top-k
+with the exact top-k for a range of ``n_probe`` values, with and without
+a metadata filter.
+
+    python benchmarks/bench_ann_recall.py --rows 50000 --dim 384 --k 10
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.ann_index import ExactSearch, IVFIndex  # noqa: E402
+from src.utils.embedding_index import normalize_rows  # noqa: E402
+
+
+def make_corpus(rows: int, dim: int, topics: int, spread: float, seed: int = 0):
+    """Embeddings around ``topics`` random centres, plus near-duplicate queries."""
+    rng = np.random.default_rng(seed)
+    centres = normalize_rows(rng.standard_normal((topics, dim)))
+    labels = rng.integers(0, topics, size=rows)
+    matrix = normalize_rows(centres[labels] + spread * rng.standard_normal((rows, dim)) / np.sqrt(dim))
+    return matrix, labels, rng
+
+
+def recall_at_k(exact: List[List[int]], approximate: List[List[int]]) -> float:
+    """Fraction of the exact top-k neighbours the approximate search found."""
+    found = sum(len(set(a) & set(e)) for e, a in zip(exact, approximate))
+    total = sum(len(e) for e in exact)
+    return found / total if total else 1.0
+
+
+def _timed(search, queries, **kwargs):
+    start = time.perf_counter()
+    results = [search(query, **kwargs) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def run_benchmark(rows: int, dim: int, k: int, queries: int, topics: int = 64,
+                  spread: float = 1.5, probes=(1, 2, 4, 8, 16, 32)) -> Dict:
+    """
+    Build the index and measure recall@k and query latency.
+
+    Returns:
+        Dict: ``build_seconds``, ``exact_ms`` and per-``n_probe`` ``recall``/``ms``
+            rows, unfiltered and with a filter keeping about a third of the corpus
+    """
+    matrix, labels, rng = make_corpus(rows, dim, topics, spread)
+    query_rows = rng.choice(rows, size=queries, replace=False)
+    query_vectors = normalize_rows(matrix[query_rows] + 0.5 * rng.standard_normal((queries, dim)) / np.sqrt(dim))
+    mask = labels % 3 == 0
+
+    exact = ExactSearch(matrix)
+    start = time.perf_counter()
+    ivf = IVFIndex.build(matrix)
+    build_seconds = time.perf_counter() - start
+
+    results = {"rows": rows, "dim": dim, "k": k, "n_lists": ivf.n_lists, "build_seconds": build_seconds,
+               "unfiltered": [], "filtered": []}
+    for name, row_mask in (("unfiltered", None), ("filtered", mask)):
+        truth, exact_ms = _timed(exact.search, query_vectors, top_k=k, mask=row_mask)
+        results[f"{name}_exact_ms"] = exact_ms
+        for n_probe in probes:
+            if n_probe > ivf.n_lists:
+                break
+            found, ms = _timed(ivf.search, query_vectors, top_k=k, mask=row_mask, n_probe=n_probe)
+            results[name].append({"n_probe": n_probe, "recall": recall_at_k(truth, found), "ms": ms})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.dim, args.k, args.queries)
+    print(f"{results['rows']} rows x {results['dim']} dims, {results['n_lists']} lists, "
+          f"built in {results['build_seconds']:.1f}s")
+    for name in ("unfiltered", "filtered"):
+        print(f"\n{name}: exact {results[f'{name}_exact_ms']:.2f} ms/query")
+        print(f"{'n_probe':>8}{'recall@' + str(results['k']):>12}{'ms/query':>10}")
+        for row in results[name]:
+            print(f"{row['n_probe']:>8}{row['recall']:>12.3f}{row['ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Query latency of the BM25 fallback versus the old substring scoring.
+
+Builds a synthetic corpus by resampling words from the authentic posts,
+then times ``BM25Index.search`` and the previous fallback, which scored
+every post with ``topic in content`` and sorted the whole corpus, over the
+same topics.
+
+    python benchmarks/bench_bm25.py --posts 5000
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.bm25 import BM25Index  # noqa: E402
+
+TOPICS = ["hiring top talent", "leadership and sales strategy", "mental health", "conference action plan",
+          "onboarding new hires", "business strategy"]
+
+
+def make_corpus(path: Path, count: int, words_per_post: int = 150, seed: int = 0) -> List[Dict]:
+    """Write ``count`` synthetic posts built from the real posts' vocabulary."""
+    source = json.loads(Path("data_store/authentic_posts.json").read_text(encoding="utf-8"))["authentic_posts"]
+    words = " ".join(post["content"] for post in source).split()
+    topics = [post.get("metadata", {}).get("topic", "") for post in source]
+    rng = random.Random(seed)
+    posts = [{"post_id": str(i),
+              "content": " ".join(rng.choice(words) for _ in range(words_per_post)),
+              "metadata": {"topic": rng.choice(topics)}} for i in range(count)]
+    path.write_text(json.dumps({"authentic_posts": posts}), encoding="utf-8")
+    return posts
+
+
+def legacy_search(posts: List[Dict], topic: str, top_k: int) -> List[str]:
+    """The substring fallback previously inlined in ModelInterface."""
+    topic = topic.lower()
+
+    def score(post):
+        content = post.get("content", "").lower()
+        meta_topic = post.get("metadata", {}).get("topic", "").lower()
+        return int(topic in content or topic in meta_topic)
+
+    ranked = sorted(posts, key=score, reverse=True)
+    return [p["content"] for p in ranked if p.get("content")][:top_k]
+
+
+def run_benchmark(count: int, queries: int = 1000, top_k: int = 2) -> Dict[str, float]:
+    """
+    Time index build, reload and queries.
+
+    Returns:
+        Dict[str, float]: ``build_s``, ``load_s``, ``bm25_ms`` and ``legacy_ms`` per query
+    """
+    workdir = Path(tempfile.mkdtemp())
+    posts = make_corpus(workdir / "authentic_posts.json", count)
+
+    start = time.perf_counter()
+    BM25Index(workdir / "authentic_posts.json", workdir / "index").ensure()
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    index = BM25Index(workdir / "authentic_posts.json", workdir / "index").ensure()
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(queries):
+        index.search(TOPICS[i % len(TOPICS)], top_k)
+    bm25_ms = (time.perf_counter() - start) / queries * 1000
+
+    legacy_queries = max(1, queries // 20)
+    start = time.perf_counter()
+    for i in range(legacy_queries):
+        legacy_search(posts, TOPICS[i % len(TOPICS)], top_k)
+    legacy_ms = (time.perf_counter() - start) / legacy_queries * 1000
+    return {"build_s": build, "load_s": load, "bm25_ms": bm25_ms, "legacy_ms": legacy_ms}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.posts, args.queries)
+    print(f"{args.posts} posts: build {results['build_s']:.2f}s, reload {results['load_s'] * 1000:.1f} ms")
+    print(f"BM25 query:      {results['bm25_ms']:.3f} ms")
+    print(f"substring query: {results['legacy_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Stress benchmark for concurrent feedback writes.
+
+Starts several writer processes, each with several threads, that append to
+the same feedback history while the log is compacted repeatedly, and bumps
+a counter in a shared JSON document through ``update_json``. Afterwards it
+checks that every append is present exactly once and that no counter
+increment was lost.
+
+    python benchmarks/bench_concurrent_writes.py --processes 8 --threads 4 --writes 500
+
+``--legacy`` runs the old load/append/rewrite pattern on a plain JSON file
+for comparison.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.storage import JsonlStore, update_json  # noqa: E402
+
+
+def _increment(data):
+    data["count"] += 1
+    return data
+
+
+def _writer(workdir: str, process_id: int, threads: int, writes: int, compact_bytes: int) -> None:
+    store = JsonlStore(Path(workdir) / "feedback.json", compact_bytes=compact_bytes)
+    counter = Path(workdir) / "counter.json"
+
+    def run(thread_id):
+        for seq in range(writes):
+            store.append("feedback", {"writer": f"{process_id}-{thread_id}", "seq": seq})
+            if seq % 10 == 0:
+                update_json(counter, _increment, default={"count": 0})
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    store.flush()
+
+
+def _legacy_writer(workdir: str, process_id: int, threads: int, writes: int, compact_bytes: int) -> None:
+    path = Path(workdir) / "feedback.json"
+
+    def run(thread_id):
+        for seq in range(writes):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = {"feedback": []}
+            data["feedback"].append({"writer": f"{process_id}-{thread_id}", "seq": seq})
+            with open(path, 'w') as f:
+                json.dump(data, f)
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+
+def run_benchmark(workdir: str, processes: int, threads: int, writes: int,
+                  compact_bytes: int = 64 * 1024, legacy: bool = False) -> dict:
+    """
+    Run the stress test in ``workdir`` and verify the results.
+
+    Returns:
+        dict: Expected/stored/lost/duplicated entry counts, counter totals and timing
+    """
+    target = _legacy_writer if legacy else _writer
+    start = time.perf_counter()
+    workers = [multiprocessing.Process(target=target, args=(workdir, p, threads, writes, compact_bytes))
+               for p in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    if legacy:
+        try:
+            with open(Path(workdir) / "feedback.json") as f:
+                entries = json.load(f)["feedback"]
+        except (FileNotFoundError, json.JSONDecodeError):
+            entries = []
+        counter_expected = counter_actual = 0
+    else:
+        entries = list(JsonlStore(Path(workdir) / "feedback.json").iter("feedback"))
+        with open(Path(workdir) / "counter.json") as f:
+            counter_actual = json.load(f)["count"]
+        counter_expected = processes * threads * len(range(0, writes, 10))
+
+    expected = processes * threads * writes
+    seen = Counter((entry["writer"], entry["seq"]) for entry in entries)
+    return {
+        "expected": expected,
+        "stored": len(entries),
+        "lost": expected - len(seen),
+        "duplicated": sum(n - 1 for n in seen.values() if n > 1),
+        "counter_expected": counter_expected,
+        "counter_actual": counter_actual,
+        "seconds": elapsed,
+        "writes_per_second": expected / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent feedback write stress test")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=500, help="appends per thread")
+    parser.add_argument("--compact-bytes", type=int, default=64 * 1024,
+                        help="compaction threshold; small values force frequent compactions")
+    parser.add_argument("--legacy", action="store_true", help="benchmark the old read-modify-write pattern")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        result = run_benchmark(workdir, args.processes, args.threads, args.writes,
+                               args.compact_bytes, args.legacy)
+
+    print(f"{args.processes} processes x {args.threads} threads x {args.writes} writes"
+          f"{' (legacy)' if args.legacy else ''}")
+    print(f"  stored {result['stored']}/{result['expected']} entries, "
+          f"lost {result['lost']}, duplicated {result['duplicated']}")
+    if not args.legacy:
+        print(f"  counter {result['counter_actual']}/{result['counter_expected']}")
+    print(f"  {result['seconds']:.2f}s, {result['writes_per_second']:.0f} appends/s")
+    ok = result["lost"] == 0 and result["duplicated"] == 0 and \
+        result["counter_actual"] == result["counter_expected"]
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
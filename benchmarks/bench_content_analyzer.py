@@ -0,0 +1,198 @@
+"""
+Analysis time of the vectorized ``ContentAnalyzer.analyze`` versus the old loop.
+
+The old ``analyze`` walked the post list once per metric, once to score
+posts, once per content type for success rates and rebuilt the stopword
+list for every word. This generates a synthetic corpus by resampling the
+authentic posts, runs both implementations into separate output
+directories, checks that the results and CSV files are identical and
+reports the time taken by each.
+
+    python benchmarks/bench_content_analyzer.py --posts 100000
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics.run_analysis import ContentAnalyzer, logger  # noqa: E402
+
+CONTENT_TYPES = ["text", "text/image", "Text w/Image", "video", "article", None]
+
+
+class LegacyContentAnalyzer(ContentAnalyzer):
+    """``ContentAnalyzer`` with the per-post loops of the old ``analyze``, kept verbatim."""
+
+    def analyze(self) -> Dict[str, Any]:
+        """Run analysis on the loaded post data."""
+        if not self.post_data:
+            logger.warning("No data to analyze")
+            return self._create_empty_analysis()
+        
+        # Extract basic stats
+        total_posts = len(self.post_data)
+        
+        # Extract engagement metrics
+        likes = [post.get("metrics", {}).get("likes", 0) for post in self.post_data]
+        comments = [post.get("metrics", {}).get("comments", 0) for post in self.post_data]
+        shares = [post.get("metrics", {}).get("shares", 0) for post in self.post_data]
+        
+        avg_likes = sum(likes) / total_posts if total_posts > 0 else 0
+        avg_comments = sum(comments) / total_posts if total_posts > 0 else 0
+        avg_shares = sum(shares) / total_posts if total_posts > 0 else 0
+        
+        # Analyze content types
+        content_types = [post.get("content_type", "unknown").lower() for post in self.post_data]
+        content_type_counter = Counter(content_types)
+        
+        # Extract topics using simple keyword extraction
+        topics = []
+        for post in self.post_data:
+            content = post.get("content", "")
+            if content:
+                # Simple extraction of topics using keywords
+                words = re.findall(r'\b[a-zA-Z]{4,}\b', content.lower())
+                topics.extend([w for w in words if w not in self._get_stopwords()])
+        
+        topic_counter = Counter(topics)
+        
+        # Calculate engagement scores and identify top posts
+        posts_with_scores = []
+        for post in self.post_data:
+            engagement = post.get("metrics", {})
+            score = engagement.get("likes", 0) + 2 * engagement.get("comments", 0) + 3 * engagement.get("shares", 0)
+            posts_with_scores.append({
+                "post_id": post.get("post_id", "unknown"),
+                "content": post.get("content", ""),
+                "content_type": post.get("content_type", "unknown"),
+                "likes": engagement.get("likes", 0),
+                "comments": engagement.get("comments", 0),
+                "shares": engagement.get("shares", 0),
+                "engagement_score": score
+            })
+        
+        # Sort posts by engagement score
+        top_posts = sorted(posts_with_scores, key=lambda x: x["engagement_score"], reverse=True)[:5]
+        
+        # Add rank to top posts
+        for i, post in enumerate(top_posts):
+            post["rank"] = i + 1
+        
+        # Calculate success rates by content type
+        success_rates = []
+        for content_type, count in content_type_counter.items():
+            if count > 0:
+                # A post is successful if it has above-average engagement
+                successful_posts = sum(1 for post in self.post_data 
+                    if post.get("content_type", "").lower() == content_type
+                    and (post.get("metrics", {}).get("likes", 0) > avg_likes 
+                         or post.get("metrics", {}).get("comments", 0) > avg_comments))
+                
+                success_rate = (successful_posts / count) * 100
+                success_rates.append({
+                    "content_type": content_type,
+                    "total_posts": count,
+                    "successful_posts": successful_posts,
+                    "success_rate": success_rate
+                })
+        
+        # Compile analysis results
+        self.analysis_results = {
+            "total_posts": total_posts,
+            "average_engagement": {
+                "likes": avg_likes,
+                "comments": avg_comments,
+                "shares": avg_shares
+            },
+            "content_type_distribution": content_type_counter,
+            "top_topics": topic_counter.most_common(20),
+            "analysis_timestamp": datetime.now().isoformat()
+        }
+        
+        # Save top posts data
+        top_posts_df = pd.DataFrame(top_posts)
+        if not top_posts_df.empty:
+            top_posts_df.to_csv(self.output_dir / "top_posts.csv", index=False)
+        
+        # Save success rates data
+        success_rates_df = pd.DataFrame(success_rates)
+        if not success_rates_df.empty:
+            success_rates_df.to_csv(self.output_dir / "success_rates.csv", index=False)
+        
+        return self.analysis_results
+
+
+def make_posts(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``count`` posts in the ``linkedin_posts.json`` format with words drawn from the authentic posts."""
+    source = json.loads(Path("data_store/authentic_posts.json").read_text(encoding="utf-8"))["authentic_posts"]
+    words = " ".join(post["content"] for post in source).split()
+    rng = random.Random(seed)
+    posts = []
+    for i in range(count):
+        content = " ".join(rng.choice(words) for _ in range(rng.randint(0, 200)))
+        post = {"post_id": str(i), "content": content,
+                "metrics": {"likes": rng.randint(0, 60), "comments": rng.randint(0, 12),
+                            "shares": rng.randint(0, 4)}}
+        content_type = rng.choice(CONTENT_TYPES)
+        if content_type is not None:
+            post["content_type"] = content_type
+        posts.append(post)
+    return posts
+
+
+def _run(analyzer_class, posts: List[Dict[str, Any]], output_dir: Path):
+    analyzer = analyzer_class(output_dir=str(output_dir))
+    analyzer.post_data = posts
+    start = time.perf_counter()
+    results = analyzer.analyze()
+    return results, time.perf_counter() - start
+
+
+def same_output(a: Dict[str, Any], a_dir: Path, b: Dict[str, Any], b_dir: Path) -> bool:
+    """Results (apart from the timestamp) and both CSV files are identical."""
+    strip = lambda results: json.dumps({k: v for k, v in results.items() if k != "analysis_timestamp"})  # noqa: E731
+    files = all((a_dir / name).read_bytes() == (b_dir / name).read_bytes()
+                for name in ("top_posts.csv", "success_rates.csv"))
+    return strip(a) == strip(b) and files
+
+
+def run_benchmark(count: int) -> Dict[str, Any]:
+    """
+    Analyze ``count`` synthetic posts with both implementations.
+
+    Returns:
+        Dict[str, Any]: ``legacy_s``, ``vectorized_s`` and ``identical``
+    """
+    posts = make_posts(count)
+    workdir = Path(tempfile.mkdtemp())
+    legacy, legacy_s = _run(LegacyContentAnalyzer, posts, workdir / "legacy")
+    current, current_s = _run(ContentAnalyzer, posts, workdir / "vectorized")
+    return {"legacy_s": legacy_s, "vectorized_s": current_s,
+            "identical": same_output(legacy, workdir / "legacy", current, workdir / "vectorized")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.posts)
+    print(f"{args.posts} posts (identical output: {results['identical']})")
+    print(f"legacy analyze:     {results['legacy_s']:.2f}s")
+    print(f"vectorized analyze: {results['vectorized_s']:.2f}s "
+          f"({results['legacy_s'] / results['vectorized_s']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Per-rerun data loading time of the dashboard as the analysed corpus grows.
+
+For each corpus size this analyses synthetic posts with ``ContentAnalyzer``
+(which also writes the figure specs) and then times what a dashboard rerun
+does before rendering:
+
+- previously: read ``analysis_results.json`` and both CSV files and
+  rebuild the Plotly figures;
+- now: ask the process-wide ``DashboardData`` for the same data, which
+  only stats the files while they are unchanged.
+
+The first ``DashboardData`` call (the first rerun after a new analysis) is
+reported separately.
+
+    python benchmarks/bench_dashboard.py --posts 1000 10000 100000
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_content_analyzer import make_posts  # noqa: E402
+from src.analytics.dashboard_data import (  # noqa: E402
+    RESULTS_FILE, SUCCESS_RATES_FILE, TOP_POSTS_FILE, DashboardData, build_figure_specs
+)
+from src.analytics.run_analysis import ContentAnalyzer  # noqa: E402
+
+
+def legacy_rerun(analysis_dir: Path) -> None:
+    """The loading and figure building previously done by every rerun."""
+    with open(analysis_dir / RESULTS_FILE, "r") as f:
+        analysis = json.load(f)
+    pd.read_csv(analysis_dir / TOP_POSTS_FILE)
+    success_rates = pd.read_csv(analysis_dir / SUCCESS_RATES_FILE)
+    build_figure_specs(analysis, success_rates)
+
+
+def cached_rerun(data: DashboardData) -> None:
+    data.analysis()
+    data.top_posts()
+    data.success_rates()
+    data.figures()
+
+
+def _median_ms(func, reruns: int) -> float:
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run_benchmark(sizes: List[int], reruns: int = 20) -> Dict[int, Dict[str, float]]:
+    """
+    Analyse each corpus size and time dashboard reruns over its output.
+
+    Returns:
+        Dict[int, Dict[str, float]]: Per size ``analysis_s``, ``legacy_ms``,
+            ``first_ms`` and ``cached_ms`` (medians over ``reruns``)
+    """
+    results = {}
+    for size in sizes:
+        analysis_dir = Path(tempfile.mkdtemp())
+        analyzer = ContentAnalyzer(output_dir=str(analysis_dir))
+        analyzer.post_data = make_posts(size)
+        start = time.perf_counter()
+        analyzer.analyze()
+        analyzer.save_analysis()
+        analysis_s = time.perf_counter() - start
+
+        data = DashboardData(analysis_dir)
+        start = time.perf_counter()
+        cached_rerun(data)
+        first_ms = (time.perf_counter() - start) * 1000
+        results[size] = {"analysis_s": analysis_s,
+                         "legacy_ms": _median_ms(lambda: legacy_rerun(analysis_dir), reruns),
+                         "first_ms": first_ms,
+                         "cached_ms": _median_ms(lambda: cached_rerun(data), reruns)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.posts, args.reruns)
+    print(f"{'posts':>8} {'analysis':>9} {'legacy rerun':>13} {'first load':>11} {'cached rerun':>13}")
+    for size, stats in results.items():
+        print(f"{size:>8} {stats['analysis_s']:>8.2f}s {stats['legacy_ms']:>11.2f}ms "
+              f"{stats['first_ms']:>9.2f}ms {stats['cached_ms']:>11.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Cold-start import time and memory of each entry point.
+
+Every entry point is imported in a fresh interpreter run with
+``python -X importtime``. It reports:
+
+- the wall time of the import;
+- the cumulative time of the slowest top-level imports from the
+  importtime trace;
+- peak RSS;
+- which of the heavy optional dependencies (sklearn, pandas,
+  linkedin_api, spaCy, NLTK) were loaded.
+
+Entry points that cannot be imported here (e.g. ``chat_app.py`` without
+streamlit) are reported as skipped. With ``--output`` each run is appended
+as a JSON line, so start-up regressions can be tracked over time.
+
+    python benchmarks/bench_import_time.py --repeat 3 --output import_time.jsonl
+"""
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("sklearn", "pandas", "linkedin_api", "spacy", "nltk")
+
+# What each entry point imports before it starts serving: the script itself
+# plus the app module uvicorn/streamlit load from it.
+ENTRY_POINTS: Dict[str, str] = {
+    "app.py": "import app",
+    "chat_app.py": "import chat_app",
+    "src/run_webhook.py": "import src.run_webhook, src.api.make_webhook",
+    "run_analytics.py": "import run_analytics; sys.path.append('src'); import analytics.run_analysis",
+}
+
+_PROBE = """
+import sys, time, resource, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def parse_importtime(trace: str, top: int = 5) -> List[Tuple[str, float]]:
+    """Slowest top-level imports (cumulative ms) from ``-X importtime`` output."""
+    rows = []
+    for line in trace.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and name.startswith(" ") and not name.startswith("  "):
+            rows.append((name.strip(), int(cumulative) / 1000))
+    return sorted(rows, key=lambda row: -row[1])[:top]
+
+
+def measure(statement: str) -> Dict:
+    """Import ``statement`` in a fresh interpreter; ``{"error": ...}`` if it fails."""
+    probe = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["slowest"] = parse_importtime(result.stderr)
+    return stats
+
+
+def run_benchmark(repeat: int = 3) -> Dict[str, Dict]:
+    """
+    Measure every entry point, keeping the fastest of ``repeat`` runs.
+
+    Returns:
+        Dict[str, Dict]: Per entry point ``seconds``, ``rss_mb``, ``heavy`` and
+            ``slowest``, or ``error`` when it could not be imported
+    """
+    results = {}
+    for name, statement in ENTRY_POINTS.items():
+        runs = [measure(statement) for _ in range(repeat)]
+        ok = [run for run in runs if "error" not in run]
+        results[name] = min(ok, key=lambda run: run["seconds"]) if ok else runs[0]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Append the results to this JSONL file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repeat)
+    for name, stats in results.items():
+        if "error" in stats:
+            print(f"{name:<20} skipped: {stats['error']}")
+            continue
+        slowest = ", ".join(f"{module} {ms:.0f}ms" for module, ms in stats["slowest"][:3])
+        print(f"{name:<20} {stats['seconds'] * 1000:7.0f} ms {stats['rss_mb']:7.1f} MB RSS  "
+              f"heavy: {', '.join(stats['heavy']) or '-'}  ({slowest})")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": datetime.now().isoformat(), "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
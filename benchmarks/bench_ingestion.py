@@ -0,0 +1,93 @@
+"""
+Load time of the streaming CSV ingestion versus the old ``load_data.py`` path.
+
+Builds a synthetic export by resampling rows of the ``data`` CSV (keeping
+its blank first row, multi-line quoted bodies and "3,593"-style counts)
+and times the previous ``pd.read_csv(engine='python')`` load plus numeric
+coercion against ``ingest_csv`` (cold) and ``load_posts_frame`` reading
+the ``.npz`` cache (warm).
+
+    python benchmarks/bench_ingestion.py --rows 100000
+"""
+import argparse
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import ingestion  # noqa: E402
+from src.utils.ingestion import ingest_csv, load_posts_frame  # noqa: E402
+
+
+def make_csv(path: Path, rows: int, source: Path = Path("data"), seed: int = 0) -> None:
+    """Write ``rows`` records resampled from the real export."""
+    with open(source, newline="", encoding="utf-8") as f:
+        records = list(csv.reader(f))
+    header_row = next(i for i, fields in enumerate(records) if "POST_ID" in fields)
+    header, body = records[header_row], [r for r in records[header_row + 1:] if any(r)]
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] * len(header))
+        writer.writerow(header)
+        for i in range(rows):
+            row = list(rng.choice(body))
+            row[0] = str(i)
+            writer.writerow(row)
+
+
+def legacy_load(path: Path) -> pd.DataFrame:
+    """The parsing previously done by ``load_data.load_linkedin_data``."""
+    df = pd.read_csv(path, skiprows=1, encoding="utf-8", engine="python", on_bad_lines="skip")
+    for column in ("LIKES", "COMMENTS", "SHARES"):
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+def run_benchmark(rows: int) -> Dict[str, float]:
+    """
+    Time the three loading paths.
+
+    Returns:
+        Dict[str, float]: ``legacy_s``, ``ingest_s`` and ``cached_s``
+    """
+    workdir = Path(tempfile.mkdtemp())
+    csv_path = workdir / "posts.csv"
+    make_csv(csv_path, rows)
+
+    start = time.perf_counter()
+    legacy_load(csv_path)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ingest_csv(csv_path, workdir / "cache")
+    ingest = time.perf_counter() - start
+
+    ingestion._frames.clear()
+    start = time.perf_counter()
+    load_posts_frame(csv_path, workdir / "cache")
+    cached = time.perf_counter() - start
+    return {"legacy_s": legacy, "ingest_s": ingest, "cached_s": cached}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows)
+    print(f"{args.rows} rows")
+    print(f"read_csv(engine='python'): {results['legacy_s']:.2f}s")
+    print(f"ingest_csv (cold):         {results['ingest_s']:.2f}s")
+    print(f"load_posts_frame (cached): {results['cached_s']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
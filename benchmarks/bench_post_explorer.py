@@ -0,0 +1,120 @@
+"""
+Page query latency of the dashboard's post explorer at a million posts.
+
+Writes a synthetic scored corpus with ``write_post_index`` and times page
+queries for each sort order, alone and combined with the content type,
+topic, date and score filters. It walks ``--pages`` pages deep with the
+keyset cursor and compares the deepest page with the same page fetched
+by ``OFFSET``.
+
+    python benchmarks/bench_post_explorer.py --posts 1000000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics.post_explorer import COLUMNS, SORTS, PostExplorer, write_post_index  # noqa: E402
+
+CONTENT_TYPES = ["text-only", "text w/image", "video", "article", "carousel", None]
+TOPICS = ["educational content", "personal stories", "company culture", "career advice",
+          "industry news", "product launch", "hiring", None]
+
+FILTERS = {
+    "none": {},
+    "content type": {"content_type": "video"},
+    "topic": {"topic": "hiring"},
+    "type + topic": {"content_type": "article", "topic": "career advice"},
+    "one week": {"date_from": "2025-03-01", "date_to": "2025-03-07"},
+    "min score": {"min_score": 150},
+    "all filters": {"content_type": "text-only", "topic": "company culture", "date_from": "2025-01-01",
+                    "date_to": "2025-06-30", "min_score": 100},
+    "no match": {"content_type": "video", "min_score": 10 ** 6}
+}
+
+
+def make_posts(count: int, seed: int = 0) -> pd.DataFrame:
+    """``count`` scored posts spread over two years."""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    likes = [rng.randint(0, 120) for _ in range(count)]
+    comments = [rng.randint(0, 20) for _ in range(count)]
+    shares = [rng.randint(0, 8) for _ in range(count)]
+    return pd.DataFrame({
+        "post_id": [str(i) for i in range(count)],
+        "content": [f"Post {i} about {rng.choice(TOPICS) or 'work'}" for i in range(count)],
+        "content_type": [rng.choice(CONTENT_TYPES) for _ in range(count)],
+        "topic": [rng.choice(TOPICS) for _ in range(count)],
+        "date": [(start + timedelta(days=rng.randint(0, 729))).isoformat() for _ in range(count)],
+        "likes": likes,
+        "comments": comments,
+        "shares": shares,
+        "engagement_score": [l + 2 * c + 3 * s for l, c, s in zip(likes, comments, shares)]
+    })
+
+
+def _ms(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_benchmark(posts: int, pages: int = 200, page_size: int = 25) -> Dict[str, float]:
+    """
+    Build the index and time page queries.
+
+    Returns:
+        Dict[str, float]: ``build_s``, ``first_page_ms`` per filter and sort,
+            ``keyset_deep_ms`` and ``offset_deep_ms``
+    """
+    db_path = Path(tempfile.mkdtemp()) / "posts.db"
+    frame = make_posts(posts)
+    start = time.perf_counter()
+    write_post_index(db_path, frame)
+    results: Dict[str, float] = {"build_s": time.perf_counter() - start}
+
+    explorer = PostExplorer(db_path, timeout_ms=10 ** 6)
+    explorer.page()
+    for name, filters in FILTERS.items():
+        for sort in SORTS:
+            times = [_ms(lambda: explorer.page(sort=sort, page_size=page_size, **filters)) for _ in range(5)]
+            results[f"{name} / {sort}"] = statistics.median(times)
+
+    cursor, deep = None, 0.0
+    for _ in range(pages):
+        page_start = time.perf_counter()
+        cursor = explorer.page(after=cursor, page_size=page_size)["next"]
+        deep = (time.perf_counter() - page_start) * 1000
+    results["keyset_deep_ms"] = deep
+    query = (f"SELECT id, {', '.join(COLUMNS)} FROM posts ORDER BY engagement_score DESC, id DESC "
+             f"LIMIT ? OFFSET ?")
+    results["offset_deep_ms"] = _ms(
+        lambda: explorer._connection().execute(query, (page_size, (pages - 1) * page_size)).fetchall())
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.posts, args.pages)
+    print(f"{args.posts} posts, index built in {results.pop('build_s'):.1f}s")
+    keyset, offset = results.pop("keyset_deep_ms"), results.pop("offset_deep_ms")
+    for name, ms in results.items():
+        print(f"{name:<32} {ms:8.2f} ms")
+    print(f"page {args.pages}: keyset {keyset:.2f} ms, OFFSET {offset:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
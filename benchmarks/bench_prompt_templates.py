@@ -0,0 +1,305 @@
+"""
+Render throughput of the compiled prompt templates versus the old ones.
+
+The old ``PromptTemplates`` rebuilt a defaults dict and re-parsed the
+template string with ``str.format`` on every call. This renders each of the
+five templates with the same contexts through both implementations, checks
+that the output is identical and reports renders per second.
+
+    python benchmarks/bench_prompt_templates.py --iterations 20000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.prompts import PromptTemplates  # noqa: E402
+
+
+class LegacyPromptTemplates:
+    """The per-call ``str.format`` templates, kept verbatim for comparison."""
+    
+    @staticmethod
+    def get_text_post_template(context: Optional[Dict] = None) -> str:
+        """Template for generating text-only LinkedIn posts using authentic examples and brand brief, with explicit anti-generic instructions."""
+        safe_context = context or {}
+        defaults = {
+            "industry": "Leadership Development",
+            "target_audience": "Business professionals",
+            "purpose": "Thought leadership",
+            "tone": "Professional",
+            "topic": "Leadership",
+            "cta_type": "Ask a question",
+            "authentic_examples": [],
+            "brand_mission": "",
+            "brand_voice": "",
+            "key_message": ""
+        }
+        for key, value in defaults.items():
+            if key not in safe_context or not safe_context[key]:
+                safe_context[key] = value
+
+        # Prepare authentic examples (few-shot)
+        example_section = ""
+        if safe_context["authentic_examples"]:
+            example_section = "Here are several real LinkedIn posts from my account. Carefully study their style, structure, and voice.\n"
+            for i, ex in enumerate(safe_context["authentic_examples"][:4]):
+                example_section += f"Example {i+1}:\n{ex}\n---\n"
+
+        base_template = f"""
+        {example_section}
+        Now, write a new LinkedIn post in the exact same style, length, and formatting as the examples above, about: {{topic}}
+        - Do NOT use generic LinkedIn language or platitudes.
+        - Do NOT use vague or overly formal phrases.
+        - Use the same sentence length, formatting, and voice as the examples above.
+        - Use specific anecdotes, humor, or directness as in the examples.
+        - Use a {{tone}} tone and speak directly to {{target_audience}}.
+        - Reference our brand's mission: {{brand_mission}}
+        - Key message: {{key_message}}
+        - Incorporate our brand voice: {{brand_voice}}
+        - End with a relevant call-to-action: {{cta_type}}
+        - Make it authentic, specific, and aligned with our brand.
+        """
+        try:
+            return base_template.format(**safe_context)
+        except KeyError as e:
+            return f"Error in template formatting: Missing key {e}"
+    
+    @staticmethod
+    def get_media_post_template(context: Optional[Dict] = None) -> str:
+        """Template for generating LinkedIn posts with media."""
+        # Provide default values for missing context
+        safe_context = context or {}
+        defaults = {
+            "industry": "Leadership Development",
+            "media_type": "Image",
+            "target_audience": "Business professionals",
+            "purpose": "Thought leadership",
+            "tone": "Professional",
+            "topic": "Leadership",
+            "cta_type": "Ask a question"
+        }
+        
+        # Merge defaults with provided context
+        for key, value in defaults.items():
+            if key not in safe_context or not safe_context[key]:
+                safe_context[key] = value
+        
+        base_template = """
+        You are an expert LinkedIn content creator specializing in visual content. Create a LinkedIn post with media using these specifications:
+        
+        Industry: {industry}
+        Media Type: {media_type}
+        Target Audience: {target_audience}
+        Post Purpose: {purpose}
+        Desired Tone: {tone}
+        Key Topic: {topic}
+        Call-to-Action: {cta_type}
+        
+        The post should include:
+        - A compelling caption
+        - Description of the visual content
+        - Clear value proposition
+        - Relevant hashtags
+        - Optimized for LinkedIn's algorithm
+        
+        Generate a post that effectively combines text and visual elements.
+        """
+        
+        try:
+            return base_template.format(**safe_context)
+        except KeyError as e:
+            return f"Error in template formatting: Missing key {e}"
+    
+    @staticmethod
+    def get_article_template(context: Optional[Dict] = None) -> str:
+        """Template for generating LinkedIn articles."""
+        # Provide default values for missing context
+        safe_context = context or {}
+        defaults = {
+            "industry": "Leadership Development",
+            "target_audience": "Business professionals",
+            "purpose": "Thought leadership",
+            "tone": "Professional",
+            "topic": "Leadership",
+            "key_points": ["Point 1", "Point 2", "Point 3"]
+        }
+        
+        # Merge defaults with provided context
+        for key, value in defaults.items():
+            if key not in safe_context or not safe_context[key]:
+                safe_context[key] = value
+        
+        base_template = """
+        You are an expert LinkedIn thought leader. Create a comprehensive LinkedIn article with these specifications:
+        
+        Industry: {industry}
+        Target Audience: {target_audience}
+        Article Purpose: {purpose}
+        Desired Tone: {tone}
+        Main Topic: {topic}
+        Key Points: {key_points}
+        
+        The article should:
+        - Provide deep insights
+        - Be well-structured
+        - Include data and examples
+        - Offer actionable takeaways
+        - Maintain professional tone
+        - Be optimized for LinkedIn's algorithm
+        
+        Generate a thought-provoking article that establishes authority in the field.
+        """
+        
+        try:
+            return base_template.format(**safe_context)
+        except KeyError as e:
+            return f"Error in template formatting: Missing key {e}"
+    
+    @staticmethod
+    def get_optimization_template(context: Optional[Dict] = None) -> str:
+        """Template for optimizing existing content."""
+        # Provide default values for missing context
+        safe_context = context or {}
+        defaults = {
+            "content": "This is a sample content that needs optimization.",
+            "target_metrics": ["engagement", "readability"],
+            "industry": "Leadership Development",
+            "target_audience": "Business professionals"
+        }
+        
+        # Merge defaults with provided context
+        for key, value in defaults.items():
+            if key not in safe_context or not safe_context[key]:
+                safe_context[key] = value
+        
+        base_template = """
+        You are a LinkedIn content optimization expert. Review and enhance this content:
+        
+        Original Content: {content}
+        Target Metrics: {target_metrics}
+        Industry: {industry}
+        Audience: {target_audience}
+        
+        Optimize the content for:
+        - Higher engagement
+        - Better readability
+        - Improved SEO
+        - Stronger call-to-action
+        - Better alignment with LinkedIn's algorithm
+        
+        Provide the optimized version of the content.
+        """
+        
+        try:
+            return base_template.format(**safe_context)
+        except KeyError as e:
+            return f"Error in template formatting: Missing key {e}"
+    
+    @staticmethod
+    def get_analysis_template(context: Optional[Dict] = None) -> str:
+        """Template for analyzing content performance."""
+        # Provide default values for missing context
+        safe_context = context or {}
+        defaults = {
+            "content": "This is a sample content that needs analysis.",
+            "content_type": "text",
+            "industry": "Leadership Development",
+            "target_audience": "Business professionals"
+        }
+        
+        # Merge defaults with provided context
+        for key, value in defaults.items():
+            if key not in safe_context or not safe_context[key]:
+                safe_context[key] = value
+        
+        base_template = """
+        Analyze this LinkedIn content for performance potential:
+        
+        Content: {content}
+        Content Type: {content_type}
+        Industry: {industry}
+        Target Audience: {target_audience}
+        
+        Evaluate:
+        - Engagement potential
+        - Professional tone
+        - Value proposition
+        - Call-to-action effectiveness
+        - Algorithm optimization
+        - Areas for improvement
+        
+        Provide a detailed analysis with specific recommendations.
+        """
+        
+        try:
+            return base_template.format(**safe_context)
+        except KeyError as e:
+            return f"Error in template formatting: Missing key {e}"
+
+
+TEMPLATES = ["get_text_post_template", "get_media_post_template", "get_article_template",
+             "get_optimization_template", "get_analysis_template"]
+
+CONTEXTS: List[Dict] = [
+    {},
+    {"topic": "Hybrid teams", "tone": "Candid", "target_audience": "Engineering managers",
+     "authentic_examples": ["Monday standups are a ritual, not a meeting.",
+                            "We cut our roadmap in half. Output went up."],
+     "brand_mission": "Leaders who listen", "key_message": "Trust scales",
+     "brand_voice": "Direct and warm", "cta_type": "Share your take",
+     "key_points": ["Async first", "Fewer meetings"], "content": "Draft post", "content_type": "text"}
+]
+
+
+def _time(render: Callable[[Optional[Dict]], str], iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        render(dict(CONTEXTS[i % len(CONTEXTS)]))
+    return time.perf_counter() - start
+
+
+def run_benchmark(iterations: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time every template through both implementations.
+
+    Args:
+        iterations (int): Renders per template and implementation
+
+    Returns:
+        Dict[str, Dict[str, float]]: Renders per second (``legacy``, ``compiled``)
+            and ``speedup`` per template
+    """
+    results = {}
+    for name in TEMPLATES:
+        legacy = getattr(LegacyPromptTemplates, name)
+        compiled = getattr(PromptTemplates, name)
+        for context in CONTEXTS:
+            if legacy(dict(context)) != compiled(dict(context)):
+                raise AssertionError(f"{name} output differs from the legacy template")
+        legacy_time = _time(legacy, iterations)
+        compiled_time = _time(compiled, iterations)
+        results[name] = {
+            "legacy": iterations / legacy_time,
+            "compiled": iterations / compiled_time,
+            "speedup": legacy_time / compiled_time
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.iterations)
+    print(f"{'template':<28}{'legacy/s':>12}{'compiled/s':>12}{'speedup':>9}")
+    for name, row in results.items():
+        print(f"{name:<28}{row['legacy']:>12,.0f}{row['compiled']:>12,.0f}{row['speedup']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
 import os
 import sys
+import time
+import uuid
+import hashlib
 import logging
 import streamlit as st
 import json
 from pathlib import Path
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
+from src.models.clients import BASE_URL_ENV
 from src.models.model_interface import ModelInterface
-from src.utils.brand_knowledge import brand_knowledge
+from src.utils.brand_knowledge import BrandKnowledge, brand_knowledge
+from src.utils.conversation_memory import HISTORY_DIR, ConversationMemory, ConversationStore
+from src.utils.model_registry import model_registry
+from src.utils.retrieval import get_bm25_index, get_embedding_index
+
+# Streamlit re-executes this script on every interaction; this marks the
+# start of the current rerun
+RERUN_STARTED = time.perf_counter()
 
 # Configure logging
 logging.basicConfig(
@@ -23,21 +35,100 @@ load_dotenv()
 if not os.environ.get("ANTHROPIC_API_KEY"):
     logger.error("ANTHROPIC_API_KEY not set in environment variables")
 
-# Initialize the model interface
-model = None
-try:
+# Pre-warm the shared NLP models in the background. Streamlit re-runs this
+# script on every interaction, but the registry is process-wide so only the
+# first run actually loads anything.
+model_registry.warm(background=True)
+
+# Set LIFT_CHAT_RESOURCE_CACHE=0 to rebuild the resources below on every
+# rerun, as the app used to, e.g. to compare the logged rerun latency
+RESOURCE_CACHE_ENABLED = os.environ.get("LIFT_CHAT_RESOURCE_CACHE", "1") != "0"
+
+
+def _config_fingerprint() -> str:
+    """Hash of the settings the agents read when they are constructed."""
+    settings = "|".join(os.environ.get(name, "") for name in ("ANTHROPIC_API_KEY", BASE_URL_ENV))
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_interface(config_fingerprint: str) -> ModelInterface:
+    """
+    Build the model interface once per process and configuration.
+    
+    The cached instance (three agents sharing one Anthropic client) is used
+    by every rerun and session. A changed API key or base URL gives a new
+    fingerprint and so a new instance; ``invalidate_resources`` drops it.
+    Exceptions are not cached, so a failed build is retried next rerun.
+    """
+    start = time.perf_counter()
     model = ModelInterface()
-    logger.info("Model interface initialized successfully")
-except Exception as e:
-    logger.error(f"Error initializing model interface: {e}")
+    logger.info(f"Model interface initialized in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return model
+
+
+@st.cache_resource(show_spinner=False)
+def get_brand_knowledge() -> BrandKnowledge:
+    """Shared brand knowledge, with its file watcher started once per process."""
+    brand_knowledge.start_watching()
+    return brand_knowledge
+
+
+@st.cache_resource(show_spinner=False)
+def get_retrieval_indexes() -> Dict[str, Any]:
+    """
+    Load the retrieval indexes once per process, before the first message.
+    
+    The indexes check the posts file on every query, so edits to it are
+    picked up without invalidating this cache.
+    """
+    start = time.perf_counter()
+    indexes = {"bm25": get_bm25_index()}
+    try:
+        indexes["embedding"] = get_embedding_index()
+    except Exception as e:
+        logger.info(f"Semantic retrieval unavailable, using BM25 only: {e}")
+    logger.info(f"Retrieval indexes ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return indexes
+
+
+def invalidate_resources() -> bool:
+    """Drop the cached model interface, brand knowledge and retrieval indexes.
+
+    Returns False if the brand brief could not be reloaded, leaving the previous one in use.
+    """
+    get_model_interface.clear()
+    get_brand_knowledge.clear()
+    get_retrieval_indexes.clear()
+    if not brand_knowledge.reload(force=True):
+        logger.warning("Cleared cached chat resources but kept the previous brand brief: "
+                       "it could not be reloaded")
+        return False
+    logger.info("Cleared cached chat resources")
+    return True
+
+
+def load_model_interface() -> Optional[ModelInterface]:
+    """Return the cached model interface, or None if it cannot be built."""
+    try:
+        return get_model_interface(_config_fingerprint())
+    except Exception as e:
+        logger.error(f"Error initializing model interface: {e}")
+        return None
 
 # Create directory for storing chat history
-os.makedirs("chat_history", exist_ok=True)
+os.makedirs(HISTORY_DIR, exist_ok=True)
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if "messages" not in st.session_state:
-        st.session_state.messages = {}
+    if "conversations" not in st.session_state:
+        # The session id is kept in the URL so a reloaded page resumes its
+        # conversations from chat_history/
+        session_id = st.query_params.get("session", "")
+        if not ConversationStore.is_valid_session_id(session_id):
+            session_id = uuid.uuid4().hex[:12]
+            st.query_params["session"] = session_id
+        st.session_state.conversations = ConversationStore(session_id)
     
     # Available agents
     agent_types = {
@@ -51,49 +142,59 @@ def initialize_session_state():
     
     if "current_agent" not in st.session_state:
         st.session_state.current_agent = next(iter(agent_types.keys()))
-    
-    # Initialize messages for each agent
-    for agent in agent_types:
-        if agent not in st.session_state.messages:
-            st.session_state.messages[agent] = []
+
+def get_conversation(agent_type) -> ConversationMemory:
+    """Bounded memory of this session's conversation with an agent"""
+    return st.session_state.conversations.get(agent_type)
 
 def handle_agent_selection():
     """Handle agent selection from the sidebar"""
     st.session_state.current_agent = st.session_state.selected_agent
 
+def build_agent_request(agent_type, user_message):
+    """Build the agent, prompt and context for a chat message"""
+    # Map the friendly agent name to the content type
+    content_type = st.session_state.agent_types[agent_type]
+    
+    # Create context based on the agent type
+    context = {
+        "topic": "General inquiry",
+        "purpose": "user assistance"
+    }
+    
+    # Add required fields based on agent type
+    if content_type == "text":
+        context["cta_type"] = "Respond directly"
+    elif content_type == "media":
+        context["media_type"] = "general"
+    elif content_type == "article":
+        context["key_points"] = ["Respond to user inquiry"]
+    
+    # Earlier turns, summarized beyond the last few to stay within the memory's token budget
+    history = get_conversation(agent_type).format_history()
+    history_section = f"""
+    Conversation so far:
+    
+    {history}
+    """ if history else ""
+    
+    # Custom prompt for chat interaction
+    prompt = f"""
+    You are a helpful AI assistant specializing in {agent_type.lower()}.
+    {history_section}
+    Answer the following question or request from the user:
+    
+    {user_message}
+    
+    Provide a helpful, concise response. If asked to generate content, do so based on the user's request.
+    """
+    
+    return load_model_interface().get_agent(content_type), prompt, context
+
 def generate_agent_response(agent_type, user_message):
     """Generate a response from the selected agent"""
     try:
-        # Map the friendly agent name to the content type
-        content_type = st.session_state.agent_types[agent_type]
-        
-        # Create context based on the agent type
-        context = {
-            "topic": "General inquiry",
-            "purpose": "user assistance"
-        }
-        
-        # Add required fields based on agent type
-        if content_type == "text":
-            context["cta_type"] = "Respond directly"
-        elif content_type == "media":
-            context["media_type"] = "general"
-        elif content_type == "article":
-            context["key_points"] = ["Respond to user inquiry"]
-        
-        # Custom prompt for chat interaction
-        prompt = f"""
-        You are a helpful AI assistant specializing in {agent_type.lower()}.
-        
-        Answer the following question or request from the user:
-        
-        {user_message}
-        
-        Provide a helpful, concise response. If asked to generate content, do so based on the user's request.
-        """
-        
-        # Get agent and generate response
-        agent = model.get_agent(content_type)
+        agent, prompt, context = build_agent_request(agent_type, user_message)
         response = agent.generate_content(prompt, context)
         
         return response
@@ -101,6 +202,15 @@ def generate_agent_response(agent_type, user_message):
         logger.error(f"Error generating response: {e}")
         return f"Sorry, I encountered an error: {str(e)}"
 
+def stream_agent_response(agent_type, user_message, on_metrics=None):
+    """Stream a response from the selected agent as text deltas, reporting its latency to on_metrics"""
+    try:
+        agent, prompt, context = build_agent_request(agent_type, user_message)
+        yield from agent.stream_content(prompt, context, on_metrics=on_metrics)
+    except Exception as e:
+        logger.error(f"Error generating response: {e}")
+        yield f"Sorry, I encountered an error: {str(e)}"
+
 def main():
     """Main function to run the Streamlit chat interface"""
     st.set_page_config(page_title="LIFT AI Chat", page_icon="💬", layout="wide")
@@ -108,6 +218,14 @@ def main():
     # Initialize session state
     initialize_session_state()
     
+    # Shared resources, built on the first rerun of the process
+    if not RESOURCE_CACHE_ENABLED:
+        invalidate_resources()
+    model = load_model_interface()
+    brand = get_brand_knowledge()
+    get_retrieval_indexes()
+    setup_ms = (time.perf_counter() - RERUN_STARTED) * 1000
+    
     # Sidebar for agent selection
     with st.sidebar:
         st.title("LIFT AI Agents")
@@ -132,7 +250,12 @@ def main():
         
         # Add clear chat button
         if st.button("Clear Chat History"):
-            st.session_state.messages[st.session_state.current_agent] = []
+            get_conversation(st.session_state.current_agent).clear()
+            st.rerun()
+        
+        # Rebuild the shared model interface and indexes for every session
+        if st.button("Reload Models"):
+            invalidate_resources()
             st.rerun()
     
     # Main chat area
@@ -140,16 +263,20 @@ def main():
     
     # Brand info
     with st.expander("Brand Information"):
-        if brand_knowledge and hasattr(brand_knowledge, 'get_company_info'):
-            company_info = brand_knowledge.get_company_info()
+        if brand and hasattr(brand, 'get_company_info'):
+            company_info = brand.get_company_info()
             st.write(f"**Company:** {company_info.get('name', 'Unknown')}")
             st.write(f"**Tagline:** {company_info.get('tagline', 'N/A')}")
             st.write(f"**Mission:** {company_info.get('mission', 'N/A')}")
         else:
             st.write("Brand information not available")
     
-    # Display chat messages
-    for message in st.session_state.messages[st.session_state.current_agent]:
+    # Display chat messages; older turns are only kept as a summary
+    conversation = get_conversation(st.session_state.current_agent)
+    if conversation.summary:
+        with st.expander("Earlier conversation (summarized)"):
+            st.text(conversation.summary)
+    for message in conversation.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
@@ -158,21 +285,27 @@ def main():
         st.error("Error: AI model not initialized. Please check logs.")
     else:
         if prompt := st.chat_input(f"Message {st.session_state.current_agent}..."):
-            # Add user message to chat history
-            st.session_state.messages[st.session_state.current_agent].append({"role": "user", "content": prompt})
-            
             # Display user message
             with st.chat_message("user"):
                 st.markdown(prompt)
             
             # Generate and display assistant response
+            # Stream the assistant response as it is generated
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    response = generate_agent_response(st.session_state.current_agent, prompt)
-                    st.markdown(response)
+                metrics = {}
+                response = st.write_stream(
+                    stream_agent_response(st.session_state.current_agent, prompt, on_metrics=metrics.update)
+                )
+                if metrics.get("time_to_first_token") is not None:
+                    st.caption(f"First token {metrics['time_to_first_token']:.2f}s · "
+                               f"total {metrics['total_latency']:.2f}s")
             
-            # Add assistant response to chat history
-            st.session_state.messages[st.session_state.current_agent].append({"role": "assistant", "content": response})
+            # Add the exchange to chat history once the response has used the earlier turns
+            conversation.append("user", prompt)
+            conversation.append("assistant", response)
+    
+    logger.info(f"Rerun took {(time.perf_counter() - RERUN_STARTED) * 1000:.1f} ms "
+                f"({setup_ms:.1f} ms to load resources, cache {'on' if RESOURCE_CACHE_ENABLED else 'off'})")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,12 @@
 import csv
 import json
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.embedding_index import content_hash  # noqa: E402
 
 CSV_PATH = "data_store/LinkedIn Posts-LIFT Training Data.csv"
 JSON_PATH = "data_store/authentic_posts.json"
@@ -20,9 +26,12 @@ def main():
         reader = csv.DictReader(csvfile)
         for row in reader:
             # Map spreadsheet columns to JSON fields
+            content = row.get("POST_TEXT", "").strip()
             post = {
                 "post_id": row.get("POST_ID", "").strip(),
-                "content": row.get("POST_TEXT", "").strip(),
+                "content": content,
+                # Stable per-post hash so embeddings of unchanged posts are reused
+                "content_hash": content_hash(content),
                 "metadata": {
                     "success_metrics": {
                         "likes": int(row.get("LIKES", "0").replace(",", "")),
@@ -104,6 +113,17 @@ def main():
     with open(JSON_PATH, 'w', encoding='utf-8') as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
     print(f"Converted {len(posts)} posts to {JSON_PATH}")
+    update_embeddings()
+
+def update_embeddings():
+    # Re-encode only new or changed posts; unchanged ones keep their embeddings
+    from src.utils.retrieval import update_embedding_index
+    try:
+        stats = update_embedding_index(Path(JSON_PATH))
+    except ImportError as e:
+        print(f"Skipping embedding update: {e}")
+        return
+    print(f"Embeddings: {stats['reused']} reused, {stats['encoded']} re-encoded, {stats['dropped']} dropped")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -2,6 +2,8 @@ import pandas as pd
 import os
 import sys
 
+from src.utils.ingestion import load_posts_frame
+
 def find_csv_file(filename='linkedin_posts2.csv'):
     """Find the CSV file by checking multiple possible locations"""
     
@@ -56,43 +58,14 @@ def load_linkedin_data():
         sys.exit(1)
     
     try:
-        # Try a more robust approach to loading the CSV
+        # One streaming pass with typed columns; reuses the columnar cache
+        # when the file has not changed and writes malformed rows to a
+        # reject file instead of dropping them silently.
         print(f"Attempting to load CSV from: {csv_path}")
-        df = pd.read_csv(csv_path, 
-                         skiprows=1,  # Skip the empty first row
-                         encoding='utf-8',
-                         engine='python',
-                         on_bad_lines='skip')  # Skip problematic lines
-        
-        print(f"Successfully loaded CSV with {len(df)} rows and {len(df.columns)} columns")
-        
-        # Print the column names to help with debugging
-        print("Column names:", df.columns.tolist())
-        
-        # Try a different approach if we didn't get the expected columns
-        if len(df.columns) < 10:  # We expect more columns in a LinkedIn dataset
-            print("Trying alternative loading method...")
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                content = f.readlines()
-            
-            # Find the header row (typically row 1 or 2)
-            header_row = None
-            for i, line in enumerate(content[:5]):  # Check first 5 lines
-                if 'POST_ID' in line or 'POST_TEXT' in line:
-                    header_row = i
-                    break
-            
-            if header_row is not None:
-                print(f"Found header at line {header_row}")
-                df = pd.read_csv(csv_path, 
-                                skiprows=header_row,
-                                encoding='utf-8', 
-                                engine='python',
-                                on_bad_lines='skip')
-            else:
-                print("Could not find header row. Using default.")
+        df = load_posts_frame(csv_path)
         
         print(f"Final DataFrame has {len(df)} rows and {len(df.columns)} columns")
+        print("Column names:", df.columns.tolist())
         return df
     
     except Exception as e:
@@ -133,11 +106,8 @@ if __name__ == "__main__":
         engagement_cols = ['LIKES', 'COMMENTS', 'SHARES']
         for col in engagement_cols:
             if col in df.columns:
-                try:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                    print(f"Average {col.lower()}: {df[col].mean():.1f}")
-                except Exception as e:
-                    print(f"Could not process {col} column: {str(e)}")
+                # Counts are already int64 (thousands separators removed)
+                print(f"Average {col.lower()}: {df[col].mean():.1f}")
         
         # Check for topic column
         if 'TOPIC' in df.columns:
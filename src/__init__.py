@@ -1,16 +1,33 @@
 """
 Main package for the LinkedIn Content System
+
+The names below are loaded on first access (PEP 562): importing
+``src.models.model_interface`` or the webhook should not pay for the data
+and analytics dependencies behind them.
 """
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from src.utils.data_utils import (
+        get_posts_for_training,
+        save_json,
+        load_json,
+        create_timestamp,
+        ensure_directory
+    )
+    from src.utils.feedback_loop import FeedbackLoop
+    from src.data_processor import DataProcessor
 
-from src.utils.data_utils import (
-    get_posts_for_training,
-    save_json,
-    load_json,
-    create_timestamp,
-    ensure_directory
-)
-from src.utils.feedback_loop import FeedbackLoop
-from src.data_processor import DataProcessor
+_LAZY_ATTRIBUTES = {
+    'get_posts_for_training': 'src.utils.data_utils',
+    'save_json': 'src.utils.data_utils',
+    'load_json': 'src.utils.data_utils',
+    'create_timestamp': 'src.utils.data_utils',
+    'ensure_directory': 'src.utils.data_utils',
+    'FeedbackLoop': 'src.utils.feedback_loop',
+    'DataProcessor': 'src.data_processor'
+}
 
 __all__ = [
     'get_posts_for_training',
@@ -20,4 +37,17 @@ __all__ = [
     'ensure_directory',
     'FeedbackLoop',
     'DataProcessor'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
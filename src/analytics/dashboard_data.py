@@ -0,0 +1,234 @@
+"""
+Cached access to the analysis output read by the dashboard.
+
+Streamlit re-executes ``src/dashboard.py`` on every interaction. The
+``DashboardData`` instance returned by ``get_dashboard_data`` lives in
+this module, so it survives reruns:
+
+- each file is re-read only when its mtime or size changes;
+- it is re-parsed only when its SHA-256 changes too, so a rewrite with
+  identical content keeps the cached value.
+
+Plotly figure specs are built by the analysis job (``write_figure_specs``)
+next to the results they plot, tagged with the hashes of those results.
+The dashboard uses them as long as the hashes match. When they do not (an
+older analysis run, or a job without plotly) it builds them once per
+change of the source files.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_DIR = Path('analysis')
+RESULTS_FILE = 'analysis_results.json'
+TOP_POSTS_FILE = 'top_posts.csv'
+SUCCESS_RATES_FILE = 'success_rates.csv'
+FIGURES_FILE = 'dashboard_figures.json'
+TOP_TOPICS_SHOWN = 10
+
+
+def _parse_json(raw: bytes) -> Any:
+    return json.loads(raw.decode('utf-8'))
+
+
+def _parse_csv(raw: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(raw))
+
+
+def ranked_counts(counts: Any) -> List[Tuple[str, int]]:
+    """
+    Normalize a count field of ``analysis_results.json`` to ``(label, count)`` pairs.
+
+    ``content_type_distribution`` is saved as an object and ``top_topics`` as
+    a list of pairs (older runs saved it as an object as well).
+
+    Args:
+        counts (Any): Mapping of label to count, or list of ``[label, count]`` pairs
+
+    Returns:
+        List[Tuple[str, int]]: Pairs by descending count, ties in saved order
+    """
+    if isinstance(counts, dict):
+        return Counter(counts).most_common()
+    return [(label, count) for label, count in counts or []]
+
+
+def build_figure_specs(analysis: Optional[Dict[str, Any]],
+                       success_rates: Optional[pd.DataFrame]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Build the dashboard's Plotly figures as JSON-ready dicts.
+
+    Args:
+        analysis (Optional[Dict[str, Any]]): Parsed ``analysis_results.json``
+        success_rates (Optional[pd.DataFrame]): Parsed ``success_rates.csv``
+
+    Returns:
+        Dict[str, Optional[Dict[str, Any]]]: ``content_types``, ``success_rates`` and
+            ``topics`` specs, None for a chart without data
+    """
+    import plotly.express as px
+
+    analysis = analysis or {}
+    specs: Dict[str, Optional[Dict[str, Any]]] = {"content_types": None, "success_rates": None, "topics": None}
+
+    content_types = pd.DataFrame(ranked_counts(analysis.get("content_type_distribution")),
+                                 columns=["Content Type", "Count"])
+    if not content_types.empty and content_types["Count"].sum() > 0:
+        specs["content_types"] = px.pie(
+            content_types,
+            values="Count",
+            names="Content Type",
+            title="Distribution of Content Types"
+        ).to_plotly_json()
+
+    if success_rates is not None and not success_rates.empty and success_rates["success_rate"].sum() > 0:
+        specs["success_rates"] = px.bar(
+            success_rates,
+            x="content_type",
+            y="success_rate",
+            title="Success Rate by Content Type",
+            labels={"content_type": "Content Type", "success_rate": "Success Rate (%)"}
+        ).to_plotly_json()
+
+    topics = pd.DataFrame(ranked_counts(analysis.get("top_topics"))[:TOP_TOPICS_SHOWN],
+                          columns=["Topic", "Count"])
+    if not topics.empty and topics["Count"].sum() > 0:
+        specs["topics"] = px.bar(
+            topics,
+            x="Topic",
+            y="Count",
+            title="Top 10 Topics",
+            labels={"Topic": "Topic", "Count": "Number of Posts"}
+        ).to_plotly_json()
+
+    # Round-trip through plotly's encoder so specs built here and specs
+    # loaded from FIGURES_FILE are the same plain JSON
+    import plotly.io
+    return json.loads(plotly.io.json.to_json_plotly(specs))
+
+
+class DashboardData:
+    """Analysis results, tables and figure specs, reloaded only when their files change."""
+
+    def __init__(self, analysis_dir: Path = ANALYSIS_DIR):
+        """
+        Initialize the cache; nothing is read until first use.
+
+        Args:
+            analysis_dir (Path): Directory written by ``ContentAnalyzer``
+        """
+        self.analysis_dir = Path(analysis_dir)
+        # file name -> ((mtime_ns, size), sha256, parsed value)
+        self._files: Dict[str, Tuple[Tuple[int, int], str, Any]] = {}
+        self._figures: Optional[Tuple[Dict[str, Optional[str]], Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+
+    def _read(self, name: str, parse: Callable[[bytes], Any]) -> Tuple[Any, Optional[str]]:
+        """Return ``(value, sha256)`` of a file, ``(None, None)`` if it does not exist."""
+        path = self.analysis_dir / name
+        with self._lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._files.pop(name, None)
+                return None, None
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(name)
+            if cached is not None and cached[0] == key:
+                return cached[2], cached[1]
+
+            raw = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if cached is not None and cached[1] == digest:
+                value = cached[2]
+            else:
+                value = parse(raw)
+                logger.info(f"Loaded {path}")
+            self._files[name] = (key, digest, value)
+            return value, digest
+
+    def analysis(self) -> Optional[Dict[str, Any]]:
+        """Parsed ``analysis_results.json`` (shared between reruns; do not modify)."""
+        return self._read(RESULTS_FILE, _parse_json)[0]
+
+    def top_posts(self) -> Optional[pd.DataFrame]:
+        """Parsed ``top_posts.csv`` (shared between reruns; do not modify)."""
+        return self._read(TOP_POSTS_FILE, _parse_csv)[0]
+
+    def success_rates(self) -> Optional[pd.DataFrame]:
+        """Parsed ``success_rates.csv`` (shared between reruns; do not modify)."""
+        return self._read(SUCCESS_RATES_FILE, _parse_csv)[0]
+
+    def _sources(self) -> Tuple[Optional[Dict[str, Any]], Optional[pd.DataFrame], Dict[str, Optional[str]]]:
+        analysis, analysis_hash = self._read(RESULTS_FILE, _parse_json)
+        success_rates, success_hash = self._read(SUCCESS_RATES_FILE, _parse_csv)
+        return analysis, success_rates, {RESULTS_FILE: analysis_hash, SUCCESS_RATES_FILE: success_hash}
+
+    def figures(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Figure specs for the current analysis output.
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Specs from ``FIGURES_FILE`` if they were built
+                from the current files, otherwise built here once per change
+        """
+        with self._lock:
+            analysis, success_rates, source = self._sources()
+            if self._figures is not None and self._figures[0] == source:
+                return self._figures[1]
+
+            try:
+                stored = self._read(FIGURES_FILE, _parse_json)[0]
+            except ValueError as e:
+                logger.warning(f"Ignoring unreadable {FIGURES_FILE}: {str(e)}")
+                stored = None
+            if stored and stored.get("source") == source:
+                figures = stored["figures"]
+            else:
+                logger.info(f"{FIGURES_FILE} is missing or out of date, building figures")
+                figures = build_figure_specs(analysis, success_rates)
+            self._figures = (source, figures)
+            return figures
+
+
+_instances: Dict[Path, DashboardData] = {}
+_instances_lock = threading.Lock()
+
+
+def get_dashboard_data(analysis_dir: Path = ANALYSIS_DIR) -> DashboardData:
+    """Return the process-wide ``DashboardData`` for ``analysis_dir``."""
+    key = Path(analysis_dir).resolve()
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = DashboardData(analysis_dir)
+        return _instances[key]
+
+
+def write_figure_specs(analysis_dir: Path = ANALYSIS_DIR) -> Path:
+    """
+    Build the figure specs for the analysis output in ``analysis_dir`` and save them.
+
+    Args:
+        analysis_dir (Path): Directory written by ``ContentAnalyzer``
+
+    Returns:
+        Path: The written ``FIGURES_FILE``
+    """
+    analysis, success_rates, source = DashboardData(analysis_dir)._sources()
+    output_file = Path(analysis_dir) / FIGURES_FILE
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({"source": source, "figures": build_figure_specs(analysis, success_rates)},
+                  f, separators=(',', ':'))
+    os.replace(tmp_file, output_file)
+    return output_file
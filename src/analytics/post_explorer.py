@@ -0,0 +1,333 @@
+"""
+Indexed, paginated access to every scored post of the last analysis run.
+
+``ContentAnalyzer.save_analysis`` writes ``analysis/posts.db``, a read-only
+SQLite table of all posts with their engagement score, date, content type
+and topic. ``PostExplorer.page`` filters and sorts it and returns one page
+at a time:
+
+- for every combination of the content type and topic filters there is an
+  index ending in each sort key, so a page is an index seek followed by at
+  most ``page_size`` rows;
+- pages are addressed by a keyset cursor (the sort value and id of the
+  previous page's last row) rather than ``OFFSET``, so page 1000 costs the
+  same as page 1;
+- a range on the column the page is not sorted by is checked while
+  walking the sort index when it matches many posts, and read through its
+  own index and sorted when it matches few, so either way only a few
+  thousand index entries are visited;
+- a query that still runs longer than ``LIFT_EXPLORER_TIMEOUT_MS``
+  (default 250 ms) is interrupted with ``TimeoutError`` instead of
+  holding up the dashboard.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+POSTS_DB = 'posts.db'
+TIMEOUT_ENV = 'LIFT_EXPLORER_TIMEOUT_MS'
+DEFAULT_TIMEOUT_MS = 250
+MAX_PAGE_SIZE = 100
+BATCH_SIZE = 50000
+# Range matches below which a page is read through the range's index and sorted
+PROBE_LIMIT = 5000
+
+# Sort option -> (column, direction)
+SORTS = {
+    "score_desc": ("engagement_score", "DESC"),
+    "score_asc": ("engagement_score", "ASC"),
+    "date_desc": ("date", "DESC"),
+    "date_asc": ("date", "ASC")
+}
+COLUMNS = ("post_id", "date", "content_type", "topic", "likes", "comments", "shares",
+           "engagement_score", "content")
+FACETS = ("content_type", "topic")
+
+_SCHEMA = """
+CREATE TABLE posts (
+    id INTEGER PRIMARY KEY,
+    post_id TEXT,
+    date TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    shares INTEGER NOT NULL,
+    engagement_score REAL NOT NULL,
+    content TEXT
+);
+CREATE TABLE facets (
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (field, value)
+);
+"""
+
+
+def _index_name(prefix: Sequence[str], column: str) -> str:
+    return "_".join(["idx", *prefix, column])
+
+
+def _index_statements() -> List[str]:
+    """One index per (equality filters, sort column), each ending in ``id`` for the keyset."""
+    statements = []
+    for prefix in ((), ("content_type",), ("topic",), ("content_type", "topic")):
+        for column in ("engagement_score", "date"):
+            statements.append(f"CREATE INDEX {_index_name(prefix, column)} "
+                              f"ON posts ({', '.join(prefix + (column, 'id'))})")
+    return statements
+
+
+def _post_dates(values: pd.Series) -> pd.Series:
+    """``YYYY-MM-DD`` date of each timestamp, "" when it does not start with a valid date."""
+    days = values.fillna("").astype(str).str.slice(0, 10)
+    return days.where(pd.to_datetime(days, format="%Y-%m-%d", errors="coerce").notna(), "")
+
+
+def write_post_index(db_path: Path, posts: pd.DataFrame) -> Path:
+    """
+    Write the scored posts to a new SQLite index, replacing any previous one.
+
+    Args:
+        db_path (Path): Database to (re)create
+        posts (pd.DataFrame): ``post_id``, ``content``, ``content_type``, ``likes``,
+            ``comments``, ``shares`` and ``engagement_score``, plus optional ``date``
+            and ``topic`` columns
+
+    Returns:
+        Path: ``db_path``
+    """
+    db_path = Path(db_path)
+    tmp_path = db_path.with_name(db_path.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    empty = pd.Series([""] * len(posts), index=posts.index, dtype=object)
+    table = pd.DataFrame({
+        "post_id": posts["post_id"].astype(str),
+        "date": _post_dates(posts["date"]) if "date" in posts else empty,
+        "content_type": posts["content_type"].fillna("unknown").astype(str).str.lower(),
+        "topic": posts["topic"].fillna("").astype(str).str.lower().str.strip() if "topic" in posts else empty,
+        "likes": posts["likes"],
+        "comments": posts["comments"],
+        "shares": posts["shares"],
+        "engagement_score": posts["engagement_score"],
+        "content": posts["content"].fillna("")
+    })
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(_SCHEMA)
+        for offset in range(0, len(table), BATCH_SIZE):
+            batch = table.iloc[offset:offset + BATCH_SIZE]
+            conn.executemany(
+                f"INSERT INTO posts (id, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                zip(range(offset + 1, offset + len(batch) + 1), *(batch[column].tolist() for column in COLUMNS))
+            )
+        conn.executemany(
+            "INSERT INTO facets (field, value, count) VALUES (?, ?, ?)",
+            [(field, value, count) for field in FACETS
+             for value, count in Counter(table[field].tolist()).items() if value]
+        )
+        for statement in _index_statements():
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    logger.info(f"Indexed {len(table)} posts in {db_path} ({time.perf_counter() - start:.1f}s)")
+    return db_path
+
+
+class PostExplorer:
+    """Filtered, sorted pages of the post index, reopened when the analysis job replaces it."""
+
+    def __init__(self, db_path: Path, timeout_ms: Optional[int] = None):
+        """
+        Initialize the explorer; the database is opened on first use.
+
+        Args:
+            db_path (Path): Database written by ``write_post_index``
+            timeout_ms (Optional[int]): Longest a page query may run; defaults to
+                ``LIFT_EXPLORER_TIMEOUT_MS`` or 250
+        """
+        self.db_path = Path(db_path)
+        self.timeout_ms = timeout_ms if timeout_ms is not None \
+            else int(os.environ.get(TIMEOUT_ENV, DEFAULT_TIMEOUT_MS))
+        self._local = threading.local()
+
+    def available(self) -> bool:
+        """Check whether the analysis job has written the index."""
+        return self.db_path.exists()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One read-only connection per thread, reopened when the file is replaced."""
+        stat = self.db_path.stat()
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if getattr(self._local, "key", None) != key:
+            if getattr(self._local, "conn", None) is not None:
+                self._local.conn.close()
+            self._local.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            self._local.key = key
+        return self._local.conn
+
+    def facets(self) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Filter values with their post counts.
+
+        Returns:
+            Dict[str, List[Tuple[str, int]]]: ``content_type`` and ``topic`` values by descending count
+        """
+        result: Dict[str, List[Tuple[str, int]]] = {field: [] for field in FACETS}
+        for field, value, count in self._connection().execute(
+                "SELECT field, value, count FROM facets ORDER BY field, count DESC, value"):
+            result[field].append((value, count))
+        return result
+
+    def date_range(self) -> Tuple[Optional[str], Optional[str]]:
+        """Earliest and latest post date, ``(None, None)`` if no post has one."""
+        conn = self._connection()
+        (first,) = conn.execute("SELECT MIN(date) FROM posts WHERE date > ''").fetchone()
+        (last,) = conn.execute("SELECT MAX(date) FROM posts").fetchone()
+        return (first, last) if first else (None, None)
+
+    def page(self, content_type: Optional[str] = None, topic: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None,
+             min_score: Optional[float] = None, max_score: Optional[float] = None,
+             sort: str = "score_desc", after: Optional[Tuple[Any, int]] = None,
+             page_size: int = 25) -> Dict[str, Any]:
+        """
+        Return one page of posts matching the filters.
+
+        Args:
+            content_type (Optional[str]): Only posts of this content type
+            topic (Optional[str]): Only posts with this topic
+            date_from (Optional[str]): Only posts dated on or after this ``YYYY-MM-DD``
+            date_to (Optional[str]): Only posts dated on or before this ``YYYY-MM-DD``
+            min_score (Optional[float]): Only posts with at least this engagement score
+            max_score (Optional[float]): Only posts with at most this engagement score
+            sort (str): One of ``SORTS``
+            after (Optional[Tuple[Any, int]]): ``next`` of the previous page
+            page_size (int): Rows per page, at most ``MAX_PAGE_SIZE``
+
+        Returns:
+            Dict[str, Any]: ``rows`` (dicts with ``COLUMNS``) and ``next``, the cursor of
+                the following page or None on the last page
+
+        Raises:
+            ValueError: If ``sort`` or ``page_size`` is invalid
+            TimeoutError: If the query takes longer than ``timeout_ms``
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort: {sort}")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        column, direction = SORTS[sort]
+        other = "date" if column == "engagement_score" else "engagement_score"
+
+        prefix, clauses, params = [], [], []
+        for name, value in (("content_type", content_type), ("topic", topic)):
+            if value:
+                prefix.append(name)
+                clauses.append(f"{name} = ?")
+                params.append(value.lower())
+        ranges: Dict[str, Tuple[List[str], List[Any]]] = {"date": ([], []), "engagement_score": ([], [])}
+        for name, operator, value in (("date", ">=", date_from or None), ("date", "<=", date_to or None),
+                                      ("engagement_score", ">=", min_score),
+                                      ("engagement_score", "<=", max_score)):
+            if value is not None:
+                ranges[name][0].append(f"{name} {operator} ?")
+                ranges[name][1].append(value)
+        for name in ("date", "engagement_score"):
+            clauses.extend(ranges[name][0])
+            params.extend(ranges[name][1])
+        if after is not None:
+            clauses.append(f"({column}, id) {'<' if direction == 'DESC' else '>'} (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connection()
+        deadline = time.perf_counter() + self.timeout_ms / 1000
+        conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+        try:
+            index = _index_name(prefix, column)
+            if ranges[other][0]:
+                # Walking the sort index visits about rows * page_size / matches
+                # entries, so it only stays cheap when the other range matches
+                # many posts. Otherwise read its few matches and sort them.
+                range_index = _index_name(prefix, other)
+                probe_where = " AND ".join([f"{name} = ?" for name in prefix] + ranges[other][0])
+                (matches,) = conn.execute(
+                    f"SELECT COUNT(*) FROM (SELECT 1 FROM posts INDEXED BY {range_index} "
+                    f"WHERE {probe_where} LIMIT {PROBE_LIMIT})",
+                    params[:len(prefix)] + ranges[other][1]
+                ).fetchone()
+                if matches < PROBE_LIMIT:
+                    index = range_index
+            query = (f"SELECT id, {', '.join(COLUMNS)} FROM posts INDEXED BY {index} {where} "
+                     f"ORDER BY {column} {direction}, id {direction} LIMIT ?")
+            records = conn.execute(query, params + [page_size + 1]).fetchall()
+        except sqlite3.OperationalError as e:
+            if "interrupt" in str(e):
+                raise TimeoutError(f"Post query took longer than {self.timeout_ms} ms; narrow the filters")
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+
+        rows = [dict(zip(COLUMNS, record[1:])) for record in records[:page_size]]
+        next_cursor = None
+        if len(records) > page_size:
+            last = records[page_size - 1]
+            next_cursor = (last[1 + COLUMNS.index(column)], last[0])
+        return {"rows": rows, "next": next_cursor}
+
+
+def date_filters(selection: Any, date_range: Tuple[Optional[str], Optional[str]]
+                 ) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Turn a date picker selection into the ``date_from``/``date_to`` of ``PostExplorer.page``.
+
+    Undated posts fail any date bound, so a selection of the whole
+    ``date_range`` (the picker's default) applies none.
+
+    Args:
+        selection (Any): A ``(from, to)`` pair of dates, or a single date while a range is being picked
+        date_range (Tuple[Optional[str], Optional[str]]): ``PostExplorer.date_range()``
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: ``YYYY-MM-DD`` bounds, or ``(None, None)``
+            unless the selection narrows the range
+    """
+    if not isinstance(selection, (list, tuple)) or len(selection) != 2:
+        return None, None
+    bounds = (selection[0].isoformat(), selection[1].isoformat())
+    if bounds == tuple(date_range):
+        return None, None
+    return bounds
+
+
+_instances: Dict[Path, PostExplorer] = {}
+_instances_lock = threading.Lock()
+
+
+def get_post_explorer(analysis_dir: Path = Path('analysis')) -> PostExplorer:
+    """Return the process-wide ``PostExplorer`` for ``analysis_dir``."""
+    key = Path(analysis_dir).resolve()
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = PostExplorer(Path(analysis_dir) / POSTS_DB)
+        return _instances[key]
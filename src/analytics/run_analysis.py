@@ -12,29 +12,59 @@ from typing import Dict, List, Any
 import re
 from datetime import datetime
 
+from src.analytics.dashboard_data import write_figure_specs
+from src.analytics.post_explorer import POSTS_DB, write_post_index
+from src.utils.ingestion import DATA_PATH, load_posts_frame
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("content_analysis")
 
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')
+_STOPWORD_LIST = (
+    "this", "that", "these", "those", "with", "from", "have", "has",
+    "their", "they", "them", "your", "what", "when", "where", "which",
+    "while", "will", "would", "could", "should", "about", "there",
+    "here", "been", "being", "were", "some", "such", "than", "then",
+    "only", "very", "just", "more", "most", "much", "also"
+)
+STOPWORDS = frozenset(_STOPWORD_LIST)
+
 class ContentAnalyzer:
     """Analyzes LinkedIn content and generates insights."""
     
-    def __init__(self, data_dir: str = "data_store", output_dir: str = "analysis"):
+    def __init__(self, data_dir: str = "data_store", output_dir: str = "analysis",
+                 csv_path: str = str(DATA_PATH)):
         self.data_dir = Path(data_dir)
         self.output_dir = Path(output_dir)
+        self.csv_path = Path(csv_path)
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(exist_ok=True, parents=True)
         
-        # Initialize storage
+        # Initialize storage: the ingested posts table, or post records when
+        # they come from linkedin_posts.json
+        self.frame = None
         self.post_data = []
         self.analysis_results = {}
+        # Every post with its engagement score, for the dashboard's post explorer
+        self.scored_posts = None
     
     def load_data(self) -> bool:
-        """Load post data from files."""
+        """
+        Load post data, preferring the ingested LinkedIn CSV.
+
+        Falls back to ``linkedin_posts.json`` in ``data_dir`` when the CSV
+        export is not present (e.g. on a deployed dashboard).
+        """
         try:
+            if self.csv_path.exists():
+                self.frame = load_posts_frame(self.csv_path)
+                logger.info(f"Loaded {len(self.frame)} posts from {self.csv_path}")
+                return len(self.frame) > 0
+
             posts_file = self.data_dir / "linkedin_posts.json"
             if not posts_file.exists():
                 logger.warning(f"Posts file not found: {posts_file}")
@@ -45,6 +75,7 @@ class ContentAnalyzer:
             
             with open(posts_file, 'r') as f:
                 self.post_data = json.load(f)
+            self.frame = None
             
             logger.info(f"Loaded {len(self.post_data)} posts")
             return len(self.post_data) > 0
@@ -52,71 +83,94 @@ class ContentAnalyzer:
             logger.error(f"Error loading data: {str(e)}")
             return False
     
+    @staticmethod
+    def _from_posts_table(table: pd.DataFrame) -> pd.DataFrame:
+        """Take the columns ``analyze`` uses from the ingested posts table (whose strings are never missing)."""
+        content_types = table["CONTENT_TYPE"]
+        return pd.DataFrame({
+            "post_id": table["POST_ID"],
+            "content": table["POST_TEXT"],
+            "content_type": content_types,
+            "type_key": content_types.str.lower(),
+            "likes": table["LIKES"],
+            "comments": table["COMMENTS"],
+            "shares": table["SHARES"],
+            "date": table["DATE"],
+            "topic": table["TOPIC"]
+        }).reset_index(drop=True)
+
+    def _to_frame(self) -> pd.DataFrame:
+        """
+        One column per field, with the defaults ``analyze`` applies.
+
+        Built straight from the ingested table when one was loaded; otherwise
+        ``post_data`` (from ``linkedin_posts.json``) is flattened.
+        """
+        if self.frame is not None:
+            return self._from_posts_table(self.frame)
+        posts = self.post_data
+        metrics = [post.get("metrics", {}) for post in posts]
+        content_types = pd.Series([post.get("content_type") for post in posts], dtype=object)
+        return pd.DataFrame({
+            "post_id": [post.get("post_id", "unknown") for post in posts],
+            "content": [post.get("content", "") for post in posts],
+            "content_type": content_types.fillna("unknown"),
+            # Success rates match on the raw type, where a missing type is ""
+            "type_key": content_types.fillna("").str.lower(),
+            "likes": [m.get("likes", 0) for m in metrics],
+            "comments": [m.get("comments", 0) for m in metrics],
+            "shares": [m.get("shares", 0) for m in metrics],
+            "date": [post.get("timestamp") for post in posts],
+            "topic": [post.get("topic") for post in posts]
+        })
+
     def analyze(self) -> Dict[str, Any]:
         """Run analysis on the loaded post data."""
-        if not self.post_data:
+        frame = self._to_frame()
+        if frame.empty:
             logger.warning("No data to analyze")
             return self._create_empty_analysis()
         
         # Extract basic stats
-        total_posts = len(self.post_data)
+        total_posts = len(frame)
         
         # Extract engagement metrics
-        likes = [post.get("metrics", {}).get("likes", 0) for post in self.post_data]
-        comments = [post.get("metrics", {}).get("comments", 0) for post in self.post_data]
-        shares = [post.get("metrics", {}).get("shares", 0) for post in self.post_data]
+        avg_likes = frame["likes"].sum() / total_posts
+        avg_comments = frame["comments"].sum() / total_posts
+        avg_shares = frame["shares"].sum() / total_posts
         
-        avg_likes = sum(likes) / total_posts if total_posts > 0 else 0
-        avg_comments = sum(comments) / total_posts if total_posts > 0 else 0
-        avg_shares = sum(shares) / total_posts if total_posts > 0 else 0
+        # Analyze content types (Counter keeps first-seen order for ties)
+        content_type_counter = Counter(frame["content_type"].str.lower().tolist())
         
-        # Analyze content types
-        content_types = [post.get("content_type", "unknown").lower() for post in self.post_data]
-        content_type_counter = Counter(content_types)
-        
-        # Extract topics using simple keyword extraction
-        topics = []
-        for post in self.post_data:
-            content = post.get("content", "")
-            if content:
-                # Simple extraction of topics using keywords
-                words = re.findall(r'\b[a-zA-Z]{4,}\b', content.lower())
-                topics.extend([w for w in words if w not in self._get_stopwords()])
-        
-        topic_counter = Counter(topics)
+        # Extract topics using simple keyword extraction. Words never span
+        # whitespace, so each distinct whitespace-separated token is matched
+        # once and weighted by its frequency; Counter insertion order (and so
+        # tie order in most_common) stays that of first appearance.
+        tokens = Counter("\n".join(content for content in frame["content"].tolist() if content).split())
+        topic_counter = Counter()
+        for token, count in tokens.items():
+            for word in WORD_PATTERN.findall(token.lower()):
+                if word not in STOPWORDS:
+                    topic_counter[word] += count
         
         # Calculate engagement scores and identify top posts
-        posts_with_scores = []
-        for post in self.post_data:
-            engagement = post.get("metrics", {})
-            score = engagement.get("likes", 0) + 2 * engagement.get("comments", 0) + 3 * engagement.get("shares", 0)
-            posts_with_scores.append({
-                "post_id": post.get("post_id", "unknown"),
-                "content": post.get("content", ""),
-                "content_type": post.get("content_type", "unknown"),
-                "likes": engagement.get("likes", 0),
-                "comments": engagement.get("comments", 0),
-                "shares": engagement.get("shares", 0),
-                "engagement_score": score
-            })
-        
-        # Sort posts by engagement score
-        top_posts = sorted(posts_with_scores, key=lambda x: x["engagement_score"], reverse=True)[:5]
+        frame["engagement_score"] = frame["likes"] + 2 * frame["comments"] + 3 * frame["shares"]
+        top_posts_df = frame.nlargest(5, "engagement_score", keep="first")[
+            ["post_id", "content", "content_type", "likes", "comments", "shares", "engagement_score"]
+        ].reset_index(drop=True)
         
         # Add rank to top posts
-        for i, post in enumerate(top_posts):
-            post["rank"] = i + 1
+        top_posts_df["rank"] = range(1, len(top_posts_df) + 1)
+        self.scored_posts = frame
         
         # Calculate success rates by content type
+        # A post is successful if it has above-average engagement
+        successful = (frame["likes"] > avg_likes) | (frame["comments"] > avg_comments)
+        successful_by_type = successful.groupby(frame["type_key"], sort=False).sum()
         success_rates = []
         for content_type, count in content_type_counter.items():
             if count > 0:
-                # A post is successful if it has above-average engagement
-                successful_posts = sum(1 for post in self.post_data 
-                    if post.get("content_type", "").lower() == content_type
-                    and (post.get("metrics", {}).get("likes", 0) > avg_likes 
-                         or post.get("metrics", {}).get("comments", 0) > avg_comments))
-                
+                successful_posts = int(successful_by_type.get(content_type, 0))
                 success_rate = (successful_posts / count) * 100
                 success_rates.append({
                     "content_type": content_type,
@@ -129,9 +183,9 @@ class ContentAnalyzer:
         self.analysis_results = {
             "total_posts": total_posts,
             "average_engagement": {
-                "likes": avg_likes,
-                "comments": avg_comments,
-                "shares": avg_shares
+                "likes": float(avg_likes),
+                "comments": float(avg_comments),
+                "shares": float(avg_shares)
             },
             "content_type_distribution": content_type_counter,
             "top_topics": topic_counter.most_common(20),
@@ -139,7 +193,6 @@ class ContentAnalyzer:
         }
         
         # Save top posts data
-        top_posts_df = pd.DataFrame(top_posts)
         if not top_posts_df.empty:
             top_posts_df.to_csv(self.output_dir / "top_posts.csv", index=False)
         
@@ -163,6 +216,22 @@ class ContentAnalyzer:
             logger.info(f"Analysis saved to {output_file}")
         except Exception as e:
             logger.error(f"Error saving analysis: {str(e)}")
+            return
+        
+        if self.scored_posts is not None:
+            try:
+                write_post_index(self.output_dir / POSTS_DB, self.scored_posts)
+            except Exception as e:
+                logger.error(f"Error indexing posts for the explorer: {str(e)}")
+        
+        # Precompute the dashboard's figures so its reruns only load them
+        try:
+            figures_file = write_figure_specs(self.output_dir)
+            logger.info(f"Dashboard figures saved to {figures_file}")
+        except ImportError:
+            logger.warning("plotly is not installed; the dashboard will build its figures itself")
+        except Exception as e:
+            logger.error(f"Error saving dashboard figures: {str(e)}")
     
     def _create_empty_analysis(self) -> Dict[str, Any]:
         """Create an empty analysis result for when no data is available."""
@@ -176,13 +245,7 @@ class ContentAnalyzer:
     
     def _get_stopwords(self) -> List[str]:
         """Return a list of stopwords to exclude from topic analysis."""
-        return [
-            "this", "that", "these", "those", "with", "from", "have", "has",
-            "their", "they", "them", "your", "what", "when", "where", "which",
-            "while", "will", "would", "could", "should", "about", "there",
-            "here", "been", "being", "were", "some", "such", "than", "then",
-            "only", "very", "just", "more", "most", "much", "also"
-        ]
+        return list(_STOPWORD_LIST)
 
 def run_analysis():
     """Run the content analysis and save results."""
@@ -4,7 +4,8 @@ import csv
 from collections import Counter
 from typing import Dict, List
 import logging
-from utils import get_posts_for_training
+
+from src.utils.ingestion import load_posts_frame
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -82,80 +83,52 @@ def analyze_training_data() -> Dict:
         - Top performing posts
     """
     try:
-        # Get the training data
-        posts = get_posts_for_training()
+        # Read the typed posts table produced by the ingestion pipeline
+        posts = load_posts_frame()
         logger.info(f"Analyzing {len(posts)} posts")
         
         # Initialize analysis results
         analysis = {
             "total_posts": len(posts),
-            "content_type_distribution": Counter(),
+            "content_type_distribution": Counter(posts["CONTENT_TYPE"].tolist()),
             "average_engagement": {
                 "likes": 0,
                 "comments": 0,
                 "shares": 0
             },
-            "top_topics": Counter(),
+            "top_topics": Counter(topic for topic in posts["TOPIC"].tolist() if topic),
             "success_by_content_type": {},
             "top_performing_posts": []
         }
         
-        # Calculate metrics
-        total_likes = 0
-        total_comments = 0
-        total_shares = 0
-        
-        for post in posts:
-            metadata = post["metadata"]
-            
-            # Content type distribution
-            content_type = metadata["content_type"]
-            analysis["content_type_distribution"][content_type] += 1
-            
-            # Engagement metrics
-            total_likes += metadata["likes"]
-            total_comments += metadata["comments"]
-            total_shares += metadata["shares"]
-            
-            # Topic analysis
-            if metadata["topic"]:
-                analysis["top_topics"][metadata["topic"]] += 1
-            
-            # Success by content type
-            if content_type not in analysis["success_by_content_type"]:
-                analysis["success_by_content_type"][content_type] = {
-                    "total": 0,
-                    "high_success": 0
-                }
-            analysis["success_by_content_type"][content_type]["total"] += 1
-            if metadata["success_rating"] == "high":
-                analysis["success_by_content_type"][content_type]["high_success"] += 1
-            
-            # Track top performing posts
-            engagement_score = metadata["likes"] + metadata["comments"] * 2 + metadata["shares"] * 3
-            analysis["top_performing_posts"].append({
-                "content": post["content"][:100] + "...",  # First 100 chars
-                "engagement_score": engagement_score,
-                "likes": metadata["likes"],
-                "comments": metadata["comments"],
-                "shares": metadata["shares"],
-                "content_type": content_type
-            })
-        
         # Calculate averages
-        analysis["average_engagement"]["likes"] = total_likes / len(posts)
-        analysis["average_engagement"]["comments"] = total_comments / len(posts)
-        analysis["average_engagement"]["shares"] = total_shares / len(posts)
+        if len(posts):
+            for metric in ("likes", "comments", "shares"):
+                analysis["average_engagement"][metric] = float(posts[metric.upper()].mean())
         
-        # Sort top performing posts
-        analysis["top_performing_posts"].sort(key=lambda x: x["engagement_score"], reverse=True)
-        analysis["top_performing_posts"] = analysis["top_performing_posts"][:5]  # Top 5 posts
+        # Success by content type, in order of first appearance
+        grouped = posts.assign(HIGH_SUCCESS=posts["SUCCESS_RATING"] == "high").groupby(
+            "CONTENT_TYPE", sort=False)["HIGH_SUCCESS"].agg(["size", "sum"])
+        for content_type, stats in grouped.iterrows():
+            total, high_success = int(stats["size"]), int(stats["sum"])
+            analysis["success_by_content_type"][content_type] = {
+                "total": total,
+                "high_success": high_success,
+                "success_rate": (high_success / total) * 100
+            }
         
-        # Calculate success rates
-        for content_type in analysis["success_by_content_type"]:
-            total = analysis["success_by_content_type"][content_type]["total"]
-            high_success = analysis["success_by_content_type"][content_type]["high_success"]
-            analysis["success_by_content_type"][content_type]["success_rate"] = (high_success / total) * 100
+        # Top 5 posts by engagement score (ties keep file order)
+        scores = posts["LIKES"] + posts["COMMENTS"] * 2 + posts["SHARES"] * 3
+        for i in scores.sort_values(ascending=False, kind="stable").index[:5]:
+            post = posts.loc[i]
+            analysis["top_performing_posts"].append({
+                "content": post["POST_TEXT"][:100] + "...",  # First 100 chars
+                "engagement_score": int(scores[i]),
+                "likes": int(post["LIKES"]),
+                "comments": int(post["COMMENTS"]),
+                "shares": int(post["SHARES"]),
+                "content_type": post["CONTENT_TYPE"]
+            })
         
         return analysis
         
@@ -1,10 +1,25 @@
 import streamlit as st
 import pandas as pd
 import json
-import plotly.express as px
-import plotly.graph_objects as go
+import sys
+from datetime import date
 from pathlib import Path
-import os
+
+# `streamlit run src/dashboard.py` only puts src/ on the path
+root_path = str(Path(__file__).resolve().parent.parent)
+if root_path not in sys.path:
+    sys.path.append(root_path)
+
+from src.analytics.dashboard_data import get_dashboard_data
+from src.analytics.post_explorer import date_filters, get_post_explorer
+
+PAGE_SIZES = [10, 25, 50]
+SORT_LABELS = {
+    "score_desc": "Score (high to low)",
+    "score_asc": "Score (low to high)",
+    "date_desc": "Newest first",
+    "date_asc": "Oldest first"
+}
 
 # Set page config
 st.set_page_config(
@@ -29,30 +44,27 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 def load_analysis_data():
-    """Load the analysis data from JSON file."""
+    """Load the analysis data from JSON file (cached until the file changes)."""
     try:
-        analysis_path = Path("analysis/analysis_results.json")
-        if not analysis_path.exists():
+        data = get_dashboard_data().analysis()
+        if data is None:
             st.error("Analysis data not found. Please run the analysis script first.")
             return None
         
-        with open(analysis_path, 'r') as f:
-            data = json.load(f)
-            # Check if data is empty or contains only placeholder values
-            if data.get("total_posts", 0) == 0 or all(v == 0 for v in data.get("average_engagement", {}).values()):
-                st.warning("Analysis data appears to be empty or contains placeholder values.")
-            return data
+        # Check if data is empty or contains only placeholder values
+        if data.get("total_posts", 0) == 0 or all(v == 0 for v in data.get("average_engagement", {}).values()):
+            st.warning("Analysis data appears to be empty or contains placeholder values.")
+        return data
     except Exception as e:
         st.error(f"Error loading analysis data: {str(e)}")
         return None
 
 def load_top_posts():
-    """Load the top posts data from CSV file."""
+    """Load the top posts data from CSV file (cached until the file changes)."""
     try:
-        top_posts_path = Path("analysis/top_posts.csv")
-        if not top_posts_path.exists():
+        df = get_dashboard_data().top_posts()
+        if df is None:
             return None
-        df = pd.read_csv(top_posts_path)
         # Check if data is empty or contains only placeholder values
         if df.empty or df['engagement_score'].sum() == 0:
             st.warning("Top posts data appears to be empty or contains placeholder values.")
@@ -62,12 +74,11 @@ def load_top_posts():
         return None
 
 def load_success_rates():
-    """Load the success rates data from CSV file."""
+    """Load the success rates data from CSV file (cached until the file changes)."""
     try:
-        success_rates_path = Path("analysis/success_rates.csv")
-        if not success_rates_path.exists():
+        df = get_dashboard_data().success_rates()
+        if df is None:
             return None
-        df = pd.read_csv(success_rates_path)
         # Check if data is empty or contains only placeholder values
         if df.empty or df['success_rate'].sum() == 0:
             st.warning("Success rates data appears to be empty or contains placeholder values.")
@@ -76,6 +87,87 @@ def load_success_rates():
         st.error(f"Error loading success rates: {str(e)}")
         return None
 
+def load_figures():
+    """Load the precomputed figure specs, building them only when the analysis output changed."""
+    try:
+        return get_dashboard_data().figures()
+    except Exception as e:
+        st.error(f"Error loading figures: {str(e)}")
+        return {}
+
+def render_post_explorer():
+    """Browse every analysed post; filtering, sorting and paging run in SQLite, one page at a time."""
+    explorer = get_post_explorer()
+    if not explorer.available():
+        return
+    
+    st.header("🗂️ Post Explorer")
+    try:
+        facets = explorer.facets()
+        first_date, last_date = explorer.date_range()
+    except Exception as e:
+        st.error(f"Error loading the post index: {str(e)}")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        content_type = st.selectbox("Content Type", ["All"] + [value for value, _ in facets["content_type"]])
+    with col2:
+        topic = st.selectbox("Topic", ["All"] + [value for value, _ in facets["topic"]])
+    with col3:
+        sort = st.selectbox("Sort By", list(SORT_LABELS), format_func=SORT_LABELS.get)
+    with col4:
+        page_size = st.selectbox("Posts per Page", PAGE_SIZES, index=1)
+    
+    col1, col2 = st.columns(2)
+    date_from = date_to = None
+    with col1:
+        if first_date:
+            first, last = date.fromisoformat(first_date), date.fromisoformat(last_date)
+            dates = st.date_input("Date Range", value=(first, last), min_value=first, max_value=last)
+            # Only a narrowed range filters, so undated posts show by default
+            date_from, date_to = date_filters(dates, (first_date, last_date))
+    with col2:
+        min_score = st.number_input("Minimum Engagement Score", min_value=0, value=0, step=10)
+    
+    filters = {
+        "content_type": None if content_type == "All" else content_type,
+        "topic": None if topic == "All" else topic,
+        "date_from": date_from,
+        "date_to": date_to,
+        "min_score": min_score or None
+    }
+    
+    # Keyset cursors of the pages visited so far; new filters start over at page 1
+    query_key = json.dumps([filters, sort, page_size])
+    if st.session_state.get("explorer_query") != query_key:
+        st.session_state.explorer_query = query_key
+        st.session_state.explorer_cursors = [None]
+    cursors = st.session_state.explorer_cursors
+    
+    try:
+        page = explorer.page(sort=sort, after=cursors[-1], page_size=page_size, **filters)
+    except TimeoutError as e:
+        st.warning(str(e))
+        return
+    
+    if page["rows"]:
+        st.dataframe(pd.DataFrame(page["rows"]), hide_index=True, use_container_width=True)
+    else:
+        st.info("No posts match these filters.")
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if st.button("Next →", disabled=page["next"] is None):
+            cursors.append(page["next"])
+            st.rerun()
+
 def main():
     st.title("📊 LIFT Content Analysis Dashboard")
     
@@ -86,7 +178,9 @@ def main():
         return
     
     top_posts = load_top_posts()
-    success_rates = load_success_rates()
+    # Warns about placeholder success rates; the chart itself is in the figure specs
+    load_success_rates()
+    figures = load_figures()
     
     # Overview Metrics
     st.header("📈 Overview Metrics")
@@ -110,33 +204,15 @@ def main():
     # Content Type Distribution
     if analysis_data.get("content_type_distribution"):
         st.header("📊 Content Type Distribution")
-        content_types = pd.DataFrame(
-            analysis_data["content_type_distribution"].most_common(),
-            columns=["Content Type", "Count"]
-        )
-        
-        if not content_types.empty and content_types["Count"].sum() > 0:
-            fig_content = px.pie(
-                content_types,
-                values="Count",
-                names="Content Type",
-                title="Distribution of Content Types"
-            )
-            st.plotly_chart(fig_content, use_container_width=True)
+        if figures.get("content_types"):
+            st.plotly_chart(figures["content_types"], use_container_width=True)
         else:
             st.info("No content type distribution data available.")
     
     # Success Rates by Content Type
-    if success_rates is not None and not success_rates.empty and success_rates["success_rate"].sum() > 0:
+    if figures.get("success_rates"):
         st.header("🎯 Success Rates by Content Type")
-        fig_success = px.bar(
-            success_rates,
-            x="content_type",
-            y="success_rate",
-            title="Success Rate by Content Type",
-            labels={"content_type": "Content Type", "success_rate": "Success Rate (%)"}
-        )
-        st.plotly_chart(fig_success, use_container_width=True)
+        st.plotly_chart(figures["success_rates"], use_container_width=True)
     
     # Top Performing Posts
     if top_posts is not None and not top_posts.empty and top_posts["engagement_score"].sum() > 0:
@@ -155,23 +231,14 @@ def main():
                 with col3:
                     st.metric("Shares", post['shares'])
     
+    # All posts, filterable and paginated
+    render_post_explorer()
+    
     # Topic Analysis
     if analysis_data.get("top_topics"):
         st.header("🔍 Topic Analysis")
-        topics = pd.DataFrame(
-            analysis_data["top_topics"].most_common(10),
-            columns=["Topic", "Count"]
-        )
-        
-        if not topics.empty and topics["Count"].sum() > 0:
-            fig_topics = px.bar(
-                topics,
-                x="Topic",
-                y="Count",
-                title="Top 10 Topics",
-                labels={"Topic": "Topic", "Count": "Number of Posts"}
-            )
-            st.plotly_chart(fig_topics, use_container_width=True)
+        if figures.get("topics"):
+            st.plotly_chart(figures["topics"], use_container_width=True)
         else:
             st.info("No topic analysis data available.")
 
@@ -7,6 +7,9 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
+from src.models.clients import close_async_clients
+from src.utils.model_registry import model_registry
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,8 +21,13 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up webhook server...")
+    # Load the shared NLP models before serving so the first request
+    # does not pay the cold-start cost
+    await asyncio.to_thread(model_registry.warm)
+    logger.info(f"Model load timings (s): {model_registry.load_timings()}")
     yield
     logger.info("Shutting down webhook server...")
+    await close_async_clients()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -51,6 +59,11 @@ async def process_webhook_data(data: Dict[str, Any]) -> Dict[str, Any]:
     # Add your webhook processing logic here
     return {"status": "processed", "data": data}
 
+@app.get("/models")
+async def model_status():
+    """Report which shared models are loaded and how long each took to load."""
+    return {"load_timings": model_registry.load_timings()}
+
 @app.post("/webhook")
 async def webhook_handler(request: Request):
     try:
@@ -1,7 +1,11 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
+import asyncio
 import logging
+import time
+from collections import deque
 from abc import ABC, abstractmethod
 from src.utils.brand_knowledge import brand_knowledge
+from src.utils.tokens import estimate_tokens
 
 class BaseAgent(ABC):
     """Base class for all AI agents in the LIFT system."""
@@ -17,6 +21,8 @@ class BaseAgent(ABC):
         self.model_name = model_name
         self.temperature = temperature
         self.logger = logging.getLogger(__name__)
+        # Latency of recent streamed generations, newest last
+        self.stream_metrics = deque(maxlen=100)
         
     @abstractmethod
     def generate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
@@ -32,6 +38,94 @@ class BaseAgent(ABC):
         """
         pass
     
+    def create_message(self, prompt: str, context: Optional[Dict] = None) -> Dict:
+        """
+        Generate content and report token usage, raising on failure.
+        
+        Unlike ``generate_content``, errors propagate so callers such as the
+        batch generator can retry them. Agents backed by an API override this
+        with real usage numbers; the default estimates them from text length.
+        
+        Args:
+            prompt (str): The input prompt
+            context (Optional[Dict]): Additional context for generation
+            
+        Returns:
+            Dict: ``text``, ``input_tokens``, ``output_tokens`` and ``model``
+        """
+        text = self.generate_content(prompt, context)
+        return {
+            "text": text,
+            "input_tokens": estimate_tokens(prompt),
+            "output_tokens": estimate_tokens(text),
+            "model": self.model_name
+        }
+    
+    async def agenerate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
+        """
+        Generate content without blocking the event loop.
+        
+        Agents with a native async client override this; the default runs
+        ``generate_content`` in a worker thread.
+        
+        Args:
+            prompt (str): The input prompt
+            context (Optional[Dict]): Additional context for generation
+            
+        Returns:
+            str: Generated content
+        """
+        return await asyncio.to_thread(self.generate_content, prompt, context)
+    
+    def stream_content(self, prompt: str, context: Optional[Dict] = None,
+                       on_metrics: Optional[Callable[[Dict], None]] = None) -> Iterator[str]:
+        """
+        Generate content as a stream of text deltas.
+        
+        Time to first token and total latency are logged and appended to
+        ``stream_metrics`` once the stream finishes or is closed. Agents are
+        shared between sessions, so callers that need the metrics of their
+        own call should pass ``on_metrics`` rather than read that deque.
+        
+        Args:
+            prompt (str): The input prompt
+            context (Optional[Dict]): Additional context for generation
+            on_metrics (Optional[Callable[[Dict], None]]): Called with this
+                call's metrics once the stream finishes or is closed
+            
+        Yields:
+            str: Text deltas, in order
+        """
+        start = time.perf_counter()
+        first_token = None
+        chars = 0
+        try:
+            for delta in self._stream_deltas(prompt, context):
+                if not delta:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                chars += len(delta)
+                yield delta
+        finally:
+            total = time.perf_counter() - start
+            metrics = {
+                "model": self.model_name,
+                "time_to_first_token": first_token,
+                "total_latency": total,
+                "characters": chars
+            }
+            self.stream_metrics.append(metrics)
+            if on_metrics is not None:
+                on_metrics(metrics)
+            ttft = f"{first_token:.2f}s" if first_token is not None else "n/a"
+            self.logger.info(f"Streamed {chars} chars from {self.model_name}: "
+                             f"time to first token {ttft}, total {total:.2f}s")
+    
+    def _stream_deltas(self, prompt: str, context: Optional[Dict] = None) -> Iterator[str]:
+        """Yield text deltas; agents without a streaming API yield the full response at once."""
+        yield self.generate_content(prompt, context)
+    
     @abstractmethod
     def analyze_content(self, content: str) -> Dict:
         """
@@ -75,7 +169,7 @@ class BaseAgent(ABC):
             return base_prompt
             
         try:
-            return base_prompt.format(**enriched_context)
+            return base_prompt.format_map(enriched_context)
         except KeyError as e:
             self.logger.error(f"Missing context key: {e}")
             return base_prompt 
\ No newline at end of file
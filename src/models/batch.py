@@ -0,0 +1,291 @@
+"""
+Bulk content generation with bounded concurrency and rate limiting.
+
+``BatchGenerator`` runs many generation requests through a ``ModelInterface``
+on a small thread pool. Requests pass through token buckets (requests and
+input tokens per minute) before they are sent, transient API errors are
+retried with jittered exponential backoff, and results are yielded as soon
+as each item finishes, with per-item progress, usage and cost figures.
+
+    generator = BatchGenerator(model, max_concurrency=4, requests_per_minute=50)
+    for result in generator.run([{"content_type": "text", "context": {...}}, ...]):
+        print(result["index"], result["status"], result["cost"])
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set
+
+from src.utils.tokens import estimate_cost, estimate_tokens
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors and overload
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether ``error`` is a temporary failure that a retry may fix."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if ANTHROPIC_AVAILABLE:
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        if isinstance(error, anthropic.APIStatusError):
+            return error.status_code in TRANSIENT_STATUS_CODES
+    return False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, if it sent a Retry-After header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (Optional[float]): Bucket size; defaults to one second's worth (at least 1)
+            clock (Callable[[], float]): Monotonic clock, injectable for tests
+            sleep (Callable[[float], None]): Sleep function, injectable for tests
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if they are available right now."""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until ``tokens`` are available and take them.
+
+        Requests larger than the bucket are clamped to its capacity, so they
+        wait for a full bucket instead of forever.
+
+        Args:
+            tokens (float): Tokens to take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class BatchGenerator:
+    """Generate many pieces of content concurrently through a ``ModelInterface``."""
+
+    def __init__(self, model_interface, max_concurrency: int = 4,
+                 requests_per_minute: Optional[float] = None,
+                 input_tokens_per_minute: Optional[float] = None,
+                 max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the generator.
+
+        Args:
+            model_interface (ModelInterface): Provides agents and prompts
+            max_concurrency (int): Maximum number of requests in flight
+            requests_per_minute (Optional[float]): Request rate limit (None for unlimited)
+            input_tokens_per_minute (Optional[float]): Estimated prompt-token rate limit (None for unlimited)
+            max_retries (int): Retries per item for transient errors
+            base_delay (float): Backoff base in seconds; attempt ``n`` waits up to ``base_delay * 2**n``
+            max_delay (float): Upper bound for a single backoff
+            sleep (Callable[[float], None]): Sleep function, injectable for tests
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.model = model_interface
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self.request_bucket = TokenBucket(requests_per_minute / 60.0, capacity=max(1.0, requests_per_minute / 60.0),
+                                          sleep=sleep) if requests_per_minute else None
+        self.token_bucket = TokenBucket(input_tokens_per_minute / 60.0, capacity=input_tokens_per_minute,
+                                        sleep=sleep) if input_tokens_per_minute else None
+        self._progress_lock = threading.Lock()
+        self.stats: Dict = {}
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _generate_one(self, index: int, item: Dict) -> Dict:
+        """Generate a single item, retrying transient failures; a malformed item only fails itself."""
+        result = {
+            "index": index,
+            "id": index,
+            "content_type": None,
+            "status": "error",
+            "content": None,
+            "error": None,
+            "attempts": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost": None,
+            "rate_limit_wait": 0.0,
+            "latency": 0.0
+        }
+        start = time.perf_counter()
+        try:
+            content_type = item.get("content_type", "text")
+            result.update({"id": item.get("id", index), "content_type": content_type})
+            agent, base_prompt, context = self.model.prepare_prompt(content_type, item.get("context", {}))
+        except Exception as e:
+            logger.error(f"Batch item {index} is invalid: {type(e).__name__}: {str(e)}")
+            result["error"] = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {str(e)}"
+            result["latency"] = time.perf_counter() - start
+            return result
+
+        prompt_tokens = estimate_tokens(base_prompt)
+        for attempt in range(self.max_retries + 1):
+            if self.request_bucket:
+                result["rate_limit_wait"] += self.request_bucket.acquire()
+            if self.token_bucket:
+                result["rate_limit_wait"] += self.token_bucket.acquire(prompt_tokens)
+            result["attempts"] = attempt + 1
+            try:
+                message = agent.create_message(base_prompt, context)
+            except Exception as e:
+                result["error"] = str(e)
+                if attempt < self.max_retries and is_transient_error(e):
+                    delay = self._backoff(attempt, e)
+                    logger.warning(f"Batch item {index} failed ({str(e)}); retry {attempt + 1} in {delay:.2f}s")
+                    self._sleep(delay)
+                    continue
+                logger.error(f"Batch item {index} failed after {attempt + 1} attempts: {str(e)}")
+                break
+            result.update({
+                "status": "ok",
+                "content": message["text"],
+                "error": None,
+                "input_tokens": message["input_tokens"],
+                "output_tokens": message["output_tokens"],
+                "cost": estimate_cost(agent.model_name, message["input_tokens"], message["output_tokens"])
+            })
+            break
+        result["latency"] = time.perf_counter() - start
+        return result
+
+    def _record(self, result: Dict) -> Dict:
+        """Update the running totals and stamp progress onto ``result``."""
+        with self._progress_lock:
+            stats = self.stats
+            stats["completed"] += 1
+            stats["succeeded" if result["status"] == "ok" else "failed"] += 1
+            stats["input_tokens"] += result["input_tokens"]
+            stats["output_tokens"] += result["output_tokens"]
+            stats["cost"] += result["cost"] or 0.0
+            stats["elapsed"] = time.perf_counter() - stats["_start"]
+            result["completed"] = stats["completed"]
+            result["total"] = stats["total"]
+        return result
+
+    def run(self, items: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Generate every item, yielding results in completion order.
+
+        Items are consumed lazily, so ``items`` may itself be a generator; at
+        most ``2 * max_concurrency`` are queued at a time. Closing the
+        iterator early cancels work that has not started.
+
+        Args:
+            items (Iterable[Dict]): Requests with ``content_type``, ``context`` and an optional ``id``
+
+        Yields:
+            Dict: Per-item result with ``status``, ``content``, ``error``, ``attempts``,
+                token usage, ``cost`` (USD, None for unknown models), ``latency``,
+                ``rate_limit_wait`` and progress (``completed`` of ``total``)
+        """
+        total = len(items) if hasattr(items, "__len__") else None
+        self.stats = {"total": total, "completed": 0, "succeeded": 0, "failed": 0,
+                      "input_tokens": 0, "output_tokens": 0, "cost": 0.0,
+                      "elapsed": 0.0, "_start": time.perf_counter()}
+        source = enumerate(items)
+        pending: Set[Future] = set()
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="batch-generate")
+
+        def submit(limit: int) -> None:
+            while len(pending) < limit:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    return
+                pending.add(pool.submit(self._generate_one, index, item))
+
+        try:
+            submit(2 * self.max_concurrency)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    yield self._record(future.result())
+                submit(2 * self.max_concurrency)
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+            stats = self.summary()
+            logger.info(f"Batch finished: {stats['succeeded']} ok, {stats['failed']} failed, "
+                        f"{stats['input_tokens']}+{stats['output_tokens']} tokens, "
+                        f"${stats['cost']:.4f} in {stats['elapsed']:.1f}s")
+
+    def summary(self) -> Dict:
+        """Totals for the current (or last) run."""
+        with self._progress_lock:
+            return {key: value for key, value in self.stats.items() if not key.startswith("_")}
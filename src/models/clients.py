@@ -0,0 +1,94 @@
+"""
+Shared Anthropic clients for the content agents.
+
+Every agent used to build its own ``anthropic.Anthropic`` client, each with
+its own HTTP connection pool. The clients here are created once per API key
+(and, for the async client, once per event loop, since an ``httpx`` async
+pool is bound to the loop it was created on) so all agents reuse the same
+connections.
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Base URL override, e.g. for a local stub server in tests; the SDK reads
+# ANTHROPIC_BASE_URL itself as well
+BASE_URL_ENV = "LIFT_ANTHROPIC_BASE_URL"
+
+_lock = threading.Lock()
+_sync_clients: Dict[Tuple[Optional[str], Optional[str]], "anthropic.Anthropic"] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = weakref.WeakKeyDictionary()
+
+
+def _client_key(api_key: Optional[str], base_url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    return api_key, base_url or os.environ.get(BASE_URL_ENV)
+
+
+def get_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> "anthropic.Anthropic":
+    """
+    Get the process-wide synchronous client for ``api_key``.
+
+    Args:
+        api_key (Optional[str]): Anthropic API key
+        base_url (Optional[str]): API base URL; defaults to ``LIFT_ANTHROPIC_BASE_URL`` or the SDK default
+
+    Returns:
+        anthropic.Anthropic: The shared client
+    """
+    if not ANTHROPIC_AVAILABLE:
+        raise ImportError("anthropic is required. Please install it via pip.")
+    key = _client_key(api_key, base_url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = _sync_clients[key] = anthropic.Anthropic(api_key=key[0], base_url=key[1])
+    return client
+
+
+def get_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> "anthropic.AsyncAnthropic":
+    """
+    Get the asynchronous client for ``api_key`` on the running event loop.
+
+    All coroutines on one loop share a client and therefore one connection
+    pool, so many generations can be in flight without opening a connection
+    per agent.
+
+    Args:
+        api_key (Optional[str]): Anthropic API key
+        base_url (Optional[str]): API base URL; defaults to ``LIFT_ANTHROPIC_BASE_URL`` or the SDK default
+
+    Returns:
+        anthropic.AsyncAnthropic: The shared client for the current loop
+    """
+    if not ANTHROPIC_AVAILABLE:
+        raise ImportError("anthropic is required. Please install it via pip.")
+    loop = asyncio.get_running_loop()
+    key = _client_key(api_key, base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = anthropic.AsyncAnthropic(api_key=key[0], base_url=key[1])
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the async clients of the running loop (e.g. on application shutdown)."""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Anthropic client: {str(e)}")
@@ -1,5 +1,8 @@
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 from .base_agent import BaseAgent
+from .clients import ANTHROPIC_AVAILABLE, get_async_client, get_client
+from src.utils.response_cache import get_response_cache
+import asyncio
 import os
 import logging
 from dotenv import load_dotenv
@@ -7,16 +10,13 @@ from dotenv import load_dotenv
 # Load environment variables at module level
 load_dotenv()
 
-# Try to import anthropic, but don't fail if it's not available
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+if not ANTHROPIC_AVAILABLE:
     logging.warning("Anthropic package not available. Using fallback mode.")
 
-class TextContentAgent(BaseAgent):
-    """Agent specialized in generating text-only LinkedIn posts."""
+class AnthropicAgent(BaseAgent):
+    """Base class for agents that generate content with the Anthropic API."""
+    
+    max_tokens = 1000
     
     def __init__(self, model_name: str = "claude-3-opus-20240229", temperature: float = 0.7):
         super().__init__(model_name, temperature)
@@ -26,59 +26,99 @@ class TextContentAgent(BaseAgent):
             self.logger.warning("ANTHROPIC_API_KEY not found in environment variables. API calls will fail.")
         
         if ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            # Shared with the other agents so they reuse one connection pool
+            self.client = get_client(api_key=self.api_key)
         else:
             self.client = None
             self.logger.warning("Anthropic client not initialized - package missing")
+    
+    def _message_params(self, formatted_prompt: str) -> Dict:
+        """Build the Messages API arguments for a formatted prompt."""
+        return {
+            "model": self.model_name,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": formatted_prompt
+                }
+            ]
+        }
         
-    def generate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
+    def _cached_response(self, formatted_prompt: str) -> Optional[Dict]:
+        """Look the prompt up in the response cache, if caching is enabled."""
+        cache = get_response_cache()
+        if cache is None:
+            return None
+        return cache.get(self.model_name, self.temperature, formatted_prompt, self.max_tokens)
+    
+    def _cache_response(self, formatted_prompt: str, response: Dict) -> None:
+        """Store a fresh response in the response cache, if caching is enabled."""
+        cache = get_response_cache()
+        if cache is not None:
+            cache.put(self.model_name, self.temperature, formatted_prompt, response, self.max_tokens)
+    
+    def _response(self, message) -> Dict:
+        return {
+            "text": message.content[0].text,
+            "input_tokens": message.usage.input_tokens,
+            "output_tokens": message.usage.output_tokens,
+            "model": message.model
+        }
+    
+    def create_message(self, prompt: str, context: Optional[Dict] = None) -> Dict:
+        """
+        Call the Messages API and return the text with its token usage.
+        
+        Identical requests are answered from the response cache when it is
+        enabled (see ``src.utils.response_cache``).
+        
+        Args:
+            prompt (str): The input prompt
+            context (Optional[Dict]): Additional context for generation
+            
+        Returns:
+            Dict: ``text``, ``input_tokens``, ``output_tokens`` and ``model``
+            
+        Raises:
+            ImportError: If the anthropic package is not installed
+            anthropic.APIError: If the request fails
+        """
+        if not ANTHROPIC_AVAILABLE:
+            raise ImportError("anthropic is required. Please install it via pip.")
         formatted_prompt = self.format_prompt(prompt, context)
+        cached = self._cached_response(formatted_prompt)
+        if cached is not None:
+            return cached
+        message = self.client.messages.create(**self._message_params(formatted_prompt))
+        response = self._response(message)
+        self._cache_response(formatted_prompt, response)
+        return response
         
+    def generate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
         if not ANTHROPIC_AVAILABLE:
             self.logger.error("Cannot generate content: Anthropic package not available")
             return "Error: Anthropic package not available. Please install it with 'pip install anthropic'."
         
         try:
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=1000,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ]
-            )
-            
-            return message.content[0].text
+            return self.create_message(prompt, context)["text"]
         except Exception as e:
             self.logger.error(f"Error generating content with Anthropic API: {str(e)}")
             return f"Error generating content: {str(e)}"
     
-    def analyze_content(self, content: str) -> Dict:
-        """Simple analysis without external dependencies."""
-        return {
-            "analysis": "Content analysis available without external libraries. Install additional dependencies for comprehensive analysis."
-        }
-
-class MediaContentAgent(BaseAgent):
-    """Agent specialized in generating posts with media (images, videos)."""
-    
-    def __init__(self, model_name: str = "claude-3-opus-20240229", temperature: float = 0.7):
-        super().__init__(model_name, temperature)
-        # Get API key from environment variables
-        self.api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not self.api_key:
-            self.logger.warning("ANTHROPIC_API_KEY not found in environment variables. API calls will fail.")
+    async def agenerate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
+        """
+        Generate content with the async client, sharing one connection pool
+        per event loop across all agents.
         
-        if ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
-        else:
-            self.client = None
-            self.logger.warning("Anthropic client not initialized - package missing")
-        
-    def generate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
+        Args:
+            prompt (str): The input prompt
+            context (Optional[Dict]): Additional context for generation
+            
+        Returns:
+            str: Generated content
+        """
         formatted_prompt = self.format_prompt(prompt, context)
         
         if not ANTHROPIC_AVAILABLE:
@@ -86,72 +126,61 @@ class MediaContentAgent(BaseAgent):
             return "Error: Anthropic package not available. Please install it with 'pip install anthropic'."
         
         try:
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=1000,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ]
-            )
-            
-            return message.content[0].text
+            caching = get_response_cache() is not None
+            if caching:
+                cached = await asyncio.to_thread(self._cached_response, formatted_prompt)
+                if cached is not None:
+                    return cached["text"]
+            client = get_async_client(api_key=self.api_key)
+            message = await client.messages.create(**self._message_params(formatted_prompt))
+            response = self._response(message)
+            if caching:
+                await asyncio.to_thread(self._cache_response, formatted_prompt, response)
+            return response["text"]
         except Exception as e:
             self.logger.error(f"Error generating content with Anthropic API: {str(e)}")
             return f"Error generating content: {str(e)}"
     
-    def analyze_content(self, content: str) -> Dict:
-        """Simple analysis without external dependencies."""
-        return {
-            "analysis": "Content analysis available without external libraries. Install additional dependencies for comprehensive analysis."
-        }
-
-class ArticleContentAgent(BaseAgent):
-    """Agent specialized in generating long-form articles and thought leadership pieces."""
-    
-    def __init__(self, model_name: str = "claude-3-opus-20240229", temperature: float = 0.7):
-        super().__init__(model_name, temperature)
-        # Get API key from environment variables
-        self.api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not self.api_key:
-            self.logger.warning("ANTHROPIC_API_KEY not found in environment variables. API calls will fail.")
-        
-        if ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
-        else:
-            self.client = None
-            self.logger.warning("Anthropic client not initialized - package missing")
-        
-    def generate_content(self, prompt: str, context: Optional[Dict] = None) -> str:
+    def _stream_deltas(self, prompt: str, context: Optional[Dict] = None) -> Iterator[str]:
+        """Yield text deltas from the streaming Messages API."""
         formatted_prompt = self.format_prompt(prompt, context)
         
         if not ANTHROPIC_AVAILABLE:
             self.logger.error("Cannot generate content: Anthropic package not available")
-            return "Error: Anthropic package not available. Please install it with 'pip install anthropic'."
+            yield "Error: Anthropic package not available. Please install it with 'pip install anthropic'."
+            return
         
         try:
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=2000,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ]
-            )
-            
-            return message.content[0].text
+            cached = self._cached_response(formatted_prompt)
+            if cached is not None:
+                yield cached["text"]
+                return
+            with self.client.messages.stream(**self._message_params(formatted_prompt)) as stream:
+                for text in stream.text_stream:
+                    yield text
+                message = stream.get_final_message()
+            self._cache_response(formatted_prompt, self._response(message))
         except Exception as e:
-            self.logger.error(f"Error generating content with Anthropic API: {str(e)}")
-            return f"Error generating content: {str(e)}"
+            self.logger.error(f"Error streaming content from Anthropic API: {str(e)}")
+            yield f"Error generating content: {str(e)}"
     
     def analyze_content(self, content: str) -> Dict:
         """Simple analysis without external dependencies."""
         return {
             "analysis": "Content analysis available without external libraries. Install additional dependencies for comprehensive analysis."
-        } 
\ No newline at end of file
+        }
+
+class TextContentAgent(AnthropicAgent):
+    """Agent specialized in generating text-only LinkedIn posts."""
+    
+    max_tokens = 1000
+
+class MediaContentAgent(AnthropicAgent):
+    """Agent specialized in generating posts with media (images, videos)."""
+    
+    max_tokens = 1000
+
+class ArticleContentAgent(AnthropicAgent):
+    """Agent specialized in generating long-form articles and thought leadership pieces."""
+    
+    max_tokens = 2000
@@ -1,7 +1,10 @@
-from typing import Dict, Optional, Union
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+import asyncio
 from .base_agent import BaseAgent
 from .content_agents import TextContentAgent, MediaContentAgent, ArticleContentAgent
 from .prompts import PromptTemplates
+from src.utils.prompt_budget import default_budget
+from src.utils.tokens import count_tokens
 import logging
 
 class ModelInterface:
@@ -22,44 +25,36 @@ class ModelInterface:
             raise ValueError(f"Unsupported content type: {content_type}")
         return self.agents[content_type]
     
-    def generate_content(self, content_type: str, context: Dict) -> str:
+    def prepare_prompt(self, content_type: str, context: Dict) -> Tuple[BaseAgent, str, Dict]:
         """
-        Generate content using the appropriate agent and prompt template.
+        Validate the context and build the prompt for a generation request.
         
         Args:
             content_type (str): Type of content to generate ("text", "media", or "article")
             context (Dict): Context for content generation
             
         Returns:
-            str: Generated content
+            Tuple[BaseAgent, str, Dict]: The agent, the base prompt and the (enriched) context
+            
+        Raises:
+            ValueError: If the content type is unsupported or required context fields are missing
         """
         agent = self.get_agent(content_type)
         required_fields = self._get_required_fields(content_type)
         missing_fields = [field for field in required_fields if field not in context]
         if missing_fields:
-            error_message = f"Missing required context fields: {', '.join(missing_fields)}"
-            self.logger.error(error_message)
-            return f"Error: {error_message}"
+            raise ValueError(f"Missing required context fields: {', '.join(missing_fields)}")
 
         # --- ENHANCEMENT: Add relevant authentic post examples and brand brief fields ---
         if content_type == "text":
             try:
-                from src.utils.retrieval import retrieve_relevant_posts
+                from src.utils.retrieval import retrieve_keyword_posts, retrieve_relevant_posts
                 try:
                     # Use semantic retrieval for most relevant examples
                     authentic_examples = retrieve_relevant_posts(context.get("topic", ""), top_k=2)
                 except ImportError:
-                    # Fallback to keyword matching if sentence-transformers not available
-                    import json
-                    with open("data_store/authentic_posts.json", "r", encoding="utf-8") as f:
-                        authentic_data = json.load(f)
-                    topic = context.get("topic", "").lower()
-                    def score(post):
-                        content = post.get("content", "").lower()
-                        meta_topic = post.get("metadata", {}).get("topic", "").lower()
-                        return int(topic in content or topic in meta_topic)
-                    sorted_posts = sorted(authentic_data.get("authentic_posts", []), key=score, reverse=True)
-                    authentic_examples = [p["content"] for p in sorted_posts if p.get("content")] [:2]
+                    # Fall back to BM25 keyword retrieval if sentence-transformers is not available
+                    authentic_examples = retrieve_keyword_posts(context.get("topic", ""), top_k=2)
             except Exception as e:
                 authentic_examples = []
                 self.logger.error(f"Could not load authentic post examples: {e}")
@@ -73,18 +68,84 @@ class ModelInterface:
             # Set higher temperature for more creative outputs
             if hasattr(agent, 'temperature'):
                 agent.temperature = 0.9
-            base_prompt = self.prompts.get_text_post_template(context)
+            # Fit the examples into the prompt budget, leaving room for the
+            # brand guidance the agent appends
+            base_prompt = self.prompts.get_text_post_template(
+                context,
+                token_budget=default_budget(),
+                reserved_tokens=count_tokens(brand_knowledge.format_brand_prompt(""))
+            )
+            budget = context["prompt_budget"]
+            self.logger.info(f"Prompt budget: {budget['used']} + {budget['reserved']} reserved "
+                             f"of {budget['budget']} tokens, examples {budget['sections']['examples']}")
             self.logger.info(f"=== PROMPT SENT TO MODEL ===\n{base_prompt}")
         elif content_type == "media":
             base_prompt = self.prompts.get_media_post_template(context)
         else:  # article
             base_prompt = self.prompts.get_article_template(context)
         
+        return agent, base_prompt, context
+    
+    def generate_content(self, content_type: str, context: Dict) -> str:
+        """
+        Generate content using the appropriate agent and prompt template.
+        
+        Args:
+            content_type (str): Type of content to generate ("text", "media", or "article")
+            context (Dict): Context for content generation
+            
+        Returns:
+            str: Generated content
+        """
+        self.get_agent(content_type)
+        try:
+            agent, base_prompt, context = self.prepare_prompt(content_type, context)
+        except ValueError as e:
+            self.logger.error(str(e))
+            return f"Error: {str(e)}"
+        
         # Generate content
         content = agent.generate_content(base_prompt, context)
         
         return content
     
+    async def agenerate_content(self, content_type: str, context: Dict) -> str:
+        """
+        Generate content without blocking the event loop.
+        
+        Prompt preparation (which may run retrieval) happens in a worker
+        thread; the API call itself uses the agent's async client.
+        
+        Args:
+            content_type (str): Type of content to generate ("text", "media", or "article")
+            context (Dict): Context for content generation
+            
+        Returns:
+            str: Generated content
+        """
+        self.get_agent(content_type)
+        try:
+            agent, base_prompt, context = await asyncio.to_thread(self.prepare_prompt, content_type, context)
+        except ValueError as e:
+            self.logger.error(str(e))
+            return f"Error: {str(e)}"
+        
+        return await agent.agenerate_content(base_prompt, context)
+    
+    def generate_batch(self, items: Iterable[Dict], **options) -> Iterator[Dict]:
+        """
+        Generate many pieces of content with bounded concurrency.
+        
+        Args:
+            items (Iterable[Dict]): Requests with ``content_type``, ``context`` and an optional ``id``
+            **options: ``BatchGenerator`` options (``max_concurrency``, ``requests_per_minute``, ...)
+            
+        Returns:
+            Iterator[Dict]: Per-item results in completion order
+        """
+        from .batch import BatchGenerator
+        return BatchGenerator(self, **options).run(items)
+    
     def analyze_content(self, content: str, content_type: str) -> Dict:
         """
         Analyze content using the appropriate agent.
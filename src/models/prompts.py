@@ -1,75 +1,157 @@
-from typing import Dict, Optional
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-class PromptTemplates:
-    """Collection of prompt templates for different content types and purposes."""
-    
-    @staticmethod
-    def get_text_post_template(context: Optional[Dict] = None) -> str:
-        """Template for generating text-only LinkedIn posts using authentic examples and brand brief, with explicit anti-generic instructions."""
-        safe_context = context or {}
-        defaults = {
-            "industry": "Leadership Development",
-            "target_audience": "Business professionals",
-            "purpose": "Thought leadership",
-            "tone": "Professional",
-            "topic": "Leadership",
-            "cta_type": "Ask a question",
-            "authentic_examples": [],
-            "brand_mission": "",
-            "brand_voice": "",
-            "key_message": ""
-        }
-        for key, value in defaults.items():
-            if key not in safe_context or not safe_context[key]:
-                safe_context[key] = value
-
-        # Prepare authentic examples (few-shot)
-        example_section = ""
-        if safe_context["authentic_examples"]:
-            example_section = "Here are several real LinkedIn posts from my account. Carefully study their style, structure, and voice.\n"
-            for i, ex in enumerate(safe_context["authentic_examples"][:4]):
-                example_section += f"Example {i+1}:\n{ex}\n---\n"
-
-        base_template = f"""
+from src.utils.prompt_budget import PromptAssembler
+
+
+class CompiledTemplate:
+    """
+    A ``str.format`` template parsed once into literal text and field slots.
+
+    Every field the template references must have a default or be declared
+    required, which is checked when the template is compiled rather than
+    when a request comes in. Rendering then only fills defaults and joins
+    the precomputed slots.
+    """
+
+    def __init__(self, template: str, defaults: Optional[Dict[str, Any]] = None,
+                 required: Iterable[str] = ()):
+        """
+        Compile a template.
+
+        Args:
+            template (str): Template using ``{field}`` placeholders
+            defaults (Optional[Dict[str, Any]]): Values used when a field is missing or empty
+            required (Iterable[str]): Fields without defaults that callers must supply
+
+        Raises:
+            ValueError: If the template is malformed, uses attribute/index lookups,
+                or references a field with neither a default nor a ``required`` entry
+        """
+        self.template = template
+        self.defaults = dict(defaults or {})
+        self.required = frozenset(required)
+        self.slots: List[Tuple[str, Optional[str], str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"Unsupported template field: {{{field}}}")
+                if "{" in spec:
+                    raise ValueError(f"Nested format specs are not supported: {{{field}:{spec}}}")
+            self.slots.append((literal, field, spec or "", conversion))
+        self.fields = frozenset(field for _, field, _, _ in self.slots if field is not None)
+        unknown = self.fields - set(self.defaults) - self.required
+        if unknown:
+            raise ValueError(f"Template fields without defaults: {', '.join(sorted(unknown))}")
+
+        # Templates without format specs compile further into a single
+        # printf-style string, so rendering is one C-level ``%`` operation
+        self._field_order = tuple(field for _, field, _, _ in self.slots if field is not None)
+        self._printf: Optional[str] = None
+        if all(not spec and conversion in (None, "s", "r", "a") for _, _, spec, conversion in self.slots):
+            self._printf = "".join(
+                literal.replace("%", "%%") + ("" if field is None else "%" + (conversion or "s"))
+                for literal, field, _, conversion in self.slots
+            )
+
+    def fill_defaults(self, context: Optional[Dict] = None) -> Dict:
+        """
+        Fill missing or empty values in ``context`` from the defaults, in place.
+
+        Args:
+            context (Optional[Dict]): Template values
+
+        Returns:
+            Dict: ``context`` (or a new dict if it was None)
+        """
+        values = context if context is not None else {}
+        for key, value in self.defaults.items():
+            if key not in values or not values[key]:
+                values[key] = value
+        return values
+
+    def render(self, context: Optional[Dict] = None, **extra) -> str:
+        """
+        Render the template.
+
+        Missing or empty values in ``context`` are filled in from the defaults
+        (in place, as the templates always have), and ``extra`` supplies
+        computed fields without touching ``context``.
+
+        Args:
+            context (Optional[Dict]): Template values
+            **extra: Additional values that take precedence over ``context``
+
+        Returns:
+            str: The rendered prompt
+
+        Raises:
+            KeyError: If a required field is missing
+        """
+        return self.render_filled(self.fill_defaults(context), **extra)
+
+    def render_filled(self, values: Dict, **extra) -> str:
+        """Render from ``values`` that already went through ``fill_defaults``."""
+        if extra:
+            values = {**values, **extra}
+        try:
+            args = tuple([values[field] for field in self._field_order])
+        except KeyError as e:
+            raise KeyError(f"Missing required template field: {e.args[0]}") from None
+        if self._printf is not None:
+            return self._printf % args
+
+        parts = []
+        append = parts.append
+        index = 0
+        for literal, field, spec, conversion in self.slots:
+            if literal:
+                append(literal)
+            if field is None:
+                continue
+            value = args[index]
+            index += 1
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            append(format(value, spec))
+        return "".join(parts)
+
+
+EXAMPLES_HEADER = ("Here are several real LinkedIn posts from my account. "
+                   "Carefully study their style, structure, and voice.\n")
+EXAMPLE_FORMAT = "Example {number}:\n{item}\n---\n"
+
+TEXT_POST_TEMPLATE = CompiledTemplate("""
         {example_section}
-        Now, write a new LinkedIn post in the exact same style, length, and formatting as the examples above, about: {{topic}}
+        Now, write a new LinkedIn post in the exact same style, length, and formatting as the examples above, about: {topic}
         - Do NOT use generic LinkedIn language or platitudes.
         - Do NOT use vague or overly formal phrases.
         - Use the same sentence length, formatting, and voice as the examples above.
         - Use specific anecdotes, humor, or directness as in the examples.
-        - Use a {{tone}} tone and speak directly to {{target_audience}}.
-        - Reference our brand's mission: {{brand_mission}}
-        - Key message: {{key_message}}
-        - Incorporate our brand voice: {{brand_voice}}
-        - End with a relevant call-to-action: {{cta_type}}
+        - Use a {tone} tone and speak directly to {target_audience}.
+        - Reference our brand's mission: {brand_mission}
+        - Key message: {key_message}
+        - Incorporate our brand voice: {brand_voice}
+        - End with a relevant call-to-action: {cta_type}
         - Make it authentic, specific, and aligned with our brand.
-        """
-        try:
-            return base_template.format(**safe_context)
-        except KeyError as e:
-            return f"Error in template formatting: Missing key {e}"
-    
-    @staticmethod
-    def get_media_post_template(context: Optional[Dict] = None) -> str:
-        """Template for generating LinkedIn posts with media."""
-        # Provide default values for missing context
-        safe_context = context or {}
-        defaults = {
-            "industry": "Leadership Development",
-            "media_type": "Image",
-            "target_audience": "Business professionals",
-            "purpose": "Thought leadership",
-            "tone": "Professional",
-            "topic": "Leadership",
-            "cta_type": "Ask a question"
-        }
-        
-        # Merge defaults with provided context
-        for key, value in defaults.items():
-            if key not in safe_context or not safe_context[key]:
-                safe_context[key] = value
-        
-        base_template = """
+        """, defaults={
+    "industry": "Leadership Development",
+    "target_audience": "Business professionals",
+    "purpose": "Thought leadership",
+    "tone": "Professional",
+    "topic": "Leadership",
+    "cta_type": "Ask a question",
+    "authentic_examples": [],
+    "brand_mission": "",
+    "brand_voice": "",
+    "key_message": ""
+}, required=["example_section"])
+
+MEDIA_POST_TEMPLATE = CompiledTemplate("""
         You are an expert LinkedIn content creator specializing in visual content. Create a LinkedIn post with media using these specifications:
         
         Industry: {industry}
@@ -88,33 +170,17 @@ class PromptTemplates:
         - Optimized for LinkedIn's algorithm
         
         Generate a post that effectively combines text and visual elements.
-        """
-        
-        try:
-            return base_template.format(**safe_context)
-        except KeyError as e:
-            return f"Error in template formatting: Missing key {e}"
-    
-    @staticmethod
-    def get_article_template(context: Optional[Dict] = None) -> str:
-        """Template for generating LinkedIn articles."""
-        # Provide default values for missing context
-        safe_context = context or {}
-        defaults = {
-            "industry": "Leadership Development",
-            "target_audience": "Business professionals",
-            "purpose": "Thought leadership",
-            "tone": "Professional",
-            "topic": "Leadership",
-            "key_points": ["Point 1", "Point 2", "Point 3"]
-        }
-        
-        # Merge defaults with provided context
-        for key, value in defaults.items():
-            if key not in safe_context or not safe_context[key]:
-                safe_context[key] = value
-        
-        base_template = """
+        """, defaults={
+    "industry": "Leadership Development",
+    "media_type": "Image",
+    "target_audience": "Business professionals",
+    "purpose": "Thought leadership",
+    "tone": "Professional",
+    "topic": "Leadership",
+    "cta_type": "Ask a question"
+})
+
+ARTICLE_TEMPLATE = CompiledTemplate("""
         You are an expert LinkedIn thought leader. Create a comprehensive LinkedIn article with these specifications:
         
         Industry: {industry}
@@ -133,31 +199,16 @@ class PromptTemplates:
         - Be optimized for LinkedIn's algorithm
         
         Generate a thought-provoking article that establishes authority in the field.
-        """
-        
-        try:
-            return base_template.format(**safe_context)
-        except KeyError as e:
-            return f"Error in template formatting: Missing key {e}"
-    
-    @staticmethod
-    def get_optimization_template(context: Optional[Dict] = None) -> str:
-        """Template for optimizing existing content."""
-        # Provide default values for missing context
-        safe_context = context or {}
-        defaults = {
-            "content": "This is a sample content that needs optimization.",
-            "target_metrics": ["engagement", "readability"],
-            "industry": "Leadership Development",
-            "target_audience": "Business professionals"
-        }
-        
-        # Merge defaults with provided context
-        for key, value in defaults.items():
-            if key not in safe_context or not safe_context[key]:
-                safe_context[key] = value
-        
-        base_template = """
+        """, defaults={
+    "industry": "Leadership Development",
+    "target_audience": "Business professionals",
+    "purpose": "Thought leadership",
+    "tone": "Professional",
+    "topic": "Leadership",
+    "key_points": ["Point 1", "Point 2", "Point 3"]
+})
+
+OPTIMIZATION_TEMPLATE = CompiledTemplate("""
         You are a LinkedIn content optimization expert. Review and enhance this content:
         
         Original Content: {content}
@@ -173,31 +224,14 @@ class PromptTemplates:
         - Better alignment with LinkedIn's algorithm
         
         Provide the optimized version of the content.
-        """
-        
-        try:
-            return base_template.format(**safe_context)
-        except KeyError as e:
-            return f"Error in template formatting: Missing key {e}"
-    
-    @staticmethod
-    def get_analysis_template(context: Optional[Dict] = None) -> str:
-        """Template for analyzing content performance."""
-        # Provide default values for missing context
-        safe_context = context or {}
-        defaults = {
-            "content": "This is a sample content that needs analysis.",
-            "content_type": "text",
-            "industry": "Leadership Development",
-            "target_audience": "Business professionals"
-        }
-        
-        # Merge defaults with provided context
-        for key, value in defaults.items():
-            if key not in safe_context or not safe_context[key]:
-                safe_context[key] = value
-        
-        base_template = """
+        """, defaults={
+    "content": "This is a sample content that needs optimization.",
+    "target_metrics": ["engagement", "readability"],
+    "industry": "Leadership Development",
+    "target_audience": "Business professionals"
+})
+
+ANALYSIS_TEMPLATE = CompiledTemplate("""
         Analyze this LinkedIn content for performance potential:
         
         Content: {content}
@@ -214,9 +248,66 @@ class PromptTemplates:
         - Areas for improvement
         
         Provide a detailed analysis with specific recommendations.
+        """, defaults={
+    "content": "This is a sample content that needs analysis.",
+    "content_type": "text",
+    "industry": "Leadership Development",
+    "target_audience": "Business professionals"
+})
+
+
+class PromptTemplates:
+    """Collection of prompt templates for different content types and purposes."""
+
+    @staticmethod
+    def get_text_post_template(context: Optional[Dict] = None, token_budget: Optional[int] = None,
+                               reserved_tokens: int = 0) -> str:
         """
-        
-        try:
-            return base_template.format(**safe_context)
-        except KeyError as e:
-            return f"Error in template formatting: Missing key {e}" 
\ No newline at end of file
+        Template for generating text-only LinkedIn posts using authentic examples and brand brief, with explicit anti-generic instructions.
+
+        With a ``token_budget``, the examples are shortened to their leading
+        sentences or dropped (least relevant, i.e. last, first) until the
+        prompt plus ``reserved_tokens`` fits, and the budget report is
+        stored in ``context["prompt_budget"]``.
+        """
+        safe_context = TEXT_POST_TEMPLATE.fill_defaults(context or {})
+        examples = safe_context["authentic_examples"][:4]
+
+        # Prepare authentic examples (few-shot); inserted verbatim, so braces
+        # in a post are never mistaken for template fields
+        if token_budget is not None:
+            assembler = PromptAssembler(token_budget, reserved_tokens)
+            assembler.add("instructions", TEXT_POST_TEMPLATE.render_filled(safe_context, example_section=""),
+                          required=True)
+            assembler.add_items("examples", examples, strategy="summarize", header=EXAMPLES_HEADER,
+                                item_format=EXAMPLE_FORMAT)
+            sections, safe_context["prompt_budget"] = assembler.fit()
+            example_section = sections["examples"]
+        else:
+            example_section = ""
+            if examples:
+                example_section = EXAMPLES_HEADER
+                for i, ex in enumerate(examples):
+                    example_section += EXAMPLE_FORMAT.format(number=i + 1, item=ex)
+
+        return TEXT_POST_TEMPLATE.render_filled(safe_context, example_section=example_section)
+
+    @staticmethod
+    def get_media_post_template(context: Optional[Dict] = None) -> str:
+        """Template for generating LinkedIn posts with media."""
+        return MEDIA_POST_TEMPLATE.render(context or {})
+
+    @staticmethod
+    def get_article_template(context: Optional[Dict] = None) -> str:
+        """Template for generating LinkedIn articles."""
+        return ARTICLE_TEMPLATE.render(context or {})
+
+    @staticmethod
+    def get_optimization_template(context: Optional[Dict] = None) -> str:
+        """Template for optimizing existing content."""
+        return OPTIMIZATION_TEMPLATE.render(context or {})
+
+    @staticmethod
+    def get_analysis_template(context: Optional[Dict] = None) -> str:
+        """Template for analyzing content performance."""
+        return ANALYSIS_TEMPLATE.render(context or {})
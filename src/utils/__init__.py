@@ -1,18 +1,40 @@
 """
 Utility functions for the LinkedIn Content System
+
+Public names are resolved on first access (PEP 562), so importing one
+submodule such as ``src.utils.retrieval`` no longer loads sklearn, pandas
+and NLTK through ``FeedbackLoop``, the CSV ingestion and
+``ContentEvaluator``.
 """
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-from src.utils.data_utils import (
-    get_posts_for_training,
-    save_json,
-    load_json,
-    create_timestamp,
-    ensure_directory
-)
-from src.utils.feedback_loop import FeedbackLoop
+# ``brand_knowledge`` is the shared instance, not the submodule of the same
+# name; importing it eagerly keeps it bound over the submodule attribute.
 from src.utils.brand_knowledge import BrandKnowledge, brand_knowledge
-from src.utils.evaluation import ContentEvaluator
-from src.utils.prompt_tuning import PromptTuner
+
+if TYPE_CHECKING:
+    from src.utils.data_utils import (
+        get_posts_for_training,
+        save_json,
+        load_json,
+        create_timestamp,
+        ensure_directory
+    )
+    from src.utils.feedback_loop import FeedbackLoop
+    from src.utils.evaluation import ContentEvaluator
+    from src.utils.prompt_tuning import PromptTuner
+
+_LAZY_ATTRIBUTES = {
+    'get_posts_for_training': 'src.utils.data_utils',
+    'save_json': 'src.utils.data_utils',
+    'load_json': 'src.utils.data_utils',
+    'create_timestamp': 'src.utils.data_utils',
+    'ensure_directory': 'src.utils.data_utils',
+    'FeedbackLoop': 'src.utils.feedback_loop',
+    'ContentEvaluator': 'src.utils.evaluation',
+    'PromptTuner': 'src.utils.prompt_tuning'
+}
 
 __all__ = [
     'get_posts_for_training',
@@ -26,3 +48,16 @@ __all__ = [
     'ContentEvaluator',
     'PromptTuner'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,277 @@
+"""
+Approximate nearest-neighbour search for large post corpora.
+
+``IVFIndex`` is an inverted file index in pure NumPy. The unit-length
+embeddings are clustered with spherical k-means. Rows are stored grouped
+by cluster, so a query only scores the rows of the ``n_probe`` clusters
+whose centroids are closest to it, instead of the whole corpus.
+
+The index is built offline next to the ``EmbeddingIndex`` matrix and is
+keyed by the same corpus hash. The grouped vectors are saved as a ``.npy``
+file that is loaded with ``mmap_mode='r'``; the centroids, list offsets and
+row ids go in a small ``.npz`` file.
+
+    python -m src.utils.ann_index build --posts data_store/authentic_posts.json --lists 256
+
+Both backends implement ``search(query, top_k, mask=None)``, which returns
+row indices into the corpus by descending cosine similarity. ``mask`` is an
+optional boolean array over rows, used for metadata filters.
+"""
+import argparse
+import logging
+import math
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_BACKEND_ENV = "LIFT_RETRIEVAL_BACKEND"
+NPROBE_ENV = "LIFT_IVF_NPROBE"
+
+# Rows scored per chunk while clustering, to bound the size of the
+# (rows x lists) similarity matrix
+_ASSIGN_CHUNK = 8192
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Positions of the ``top_k`` largest scores, best first, via ``argpartition``."""
+    top_k = min(top_k, scores.shape[0])
+    if top_k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class ExactSearch:
+    """Brute-force cosine search over the full embedding matrix."""
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def search(self, query: np.ndarray, top_k: int, mask: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Return the row indices of the ``top_k`` most similar rows.
+
+        Args:
+            query (np.ndarray): Unit-length query vector
+            top_k (int): Number of results
+            mask (Optional[np.ndarray]): Boolean array of eligible rows
+
+        Returns:
+            List[int]: Row indices ordered by descending cosine similarity
+        """
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            scores = self.matrix[rows] @ query
+            return rows[top_k_indices(scores, top_k)].tolist()
+        return top_k_indices(self.matrix @ query, top_k).tolist()
+
+
+class IVFIndex:
+    """Inverted file index over unit-length embeddings."""
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, ids: np.ndarray,
+                 vectors: np.ndarray, n_probe: int = 8):
+        """
+        Initialize from prebuilt arrays (see ``build`` and ``load``).
+
+        Args:
+            centroids (np.ndarray): ``(n_lists, dim)`` unit-length cluster centroids
+            offsets (np.ndarray): ``n_lists + 1`` start offsets of each list in ``vectors``
+            ids (np.ndarray): Corpus row index of each row of ``vectors``
+            vectors (np.ndarray): Embeddings grouped by list
+            n_probe (int): Lists scanned per query by default
+        """
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+        self.n_probe = max(1, min(int(n_probe), len(centroids)))
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: Optional[int] = None, n_probe: Optional[int] = None,
+              n_iter: int = 15, sample_size: Optional[int] = None, seed: int = 0) -> 'IVFIndex':
+        """
+        Cluster ``matrix`` and group its rows by cluster.
+
+        Args:
+            matrix (np.ndarray): ``(rows, dim)`` L2-normalised embeddings
+            n_lists (Optional[int]): Number of clusters; defaults to about ``sqrt(rows)``
+            n_probe (Optional[int]): Default lists per query; defaults to about 10% of the lists
+            n_iter (int): k-means iterations
+            sample_size (Optional[int]): Rows used to train the centroids; defaults to
+                ``64 * n_lists`` (all rows are still assigned)
+            seed (int): Random seed for reproducible builds
+
+        Returns:
+            IVFIndex: The in-memory index
+        """
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        rows = matrix.shape[0]
+        if rows == 0:
+            raise ValueError("Cannot build an IVF index over an empty matrix")
+        n_lists = max(1, min(rows, n_lists or int(math.sqrt(rows))))
+        n_probe = n_probe or max(1, math.ceil(n_lists / 10))
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(rows, sample_size or 64 * n_lists)
+        sample = matrix[rng.choice(rows, size=sample_size, replace=False)] if sample_size < rows else matrix
+        centroids = sample[rng.choice(sample.shape[0], size=n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assignment = cls._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                # Reseed empty clusters with random rows so every list is used
+                sums[empty] = sample[rng.choice(sample.shape[0], size=empty.size, replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        assignment = cls._assign(matrix, centroids)
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=n_lists), out=offsets[1:])
+        return cls(centroids, offsets, order.astype(np.int64), matrix[order], n_probe=n_probe)
+
+    @staticmethod
+    def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Index of the most similar centroid for every row."""
+        assignment = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], _ASSIGN_CHUNK):
+            chunk = matrix[start:start + _ASSIGN_CHUNK]
+            assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return assignment
+
+    @staticmethod
+    def paths(base: Path) -> Tuple[Path, Path]:
+        """Vector and metadata file paths for the index stored at ``base``."""
+        base = Path(base)
+        return base.with_name(base.name + '.ivf.npy'), base.with_name(base.name + '.ivf.npz')
+
+    def save(self, base: Path) -> None:
+        """Write the index next to ``base`` atomically."""
+        vectors_path, meta_path = self.paths(base)
+        vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = vectors_path.with_name(vectors_path.name + '.tmp')
+        with open(tmp_vectors, 'wb') as f:
+            np.save(f, np.asarray(self.vectors, dtype=np.float32))
+        tmp_meta = meta_path.with_name(meta_path.name + '.tmp')
+        with open(tmp_meta, 'wb') as f:
+            np.savez(f, centroids=self.centroids, offsets=self.offsets, ids=self.ids,
+                     n_probe=np.int64(self.n_probe))
+        # Metadata last: a reader that sees it also sees the matching vectors
+        os.replace(tmp_vectors, vectors_path)
+        os.replace(tmp_meta, meta_path)
+
+    @classmethod
+    def load(cls, base: Path) -> Optional['IVFIndex']:
+        """
+        Load the index saved at ``base``, memory-mapping the vectors.
+
+        Returns:
+            Optional[IVFIndex]: The index, or None if it has not been built
+        """
+        vectors_path, meta_path = cls.paths(base)
+        if not (vectors_path.exists() and meta_path.exists()):
+            return None
+        with np.load(meta_path) as meta:
+            centroids, offsets, ids = meta['centroids'], meta['offsets'], meta['ids']
+            n_probe = int(meta['n_probe'])
+        vectors = np.load(vectors_path, mmap_mode='r')
+        if vectors.shape[0] != ids.shape[0]:
+            logger.warning(f"IVF index {vectors_path} is inconsistent; ignoring it")
+            return None
+        n_probe = int(os.environ.get(NPROBE_ENV, n_probe))
+        return cls(centroids, offsets, ids, vectors, n_probe=n_probe)
+
+    def search(self, query: np.ndarray, top_k: int, mask: Optional[np.ndarray] = None,
+               n_probe: Optional[int] = None) -> List[int]:
+        """
+        Return the (approximate) ``top_k`` most similar corpus rows.
+
+        Filters that leave fewer rows than the probed lists would hold are
+        answered exactly from the eligible rows, which is both cheaper and
+        keeps selective filters from returning too few results.
+
+        Args:
+            query (np.ndarray): Unit-length query vector
+            top_k (int): Number of results
+            mask (Optional[np.ndarray]): Boolean array over corpus rows
+            n_probe (Optional[int]): Lists to scan; defaults to ``self.n_probe``
+
+        Returns:
+            List[int]: Corpus row indices ordered by descending cosine similarity
+        """
+        if top_k <= 0 or len(self) == 0:
+            return []
+        n_probe = max(1, min(n_probe or self.n_probe, self.n_lists))
+        centroid_scores = self.centroids @ query
+        eligible_rows = None
+        if mask is not None:
+            eligible_rows = mask[self.ids]
+            eligible = int(np.count_nonzero(eligible_rows))
+            if eligible <= len(self) * n_probe / self.n_lists:
+                rows = np.flatnonzero(eligible_rows)
+                scores = self.vectors[rows] @ query
+                return self.ids[rows[top_k_indices(scores, top_k)]].tolist()
+            # Only probe lists that hold eligible rows, so filters that
+            # correlate with topic do not leave the probed lists empty
+            cumulative = np.concatenate(([0], np.cumsum(eligible_rows)))
+            per_list = cumulative[self.offsets[1:]] - cumulative[self.offsets[:-1]]
+            centroid_scores = np.where(per_list > 0, centroid_scores, -np.inf)
+
+        lists = top_k_indices(centroid_scores, n_probe)
+        rows = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in np.sort(lists)])
+        if eligible_rows is not None:
+            rows = rows[eligible_rows[rows]]
+        if rows.size == 0:
+            return []
+        scores = self.vectors[rows] @ query
+        return self.ids[rows[top_k_indices(scores, top_k)]].tolist()
+
+
+def get_retrieval_backend() -> str:
+    """Backend selected with ``LIFT_RETRIEVAL_BACKEND``: ``exact`` (default) or ``ivf``."""
+    backend = os.environ.get(RETRIEVAL_BACKEND_ENV, "exact").lower()
+    if backend not in ("exact", "ivf"):
+        logger.warning(f"Unknown retrieval backend '{backend}', using exact")
+        return "exact"
+    return backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximate nearest-neighbour index tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the IVF index for a posts file")
+    build.add_argument("--posts", default="data_store/authentic_posts.json", help="Posts JSON file")
+    build.add_argument("--lists", type=int, default=None, help="Number of clusters (default ~sqrt(rows))")
+    build.add_argument("--probe", type=int, default=None, help="Clusters scanned per query (default ~10%%)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from src.utils.retrieval import get_embedding_index
+        index = get_embedding_index(Path(args.posts))
+        if not index.posts:
+            print("No posts to index")
+            return
+        ivf = IVFIndex.build(index.matrix, n_lists=args.lists, n_probe=args.probe)
+        ivf.save(index.base_path)
+        print(f"Built IVF index over {len(ivf)} posts: {ivf.n_lists} lists, n_probe {ivf.n_probe}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
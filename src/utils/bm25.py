@@ -0,0 +1,234 @@
+"""
+BM25 keyword retrieval over the authentic posts corpus.
+
+Used when sentence-transformers (and torch) are not installed, and as the
+lexical half of hybrid retrieval. The inverted index stores, for every
+term, the posts containing it with a precomputed BM25 weight, so a query
+is one ``bincount`` over the postings of its terms plus an
+``argpartition``. Like ``EmbeddingIndex``, the index is persisted as an
+``.npz`` keyed by a content hash of ``authentic_posts.json`` and is only
+rebuilt when the file changes. Its rows line up with the embedding rows,
+so the two rankings can be fused with ``reciprocal_rank_fusion``.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.ann_index import top_k_indices
+from src.utils.embedding_index import INDEX_DIR, POSTS_PATH, hash_file
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how i if in into is it its me my of on or our so
+that the their them there these they this to us was we were what when which who will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens without stopwords (hashtags keep their word)."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = RRF_K,
+                           top_k: Optional[int] = None) -> List[int]:
+    """
+    Merge ranked lists of row indices with reciprocal rank fusion.
+
+    Each list contributes ``1 / (k + rank)`` to the rows it contains, so
+    rows ranked well by several retrievers rise to the top without having
+    to calibrate their raw scores against each other.
+
+    Args:
+        rankings (Iterable[Sequence[int]]): Row indices, best first, one list per retriever
+        k (int): Damping constant (60 in the original paper)
+        top_k (Optional[int]): Number of results (all by default)
+
+    Returns:
+        List[int]: Fused row indices, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, 1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+    fused = sorted(scores, key=lambda row: (-scores[row], row))
+    return fused[:top_k] if top_k is not None else fused
+
+
+class BM25Index:
+    """Persistent BM25 inverted index over ``authentic_posts.json``."""
+
+    def __init__(self, posts_path: Path = POSTS_PATH, index_dir: Path = INDEX_DIR,
+                 k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index.
+
+        Args:
+            posts_path (Path): Path to authentic_posts.json.
+            index_dir (Path): Directory holding the ``.npz`` index.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalisation.
+        """
+        self.posts_path = Path(posts_path)
+        self.index_dir = Path(index_dir)
+        self.k1 = k1
+        self.b = b
+        self.posts: List[Dict] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.term_offsets: Optional[np.ndarray] = None
+        self.doc_ids: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.source_hash: Optional[str] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def _prefix(self) -> str:
+        return f"{self.posts_path.stem}-bm25"
+
+    def _path(self, source_hash: str) -> Path:
+        return self.index_dir / f"{self._prefix}-{source_hash[:16]}.npz"
+
+    def ensure(self) -> 'BM25Index':
+        """
+        Make sure the in-memory index matches the posts file on disk.
+
+        Returns:
+            BM25Index: ``self``, for chaining.
+        """
+        stat = os.stat(self.posts_path)
+        current = (stat.st_mtime_ns, stat.st_size)
+        if self.term_offsets is not None and current == self._stat:
+            return self
+
+        with self._lock:
+            if self.term_offsets is not None and current == self._stat:
+                return self
+            source_hash = hash_file(self.posts_path)
+            if source_hash != self.source_hash or self.term_offsets is None:
+                self._load_or_build(source_hash)
+            self._stat = current
+        return self
+
+    def _load_or_build(self, source_hash: str) -> None:
+        with open(self.posts_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        posts = [post for post in data.get('authentic_posts', []) if post.get('content')]
+
+        path = self._path(source_hash)
+        if path.exists():
+            with np.load(path, allow_pickle=False) as saved:
+                if int(saved['n_docs']) == len(posts) and float(saved['k1']) == self.k1 \
+                        and float(saved['b']) == self.b:
+                    self.vocabulary = {term: i for i, term in enumerate(saved['terms'].tolist())}
+                    self.term_offsets = saved['term_offsets']
+                    self.doc_ids = saved['doc_ids']
+                    self.weights = saved['weights']
+                    self.posts, self.source_hash = posts, source_hash
+                    logger.info(f"Loaded BM25 index from {path}")
+                    return
+            logger.warning(f"BM25 index {path} is inconsistent with posts; rebuilding")
+
+        self.posts, self.source_hash = posts, source_hash
+        self._build(posts)
+        self._save(path)
+        logger.info(f"Built BM25 index for {len(posts)} posts at {path}")
+
+    def _build(self, posts: List[Dict]) -> None:
+        """Compute the postings and their BM25 weights."""
+        counts = [Counter(tokenize(self._document(post))) for post in posts]
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float32)
+        average = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc, counter in enumerate(counts):
+            for term, tf in counter.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(postings)
+        n_docs = len(posts)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        doc_ids: List[int] = []
+        weights: List[float] = []
+        for i, term in enumerate(terms):
+            entries = postings[term]
+            idf = np.log(1.0 + (n_docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc, tf in entries:
+                norm = self.k1 * (1.0 - self.b + self.b * lengths[doc] / average)
+                doc_ids.append(doc)
+                weights.append(idf * tf * (self.k1 + 1.0) / (tf + norm))
+            offsets[i + 1] = len(doc_ids)
+
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.term_offsets = offsets
+        self.doc_ids = np.array(doc_ids, dtype=np.int32)
+        self.weights = np.array(weights, dtype=np.float32)
+
+    @staticmethod
+    def _document(post: Dict) -> str:
+        """Text indexed for a post: its content plus topic and key message."""
+        metadata = post.get('metadata', {})
+        return " ".join([post.get('content', ''), str(metadata.get('topic', '')),
+                         str(metadata.get('key_message', ''))])
+
+    def _save(self, path: Path) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(tmp, 'wb') as f:
+            np.savez(f, terms=np.array(terms, dtype=str), term_offsets=self.term_offsets,
+                     doc_ids=self.doc_ids, weights=self.weights, n_docs=np.int64(len(self.posts)),
+                     k1=np.float64(self.k1), b=np.float64(self.b))
+        os.replace(tmp, path)
+        for stale in self.index_dir.glob(f"{self._prefix}-*.npz"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError as e:
+                    logger.warning(f"Could not remove stale BM25 index {stale}: {e}")
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every post for ``query``."""
+        rows = [self.vocabulary[term] for term in set(tokenize(query)) if term in self.vocabulary]
+        if not rows:
+            return np.zeros(len(self.posts), dtype=np.float32)
+        if len(rows) == 1:
+            start, end = self.term_offsets[rows[0]], self.term_offsets[rows[0] + 1]
+            doc_ids, weights = self.doc_ids[start:end], self.weights[start:end]
+        else:
+            spans = [slice(self.term_offsets[row], self.term_offsets[row + 1]) for row in rows]
+            doc_ids = np.concatenate([self.doc_ids[span] for span in spans])
+            weights = np.concatenate([self.weights[span] for span in spans])
+        return np.bincount(doc_ids, weights=weights, minlength=len(self.posts)).astype(np.float32)
+
+    def search(self, query: str, top_k: int = 2, mask: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Return the row indices of the ``top_k`` best-matching posts.
+
+        Posts that share no term with the query are never returned.
+
+        Args:
+            query (str): Free-text query (e.g. the post topic).
+            top_k (int): Number of results.
+            mask (Optional[np.ndarray]): Boolean array of eligible rows.
+
+        Returns:
+            List[int]: Row indices ordered by descending BM25 score.
+        """
+        if not self.posts or top_k <= 0:
+            return []
+        scores = self.scores(query)
+        if mask is not None:
+            scores = np.where(mask, scores, 0.0)
+        matches = int(np.count_nonzero(scores))
+        return top_k_indices(scores, min(top_k, matches)).tolist()
@@ -1,44 +1,211 @@
+import hashlib
 import json
 import os
+import threading
+import time
+from collections import ChainMap
 from pathlib import Path
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class BrandKnowledge:
-    """Loads and provides brand knowledge for content generation."""
+    """
+    Loads and provides brand knowledge for content generation.
     
-    def __init__(self, brand_brief_path: str = None):
+    The parsed brief, the context fragments and the BRAND GUIDANCE block
+    derived from it form one immutable snapshot that is swapped atomically
+    when ``brand_brief.json`` changes on disk (detected by mtime/size,
+    confirmed by content hash). Readers never wait for a reload: they keep
+    using the current snapshot until the new one is in place.
+    
+    By default the file is checked on access, at most once every
+    ``check_interval`` seconds. ``start_watching`` moves the checks to a
+    background polling thread instead. ``version`` increases with every
+    reload so caches keyed on the brief can invalidate.
+    """
+    
+    def __init__(self, brand_brief_path: str = None, check_interval: float = 1.0):
         """
         Initialize the brand knowledge provider.
         
         Args:
             brand_brief_path (str, optional): Path to the brand brief JSON file.
                 Defaults to 'brand_knowledge/brand_brief.json'.
+            check_interval (float): Minimum seconds between checks of the file for changes
         """
         self.brand_brief_path = brand_brief_path or os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
             'brand_knowledge', 'brand_brief.json'
         )
-        self.brand_brief = self._load_brand_brief()
+        self.check_interval = check_interval
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._listeners: List[Callable[[int], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.reload(force=True)
+    
+    @property
+    def brand_brief(self) -> Dict[str, Any]:
+        """The brand brief, reloaded if the file changed since the last check."""
+        return self._current()['brief']
+    
+    @brand_brief.setter
+    def brand_brief(self, brief: Dict[str, Any]) -> None:
+        with self._lock:
+            snapshot = self._snapshot or {'hash': None, 'stat': None, 'version': 0}
+            self._snapshot = self._build_snapshot(brief, snapshot['hash'], snapshot['stat'],
+                                                  snapshot['version'] + 1)
+        self._notify()
+    
+    @property
+    def version(self) -> int:
+        """Version of the loaded brief; increases every time a changed brief is swapped in."""
+        return self._current()['version']
+    
+    def _current(self) -> Dict[str, Any]:
+        """Get the current snapshot, checking the file first if a check is due."""
+        if self._watcher is None:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._next_check = now + self.check_interval
+                self.reload()
+        return self._snapshot
+    
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.brand_brief_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _build_snapshot(self, brief: Dict[str, Any], digest: Optional[str],
+                        state: Optional[Tuple[int, int]], version: int) -> Dict[str, Any]:
+        return {
+            'brief': brief,
+            'compiled': self._compile(brief),
+            'hash': digest,
+            'stat': state,
+            'version': version
+        }
+    
+    def reload(self, force: bool = False) -> bool:
+        """
+        Check the brief file now and swap in a new snapshot if its content changed.
+        
+        Unless forced, never blocks: if another thread is already reloading,
+        this returns immediately and callers keep using the current snapshot.
+        A forced reload waits for that reload to finish and then rebuilds. A
+        file that fails to parse (e.g. half-written) leaves the current brief
+        in place and is retried on the next check.
         
-    def _load_brand_brief(self) -> Dict[str, Any]:
-        """Load the brand brief from the JSON file."""
+        Args:
+            force (bool): Wait for the lock and rebuild the snapshot even if
+                the file looks unchanged
+            
+        Returns:
+            bool: True if a new snapshot was swapped in
+        """
+        if not self._lock.acquire(blocking=force or self._snapshot is None):
+            return False
         try:
-            if os.path.exists(self.brand_brief_path):
-                with open(self.brand_brief_path, 'r') as f:
-                    brand_brief = json.load(f)
-                logger.info(f"Successfully loaded brand brief from {self.brand_brief_path}")
-                return brand_brief
-            else:
+            current = self._snapshot
+            state = self._file_state()
+            if not force and current is not None and state == current['stat']:
+                return False
+            
+            data, digest = None, None
+            if state is not None:
+                try:
+                    with open(self.brand_brief_path, 'rb') as f:
+                        data = f.read()
+                except OSError as e:
+                    logger.error(f"Error loading brand brief: {str(e)}")
+                    if current is not None:
+                        return False
+                digest = hashlib.sha256(data).hexdigest() if data is not None else None
+            if not force and current is not None and digest == current['hash']:
+                # Touched but not changed
+                self._snapshot = {**current, 'stat': state}
+                return False
+            
+            if data is None:
                 logger.warning(f"Brand brief file not found at {self.brand_brief_path}")
-                return {}
-        except Exception as e:
-            logger.error(f"Error loading brand brief: {str(e)}")
-            return {}
+                brief = {}
+            else:
+                try:
+                    brief = json.loads(data)
+                except ValueError as e:
+                    logger.error(f"Error loading brand brief: {str(e)}")
+                    if current is not None:
+                        return False
+                    brief = {}
+                else:
+                    logger.info(f"Successfully loaded brand brief from {self.brand_brief_path}")
+            
+            version = current['version'] + 1 if current is not None else 1
+            self._snapshot = self._build_snapshot(brief, digest, state, version)
+        finally:
+            self._lock.release()
+        
+        if current is not None:
+            logger.info(f"Brand brief reloaded (version {version})")
+            self._notify()
+        return True
+    
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """Call ``callback(version)`` whenever a new brief is swapped in."""
+        self._listeners.append(callback)
+    
+    def _notify(self) -> None:
+        version = self._snapshot['version']
+        for callback in list(self._listeners):
+            try:
+                callback(version)
+            except Exception as e:
+                logger.error(f"Brand brief listener failed: {str(e)}")
+    
+    def start_watching(self, interval: float = 2.0) -> threading.Thread:
+        """
+        Poll the brief file for changes in a background thread.
+        
+        While watching, accessors no longer touch the file system at all.
+        
+        Args:
+            interval (float): Seconds between polls
+            
+        Returns:
+            threading.Thread: The watcher thread
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+        self._stop_watching.clear()
+        
+        def _watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.error(f"Error checking brand brief: {str(e)}")
+        
+        self._watcher = threading.Thread(target=_watch, name="brand-brief-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {self.brand_brief_path} for changes every {interval}s")
+        return self._watcher
+    
+    def stop_watching(self) -> None:
+        """Stop the watcher thread; accessors go back to checking on access."""
+        watcher = self._watcher
+        if watcher is None:
+            return
+        self._stop_watching.set()
+        watcher.join()
+        self._watcher = None
     
     def get_full_brief(self) -> Dict[str, Any]:
         """Get the complete brand brief."""
@@ -76,47 +243,58 @@ class BrandKnowledge:
         """Get unique selling points from the brand brief."""
         return self.brand_brief.get('unique_selling_points', [])
     
-    def enrich_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _compile(self, brief: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the context fragments and guidance block for ``brief``."""
+        company_info = brief.get('company_info', {})
+        audience = brief.get('target_audience', {})
+        voice = brief.get('brand_voice', {}).get('tone', '')
+        return {
+            'brand': {
+                'company_name': company_info.get('name', ''),
+                'tagline': company_info.get('tagline', ''),
+                'voice': voice,
+                'primary_audience': audience.get('primary', ''),
+                'key_messages': brief.get('key_messages', []),
+                'values': brief.get('values', []),
+                'unique_selling_points': brief.get('unique_selling_points', [])
+            },
+            'audience': {
+                'primary': audience.get('primary', ''),
+                'pain_points': audience.get('pain_points', []),
+                'goals': audience.get('goals', [])
+            },
+            'defaults': {
+                'industry': 'Leadership Development',
+                'tone': voice,
+                'hashtags': brief.get('content_strategy', {}).get('engagement', {}).get('hashtags', [])
+            },
+            'brand_guidance': self._render_brand_guidance(brief) if brief else None
+        }
+    
+    def enrich_context(self, context: Dict[str, Any]) -> ChainMap:
         """
         Enrich the content generation context with brand information.
         
+        Returns a copy-on-write view rather than a copy: writes go to a new
+        top layer, so neither ``context`` nor the cached brand fragments are
+        modified. Treat the nested ``brand``/``audience`` values as read-only.
+        
         Args:
             context (Dict[str, Any]): Original context for content generation
             
         Returns:
-            Dict[str, Any]: Enriched context with brand information
+            ChainMap: Enriched context with brand information
         """
-        enriched = context.copy()
-        
-        # Add brand knowledge to context
-        enriched['brand'] = {
-            'company_name': self.brand_brief.get('company_info', {}).get('name', ''),
-            'tagline': self.brand_brief.get('company_info', {}).get('tagline', ''),
-            'voice': self.brand_brief.get('brand_voice', {}).get('tone', ''),
-            'primary_audience': self.brand_brief.get('target_audience', {}).get('primary', ''),
-            'key_messages': self.brand_brief.get('key_messages', []),
-            'values': self.brand_brief.get('values', []),
-            'unique_selling_points': self.brand_brief.get('unique_selling_points', [])
-        }
+        compiled = self._current()['compiled']
         
-        # Add audience pain points and goals
-        enriched['audience'] = {
-            'primary': self.brand_brief.get('target_audience', {}).get('primary', ''),
-            'pain_points': self.brand_brief.get('target_audience', {}).get('pain_points', []),
-            'goals': self.brand_brief.get('target_audience', {}).get('goals', [])
-        }
+        # Brand and audience always override; the content strategy defaults
+        # only fill in values the caller left empty
+        overlay = {'brand': compiled['brand'], 'audience': compiled['audience']}
+        for key, value in compiled['defaults'].items():
+            if not context.get(key):
+                overlay[key] = value
         
-        # Add content strategy elements
-        if not enriched.get('industry'):
-            enriched['industry'] = 'Leadership Development'
-            
-        if not enriched.get('tone'):
-            enriched['tone'] = self.brand_brief.get('brand_voice', {}).get('tone', '')
-            
-        if not enriched.get('hashtags'):
-            enriched['hashtags'] = self.brand_brief.get('content_strategy', {}).get('engagement', {}).get('hashtags', [])
-            
-        return enriched
+        return ChainMap({}, overlay, context)
     
     def format_brand_prompt(self, base_prompt: str) -> str:
         """
@@ -128,15 +306,22 @@ class BrandKnowledge:
         Returns:
             str: Prompt enriched with brand information
         """
+        brand_guidance = self._current()['compiled']['brand_guidance']
+        
         # Check if brand brief exists
-        if not self.brand_brief:
+        if brand_guidance is None:
             return base_prompt
-            
+        
+        # Add brand guidance to the prompt
+        return f"{base_prompt}\n\n{brand_guidance}"
+    
+    def _render_brand_guidance(self, brief: Dict[str, Any]) -> str:
+        """Render the BRAND GUIDANCE block for ``brief``."""
         # Extract core brand information
-        company_name = self.brand_brief.get('company_info', {}).get('name', '')
-        tagline = self.brand_brief.get('company_info', {}).get('tagline', '')
-        voice = self.brand_brief.get('brand_voice', {}).get('tone', '')
-        audience = self.brand_brief.get('target_audience', {}).get('primary', '')
+        company_name = brief.get('company_info', {}).get('name', '')
+        tagline = brief.get('company_info', {}).get('tagline', '')
+        voice = brief.get('brand_voice', {}).get('tone', '')
+        audience = brief.get('target_audience', {}).get('primary', '')
         
         # Create brand guidance section
         brand_guidance = f"""
@@ -147,24 +332,21 @@ class BrandKnowledge:
         Primary Audience: {audience}
         
         Key Messages:
-        {self._format_list(self.brand_brief.get('key_messages', []))}
+        {self._format_list(brief.get('key_messages', []))}
         
         Values:
-        {self._format_list(self.brand_brief.get('values', []))}
+        {self._format_list(brief.get('values', []))}
         
         Unique Selling Points:
-        {self._format_list(self.brand_brief.get('unique_selling_points', []))}
+        {self._format_list(brief.get('unique_selling_points', []))}
         
         Audience Pain Points:
-        {self._format_list(self.brand_brief.get('target_audience', {}).get('pain_points', []))}
+        {self._format_list(brief.get('target_audience', {}).get('pain_points', []))}
         
         Audience Goals:
-        {self._format_list(self.brand_brief.get('target_audience', {}).get('goals', []))}
+        {self._format_list(brief.get('target_audience', {}).get('goals', []))}
         """
-        
-        # Add brand guidance to the prompt
-        enriched_prompt = f"{base_prompt}\n\n{brand_guidance}"
-        return enriched_prompt
+        return brand_guidance
     
     def _format_list(self, items: list) -> str:
         """Format a list of items as a bulleted string."""
@@ -174,4 +356,9 @@ class BrandKnowledge:
 
 
 # Singleton instance for easy import
-brand_knowledge = BrandKnowledge() 
\ No newline at end of file
+brand_knowledge = BrandKnowledge()
+
+# Set LIFT_BRAND_WATCH_INTERVAL (seconds) to pick up brief edits from a
+# background watcher instead of on access
+if float(os.environ.get("LIFT_BRAND_WATCH_INTERVAL", "0") or 0) > 0:
+    brand_knowledge.start_watching(float(os.environ["LIFT_BRAND_WATCH_INTERVAL"])) 
\ No newline at end of file
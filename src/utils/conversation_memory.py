@@ -0,0 +1,284 @@
+"""
+Bounded chat memory with a rolling summary, persisted per session and agent.
+
+A ``ConversationMemory`` keeps the last ``max_turns`` user/assistant turns
+verbatim and folds older turns into a summary, so the history sent with
+each message stays within ``token_budget`` however long the chat runs.
+Folding is extractive by default: every folded message is reduced to its
+leading sentence(s) and the oldest of those lines are dropped once the
+summary outgrows its share of the budget. Pass ``summarizer`` to
+summarize with a model instead.
+
+Each conversation is an append-only JSONL file in ``chat_history/``: one
+compact line per message, plus one line per fold
+(``{"summary": ..., "folded": n}``). A file is only read when its memory
+is first used, and is rewritten as summary plus recent turns once folded
+lines make up most of it.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.utils.prompt_budget import summarize_to_tokens, truncate_to_tokens
+from src.utils.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = Path('chat_history')
+MAX_TURNS_ENV = 'LIFT_CHAT_MEMORY_TURNS'
+TOKEN_BUDGET_ENV = 'LIFT_CHAT_MEMORY_TOKENS'
+DEFAULT_MAX_TURNS = 6
+DEFAULT_TOKEN_BUDGET = 1500
+# Share of the token budget the rolling summary may take
+SUMMARY_SHARE = 0.3
+# Rewrite a history file once it has this many times the lines needed to restore it
+COMPACT_FACTOR = 4
+
+ROLE_LABELS = {"user": "User", "assistant": "Assistant"}
+_SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# (previous summary, messages being folded, token limit) -> new summary
+Summarizer = Callable[[str, List[Dict[str, str]], int], str]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.environ.get(name)!r}")
+        return default
+
+
+def format_message(message: Dict[str, str]) -> str:
+    """Render one message as ``Role: content``."""
+    return f"{ROLE_LABELS.get(message['role'], message['role'].title())}: {message['content']}"
+
+
+def extractive_summarizer(summary: str, messages: List[Dict[str, str]], max_tokens: int,
+                          counter: Callable[[str], int] = count_tokens) -> str:
+    """
+    Fold ``messages`` into ``summary`` without calling a model.
+
+    Each message becomes one line holding its leading sentence(s); when the
+    summary exceeds ``max_tokens`` the oldest lines are dropped first.
+
+    Args:
+        summary (str): Summary so far, one line per folded message
+        messages (List[Dict[str, str]]): Messages to fold, oldest first
+        max_tokens (int): Token limit for the new summary
+        counter (Callable[[str], int]): Token counter
+
+    Returns:
+        str: The new summary
+    """
+    line_tokens = max(16, max_tokens // 6)
+    lines = summary.splitlines() if summary else []
+    for message in messages:
+        gist = summarize_to_tokens(" ".join(message['content'].split()), line_tokens, counter)
+        lines.append(format_message({"role": message['role'], "content": gist}))
+    while len(lines) > 1 and counter("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return truncate_to_tokens("\n".join(lines), max_tokens, counter)
+
+
+class ConversationMemory:
+    """Recent turns verbatim plus a rolling summary of everything older."""
+
+    def __init__(self, path: Path, max_turns: Optional[int] = None, token_budget: Optional[int] = None,
+                 summary_tokens: Optional[int] = None, summarizer: Optional[Summarizer] = None,
+                 counter: Callable[[str], int] = count_tokens):
+        """
+        Initialize the memory; the history file is not read until first use.
+
+        Args:
+            path (Path): JSONL file holding this conversation
+            max_turns (Optional[int]): User/assistant turns kept verbatim; defaults to
+                ``LIFT_CHAT_MEMORY_TURNS`` or 6
+            token_budget (Optional[int]): Token limit for ``format_history``; defaults to
+                ``LIFT_CHAT_MEMORY_TOKENS`` or 1500
+            summary_tokens (Optional[int]): Token limit for the summary; defaults to 30% of the budget
+            summarizer (Optional[Summarizer]): Folds messages into the summary; extractive by default
+            counter (Callable[[str], int]): Token counter
+        """
+        self.path = Path(path)
+        self.max_turns = max_turns if max_turns is not None else _env_int(MAX_TURNS_ENV, DEFAULT_MAX_TURNS)
+        self.token_budget = token_budget if token_budget is not None else _env_int(TOKEN_BUDGET_ENV,
+                                                                                   DEFAULT_TOKEN_BUDGET)
+        self.summary_tokens = summary_tokens if summary_tokens is not None \
+            else int(self.token_budget * SUMMARY_SHARE)
+        self.summarizer = summarizer
+        self.counter = counter
+        self._messages: Optional[List[Dict[str, str]]] = None
+        self._summary = ""
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        """Replay the history file (called with the lock held)."""
+        if self._messages is not None:
+            return
+        messages: List[Dict[str, str]] = []
+        summary, lines = "", 0
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for number, line in enumerate(f, 1):
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable line {number} of {self.path}")
+                        continue
+                    lines += 1
+                    if 'summary' in record:
+                        summary = record['summary']
+                        del messages[:record.get('folded', 0)]
+                    else:
+                        messages.append({"role": record['role'], "content": record['content']})
+        self._messages, self._summary, self._lines = messages, summary, lines
+
+    def _write(self, *records: Dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._lines += len(records)
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages kept verbatim, oldest first."""
+        with self._lock:
+            self._load()
+            return list(self._messages)
+
+    @property
+    def summary(self) -> str:
+        """Rolling summary of the folded messages ("" if nothing was folded)."""
+        with self._lock:
+            self._load()
+            return self._summary
+
+    def append(self, role: str, content: str) -> None:
+        """
+        Record a message, then fold old turns until the memory fits its limits.
+
+        Args:
+            role (str): ``"user"`` or ``"assistant"``
+            content (str): Message text
+        """
+        with self._lock:
+            self._load()
+            message = {"role": role, "content": content}
+            self._messages.append(message)
+            self._write(message)
+            self._fold()
+            if self._lines > COMPACT_FACTOR * (len(self._messages) + 1):
+                self._compact()
+
+    def _render(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        parts = []
+        if summary:
+            parts.append(f"Summary of the earlier conversation:\n{summary}")
+        if messages:
+            parts.append("Recent messages:\n" + "\n\n".join(format_message(m) for m in messages))
+        return "\n\n".join(parts)
+
+    def _oldest_turn(self) -> int:
+        """Number of leading messages that make up the oldest turn."""
+        if len(self._messages) > 1 and self._messages[0]['role'] == 'user' \
+                and self._messages[1]['role'] == 'assistant':
+            return 2
+        return 1
+
+    def _fold(self) -> None:
+        """Move the oldest turns into the summary while over the turn or token limit."""
+        folded: List[Dict[str, str]] = []
+        while len(self._messages) > 1 and (
+                len(self._messages) > 2 * self.max_turns
+                or self.counter(self._render(self._summary, self._messages)) > self.token_budget):
+            count = min(self._oldest_turn(), len(self._messages) - 1)
+            turn, self._messages = self._messages[:count], self._messages[count:]
+            self._summary = self._summarize(self._summary, turn)
+            folded.extend(turn)
+        if folded:
+            self._write({"summary": self._summary, "folded": len(folded)})
+            logger.debug(f"Folded {len(folded)} messages of {self.path.name} into the summary")
+
+    def _summarize(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        if self.summarizer is None:
+            return extractive_summarizer(summary, messages, self.summary_tokens, self.counter)
+        try:
+            return truncate_to_tokens(self.summarizer(summary, messages, self.summary_tokens),
+                                      self.summary_tokens, self.counter)
+        except Exception as e:
+            logger.error(f"Summarizer failed, falling back to extractive summary: {str(e)}")
+            return extractive_summarizer(summary, messages, self.summary_tokens, self.counter)
+
+    def _compact(self) -> None:
+        """Rewrite the file as one summary line plus the verbatim messages."""
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        records = ([{"summary": self._summary, "folded": 0}] if self._summary else []) + self._messages
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+        os.replace(tmp, self.path)
+        self._lines = len(records)
+
+    def format_history(self) -> str:
+        """
+        Render the summary and recent messages for a prompt.
+
+        Returns:
+            str: At most ``token_budget`` tokens of history ("" for a new conversation)
+        """
+        with self._lock:
+            self._load()
+            history = self._render(self._summary, self._messages)
+        # Only a single message larger than the whole budget can still overflow
+        return truncate_to_tokens(history, self.token_budget, self.counter)
+
+    def clear(self) -> None:
+        """Forget the conversation and delete its file."""
+        with self._lock:
+            self._messages, self._summary, self._lines = [], "", 0
+            if self.path.exists():
+                self.path.unlink()
+
+
+class ConversationStore:
+    """The memories of one chat session, one per agent, created on first use."""
+
+    def __init__(self, session_id: str, history_dir: Path = HISTORY_DIR, **memory_options):
+        """
+        Initialize the store.
+
+        Args:
+            session_id (str): Letters, digits, ``-`` and ``_`` only (it becomes part of file names)
+            history_dir (Path): Directory holding the history files
+            **memory_options: Passed to every ``ConversationMemory``
+        """
+        if not _SESSION_ID.match(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        self.session_id = session_id
+        self.history_dir = Path(history_dir)
+        self.memory_options = memory_options
+        self._memories: Dict[str, ConversationMemory] = {}
+
+    @staticmethod
+    def is_valid_session_id(session_id: str) -> bool:
+        """Check whether ``session_id`` can be used to name history files."""
+        return bool(_SESSION_ID.match(session_id or ""))
+
+    def path_for(self, agent: str) -> Path:
+        """History file for ``agent`` in this session."""
+        slug = re.sub(r'[^a-z0-9]+', '-', agent.lower()).strip('-') or 'agent'
+        return self.history_dir / f"{self.session_id}-{slug}.jsonl"
+
+    def get(self, agent: str) -> ConversationMemory:
+        """Return the memory for ``agent``, creating it (but not reading its file) on first use."""
+        memory = self._memories.get(agent)
+        if memory is None:
+            memory = self._memories[agent] = ConversationMemory(self.path_for(agent), **self.memory_options)
+        return memory
@@ -1,10 +1,11 @@
 import os
 import json
-import csv
 from typing import Any, Dict, List
 import logging
 from datetime import datetime
 
+from src.utils.ingestion import load_posts_frame
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,46 +13,44 @@ logger = logging.getLogger(__name__)
 def get_posts_for_training() -> List[Dict[str, Any]]:
     """
     Fetch and prepare posts for training the AI model from the data file.
+
+    The CSV is parsed once into the typed columnar cache by
+    ``src.utils.ingestion``; rows with malformed counts are left out and
+    recorded in the reject file rather than failing the whole load.
     """
     try:
-        # Get the path to the data file
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_file = os.path.join(current_dir, 'data')
-        
+        # Get the path to the data file at the repository root
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        data_file = os.path.join(root_dir, 'data')
+
+        frame = load_posts_frame(data_file, os.path.join(root_dir, 'data_store', 'ingested'))
+
         training_examples = []
-        
-        # Read the CSV data
-        with open(data_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Skip empty rows
-                if not any(row.values()):
-                    continue
-                    
-                # Create training example
-                example = {
-                    "content": row.get('POST_TEXT', ''),
-                    "metadata": {
-                        "post_id": row.get('POST_ID', ''),
-                        "likes": int(row.get('LIKES', 0)),
-                        "comments": int(row.get('COMMENTS', 0)),
-                        "shares": int(row.get('SHARES', 0)),
-                        "date": row.get('DATE', ''),
-                        "content_type": row.get('CONTENT_TYPE', ''),
-                        "industry": row.get('INDUSTRY', ''),
-                        "post_length": row.get('POST_LENGTH', ''),
-                        "purpose": row.get('PURPOSE', ''),
-                        "tone": row.get('TONE', ''),
-                        "topic": row.get('TOPIC', ''),
-                        "cta_type": row.get('CTA_TYPE', ''),
-                        "hashtags": row.get('HASHTAGS', ''),
-                        "engagement_rate": float(row.get('ENGAGEMENT_RATE', 0)),
-                        "account_size": row.get('ACCOUNT_SIZE', ''),
-                        "success_rating": row.get('SUCCESS_RATING', '')
-                    }
+        for row in frame.to_dict('records'):
+            # Create training example
+            example = {
+                "content": row.get('POST_TEXT', ''),
+                "metadata": {
+                    "post_id": row.get('POST_ID', ''),
+                    "likes": int(row.get('LIKES', 0)),
+                    "comments": int(row.get('COMMENTS', 0)),
+                    "shares": int(row.get('SHARES', 0)),
+                    "date": row.get('DATE', ''),
+                    "content_type": row.get('CONTENT_TYPE', ''),
+                    "industry": row.get('INDUSTRY', ''),
+                    "post_length": row.get('POST_LENGTH', ''),
+                    "purpose": row.get('PURPOSE', ''),
+                    "tone": row.get('TONE', ''),
+                    "topic": row.get('TOPIC', ''),
+                    "cta_type": row.get('CTA_TYPE', ''),
+                    "hashtags": row.get('HASHTAGS', ''),
+                    "engagement_rate": float(row.get('ENGAGEMENT_RATE', 0)),
+                    "account_size": row.get('ACCOUNT_SIZE', ''),
+                    "success_rating": row.get('SUCCESS_RATING', '')
                 }
-                training_examples.append(example)
-        
+            }
+            training_examples.append(example)
+
         logger.info(f"Successfully fetched {len(training_examples)} training examples from data file")
         return training_examples
     except Exception as e:
@@ -0,0 +1,313 @@
+"""
+Persistent embedding index for the authentic posts corpus.
+
+The index is a float32 matrix of L2-normalised post embeddings saved as a
+``.npy`` file (loaded with ``mmap_mode='r'``) plus a JSON manifest listing
+the post ids and per-post content hashes in row order. Both files are keyed
+by a content hash of ``authentic_posts.json``. When the file changes, rows
+of posts whose text is unchanged are copied from the previous index, so
+only new or edited posts are encoded and deleted ones are dropped.
+
+Searches go through a pluggable backend: exact brute force by default, or
+an IVF index built offline with ``python -m src.utils.ann_index build``
+(``LIFT_RETRIEVAL_BACKEND=ivf``). Both accept metadata filters on topic,
+content type and posting date.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.utils.ann_index import ExactSearch, IVFIndex, get_retrieval_backend
+
+logger = logging.getLogger(__name__)
+
+POSTS_PATH = Path('data_store/authentic_posts.json')
+INDEX_DIR = Path('data_store/embeddings')
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a post's text, used to reuse its embedding across corpus versions."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise each row so that dot products are cosine similarities."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingIndex:
+    """On-disk, memory-mapped embedding index over ``authentic_posts.json``."""
+
+    def __init__(self, posts_path: Path = POSTS_PATH, index_dir: Path = INDEX_DIR,
+                 model_name: str = 'all-MiniLM-L6-v2', backend: Optional[str] = None):
+        """
+        Initialize the index.
+
+        Args:
+            posts_path (Path): Path to authentic_posts.json.
+            index_dir (Path): Directory holding the ``.npy`` matrix and manifest.
+            model_name (str): Name of the embedding model; part of the index key.
+            backend (Optional[str]): ``exact`` or ``ivf``; defaults to ``LIFT_RETRIEVAL_BACKEND``.
+        """
+        self.posts_path = Path(posts_path)
+        self.index_dir = Path(index_dir)
+        self.model_name = model_name
+        self.backend_name = backend or get_retrieval_backend()
+        self.posts: List[Dict] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.backend: Optional[Union[ExactSearch, IVFIndex]] = None
+        self.source_hash: Optional[str] = None
+        # Reused/encoded/dropped counts of the last (re)build, None if loaded from disk
+        self.last_update: Optional[Dict[str, int]] = None
+        self._metadata: Optional[Dict[str, np.ndarray]] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def _prefix(self) -> str:
+        model_slug = self.model_name.replace('/', '_')
+        return f"{self.posts_path.stem}-{model_slug}"
+
+    def _base(self, source_hash: str) -> Path:
+        return self.index_dir / f"{self._prefix}-{source_hash[:16]}"
+
+    def _paths(self, source_hash: str) -> Tuple[Path, Path]:
+        base = self._base(source_hash)
+        return base.with_suffix('.npy'), base.with_suffix('.json')
+
+    @property
+    def base_path(self) -> Path:
+        """Path prefix of the current index files (ANN indexes are stored next to it)."""
+        if self.source_hash is None:
+            raise RuntimeError("Index has not been loaded; call ensure() first")
+        return self._base(self.source_hash)
+
+    def ensure(self, encode: Encoder) -> 'EmbeddingIndex':
+        """
+        Make sure the in-memory index matches the posts file on disk.
+
+        The file is only hashed when its mtime or size changed since the last
+        check, and posts are only re-encoded when no index exists for the hash.
+
+        Args:
+            encode (Encoder): Callable mapping a list of texts to a 2-D array.
+
+        Returns:
+            EmbeddingIndex: ``self``, for chaining.
+        """
+        stat = os.stat(self.posts_path)
+        current = (stat.st_mtime_ns, stat.st_size)
+        if self.matrix is not None and current == self._stat:
+            return self
+
+        with self._lock:
+            if self.matrix is not None and current == self._stat:
+                return self
+            source_hash = hash_file(self.posts_path)
+            if source_hash != self.source_hash or self.matrix is None:
+                self._load_or_build(source_hash, encode)
+            self._stat = current
+        return self
+
+    def _load_or_build(self, source_hash: str, encode: Encoder) -> None:
+        """Load the index for ``source_hash`` from disk, building it if missing."""
+        with open(self.posts_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        posts = [post for post in data.get('authentic_posts', []) if post.get('content')]
+
+        matrix_path, manifest_path = self._paths(source_hash)
+        if matrix_path.exists() and manifest_path.exists():
+            matrix = np.load(matrix_path, mmap_mode='r')
+            if matrix.shape[0] == len(posts):
+                logger.info(f"Loaded embedding index from {matrix_path}")
+                self.posts, self.matrix, self.source_hash = posts, matrix, source_hash
+                self.last_update = None
+                self._load_backend()
+                return
+            logger.warning(f"Embedding index {matrix_path} is inconsistent with posts; rebuilding")
+
+        self.posts = posts
+        self.matrix = self._build(posts, source_hash, encode)
+        self.source_hash = source_hash
+        self._load_backend()
+
+    def _load_backend(self) -> None:
+        """Attach the search backend for the current matrix."""
+        self._metadata = None
+        self.backend = ExactSearch(self.matrix)
+        if self.backend_name == 'ivf' and len(self.posts):
+            ivf = IVFIndex.load(self.base_path)
+            if ivf is not None and len(ivf) == len(self.posts):
+                logger.info(f"Using IVF index ({ivf.n_lists} lists, n_probe {ivf.n_probe})")
+                self.backend = ivf
+            else:
+                logger.warning("No IVF index for the current posts; using exact search. "
+                               "Build one with: python -m src.utils.ann_index build")
+
+    def _previous_vectors(self, source_hash: str) -> Tuple[Dict[str, int], Optional[np.ndarray]]:
+        """Row per content hash and matrix of the newest index for another corpus version."""
+        manifests = [path for path in self.index_dir.glob(f"{self._prefix}-*.json")
+                     if not path.name.startswith(self._base(source_hash).name)]
+        for manifest_path in sorted(manifests, key=lambda path: path.stat().st_mtime, reverse=True):
+            matrix_path = manifest_path.with_suffix('.npy')
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    hashes = json.load(f).get('content_hashes')
+                matrix = np.load(matrix_path, mmap_mode='r')
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read previous embedding index {matrix_path}: {e}")
+                continue
+            if hashes and matrix.ndim == 2 and matrix.shape[0] == len(hashes):
+                return {digest: row for row, digest in enumerate(hashes)}, matrix
+        return {}, None
+
+    def _build(self, posts: List[Dict], source_hash: str, encode: Encoder) -> np.ndarray:
+        """Encode new or changed posts, reuse the rest, and persist the matrix and manifest atomically."""
+        texts = [post['content'] for post in posts]
+        # Always hashed from the text, so a hand-edited post never keeps a stale vector
+        hashes = [content_hash(text) for text in texts]
+        previous, previous_matrix = self._previous_vectors(source_hash)
+
+        reused = [row for row, digest in enumerate(hashes) if digest in previous]
+        missing = [row for row, digest in enumerate(hashes) if digest not in previous]
+        encoded = normalize_rows(encode([texts[row] for row in missing])) if missing else None
+        if texts:
+            dim = encoded.shape[1] if encoded is not None else previous_matrix.shape[1]
+            matrix = np.empty((len(texts), dim), dtype=np.float32)
+            if reused:
+                matrix[reused] = previous_matrix[[previous[hashes[row]] for row in reused]]
+            if missing:
+                matrix[missing] = encoded
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        self.last_update = {
+            'reused': len(reused),
+            'encoded': len(missing),
+            'dropped': len(set(previous) - set(hashes))
+        }
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        matrix_path, manifest_path = self._paths(source_hash)
+        manifest = {
+            'source': str(self.posts_path),
+            'source_hash': source_hash,
+            'model_name': self.model_name,
+            'dim': int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            'post_ids': [post.get('post_id', '') for post in posts],
+            'content_hashes': hashes,
+            'created_at': datetime.now().isoformat()
+        }
+
+        tmp_matrix = matrix_path.with_name(matrix_path.name + '.tmp')
+        with open(tmp_matrix, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_matrix, matrix_path)
+        tmp_manifest = manifest_path.with_name(manifest_path.name + '.tmp')
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, manifest_path)
+
+        self._remove_stale(source_hash)
+        logger.info(f"Built embedding index for {len(posts)} posts at {matrix_path} "
+                    f"({len(reused)} reused, {len(missing)} encoded, {self.last_update['dropped']} dropped)")
+        return np.load(matrix_path, mmap_mode='r')
+
+    def _remove_stale(self, source_hash: str) -> None:
+        """Delete index files left over from previous versions of the corpus."""
+        current = self._base(source_hash).name
+        for path in self.index_dir.glob(f"{self._prefix}-*"):
+            if not path.name.startswith(current) and path.suffix in ('.npy', '.npz', '.json'):
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.warning(f"Could not remove stale index file {path}: {e}")
+
+    def _metadata_arrays(self) -> Dict[str, np.ndarray]:
+        """Lower-cased topic and content type and the posting date of every post."""
+        if self._metadata is None:
+            metadata = [post.get('metadata', {}) for post in self.posts]
+            dates = []
+            for meta in metadata:
+                try:
+                    dates.append(np.datetime64(str(meta.get('posting_date', ''))[:10], 'D'))
+                except ValueError:
+                    dates.append(np.datetime64('NaT'))
+            self._metadata = {
+                'topic': np.array([str(meta.get('topic', '')).lower() for meta in metadata], dtype=object),
+                'content_type': np.array([str(meta.get('content_type', '')).lower() for meta in metadata],
+                                         dtype=object),
+                'posting_date': np.array(dates, dtype='datetime64[D]')
+            }
+        return self._metadata
+
+    def filter_mask(self, topic: Union[str, Iterable[str], None] = None,
+                    content_type: Union[str, Iterable[str], None] = None,
+                    since: Optional[str] = None, until: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Build a boolean row mask from metadata filters.
+
+        Args:
+            topic (Union[str, Iterable[str], None]): Topic(s) to keep, case-insensitive.
+            content_type (Union[str, Iterable[str], None]): Content type(s) to keep, case-insensitive.
+            since (Optional[str]): Earliest posting date (ISO format, inclusive).
+            until (Optional[str]): Latest posting date (ISO format, inclusive).
+
+        Returns:
+            Optional[np.ndarray]: The mask, or None when no filter is set.
+        """
+        if topic is None and content_type is None and since is None and until is None:
+            return None
+        arrays = self._metadata_arrays()
+        mask = np.ones(len(self.posts), dtype=bool)
+        for field, wanted in (('topic', topic), ('content_type', content_type)):
+            if wanted is not None:
+                values = [wanted] if isinstance(wanted, str) else list(wanted)
+                mask &= np.isin(arrays[field], [value.lower() for value in values])
+        # NaT compares False, so undated posts never match a date range
+        if since is not None:
+            mask &= arrays['posting_date'] >= np.datetime64(since[:10], 'D')
+        if until is not None:
+            mask &= arrays['posting_date'] <= np.datetime64(until[:10], 'D')
+        return mask
+
+    def search(self, query_vector: Sequence[float], top_k: int = 2, **filters) -> List[int]:
+        """
+        Return the row indices of the ``top_k`` posts most similar to the query.
+
+        Args:
+            query_vector (Sequence[float]): Query embedding (normalised here).
+            top_k (int): Number of results.
+            **filters: ``topic``, ``content_type``, ``since`` and ``until`` (see ``filter_mask``).
+
+        Returns:
+            List[int]: Row indices ordered by descending cosine similarity.
+        """
+        if self.matrix is None or len(self.posts) == 0 or top_k <= 0:
+            return []
+        query = normalize_rows(query_vector)[0]
+        if self.backend is None:
+            self.backend = ExactSearch(self.matrix)
+        return self.backend.search(query, top_k, mask=self.filter_mask(**filters))
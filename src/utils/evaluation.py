@@ -1,15 +1,67 @@
-from typing import Dict, List, Optional
-import json
+from typing import Dict, List, Optional, Sequence, Union
 from pathlib import Path
 import logging
+from collections import Counter
 from datetime import datetime
 import nltk
-import spacy
 import textstat
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
+from src.utils.model_registry import get_spacy_model
+from src.utils.storage import ensure_json, open_store
+
+# Pipeline components the scorers read from: POS/tag (tagger, attribute_ruler),
+# sentence boundaries (parser, senter or sentencizer) and entities (ner).
+# Anything else (e.g. the lemmatizer) is disabled while scoring.
+REQUIRED_PIPES = {"tok2vec", "tagger", "attribute_ruler", "parser", "senter", "sentencizer", "ner"}
+
+# Lexicons used by the scorers. Token-level lists are matched against
+# lowercased token text; sentence-level lists are matched as substrings of
+# the lowercased sentence.
+EMOTIONAL_WORDS = frozenset({'amazing', 'excited', 'thrilled', 'incredible', 'wonderful',
+                             'important', 'crucial', 'essential', 'valuable', 'beneficial'})
+ENGAGEMENT_ACTION_VERBS = frozenset({'learn', 'discover', 'explore', 'achieve', 'transform',
+                                     'improve', 'enhance', 'develop', 'create', 'build'})
+PERSONAL_PRONOUNS = frozenset({'i', 'you', 'we', 'us'})
+FORMAL_WORDS = frozenset({'utilize', 'implement', 'facilitate', 'optimize', 'leverage',
+                          'strategize', 'methodology', 'paradigm', 'synergy', 'initiative'})
+CASUAL_WORDS = frozenset({'hey', 'guys', 'awesome', 'cool', 'stuff', 'thing',
+                          'kinda', 'sorta', 'gonna', 'wanna'})
+DESCRIPTIVE_ADJECTIVES = frozenset({'clear', 'vibrant', 'detailed', 'sharp', 'colorful',
+                                    'striking', 'captivating', 'engaging', 'dynamic', 'vivid'})
+SPATIAL_INDICATORS = frozenset({'above', 'below', 'left', 'right', 'center',
+                                'foreground', 'background', 'top', 'bottom', 'middle'})
+VISUAL_VERBS = frozenset({'show', 'display', 'depict', 'illustrate', 'present',
+                          'highlight', 'feature', 'demonstrate', 'reveal', 'portray'})
+MEDIA_REFERENCES = frozenset({'image', 'photo', 'picture', 'video', 'graphic',
+                              'infographic', 'visual', 'illustration', 'diagram', 'chart'})
+EXPERT_TERMS = frozenset({'research', 'study', 'analysis', 'findings', 'data',
+                          'statistics', 'trend', 'pattern', 'correlation', 'impact'})
+ANALYSIS_INDICATORS = frozenset({'because', 'therefore', 'thus', 'consequently',
+                                 'however', 'although', 'while', 'whereas', 'despite'})
+TRANSITION_WORDS = frozenset({'first', 'second', 'finally', 'moreover', 'furthermore',
+                              'additionally', 'however', 'nevertheless', 'consequently',
+                              'therefore', 'thus', 'hence', 'accordingly'})
+LEXICON_WORDS = (EMOTIONAL_WORDS | FORMAL_WORDS | CASUAL_WORDS | DESCRIPTIVE_ADJECTIVES |
+                 SPATIAL_INDICATORS | VISUAL_VERBS | MEDIA_REFERENCES | EXPERT_TERMS |
+                 ANALYSIS_INDICATORS | TRANSITION_WORDS)
+
+SENTENCE_LEXICONS = {
+    'benefit': ('benefit', 'advantage', 'value', 'improve', 'enhance',
+                'increase', 'reduce', 'save', 'optimize', 'streamline'),
+    'problem': ('challenge', 'problem', 'issue', 'pain', 'difficulty',
+                'struggle', 'obstacle', 'barrier', 'hurdle'),
+    'unique': ('unique', 'exclusive', 'only', 'first', 'innovative',
+               'revolutionary', 'groundbreaking', 'cutting-edge'),
+    'cta_action': ('join', 'register', 'sign', 'download', 'subscribe',
+                   'learn', 'discover', 'explore', 'start', 'try'),
+    'urgency': ('now', 'today', 'limited', 'exclusive', 'special',
+                'offer', 'deadline', 'time', 'chance', 'opportunity')
+}
+
+DATA_ENTITY_LABELS = ('CARDINAL', 'PERCENT', 'QUANTITY')
 
 class ContentEvaluator:
     """Evaluates content quality and maintains feedback for improvement."""
@@ -26,36 +78,89 @@ class ContentEvaluator:
             nltk.download('punkt')
             nltk.download('stopwords')
         
-        self.nlp = spacy.load("en_core_web_sm")
+        self.nlp = get_spacy_model("en_core_web_sm")
+        self.disabled_pipes = [name for name in self.nlp.pipe_names if name not in REQUIRED_PIPES]
         self.stop_words = set(stopwords.words('english'))
         self._ensure_feedback_file()
+        # Feedback and metrics history live in the configured store
+        # (append-only logs next to the feedback file, or SQLite)
+        self.store = open_store(self.feedback_file)
     
     def _ensure_feedback_file(self):
         """Ensure feedback file exists with proper structure."""
-        feedback_path = Path(self.feedback_file)
-        if not feedback_path.exists():
-            feedback_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(feedback_path, 'w') as f:
-                json.dump({
-                    "feedback_history": [],
-                    "content_examples": [],
-                    "metrics_history": []
-                }, f, indent=2)
+        ensure_json(Path(self.feedback_file), {
+            "feedback_history": [],
+            "content_examples": [],
+            "metrics_history": []
+        })
     
     def evaluate_content(self, content: str, content_type: str, 
                         engagement_data: Optional[Dict] = None) -> Dict:
         """
         Evaluate content quality using NLP-based metrics.
         """
-        doc = self.nlp(content)
+        doc = self.nlp(content, disable=self.disabled_pipes)
+        metrics = self._score_doc(doc, content_type, engagement_data)
+        self._store_metrics(metrics, content_type)
+        return metrics
+    
+    def evaluate_many(self, contents: Sequence[str], content_types: Union[str, Sequence[str]],
+                      engagement_data: Optional[Sequence[Optional[Dict]]] = None,
+                      batch_size: int = 64, n_process: int = 1,
+                      store_metrics: bool = True) -> List[Dict]:
+        """
+        Evaluate many pieces of content in one streamed pass through spaCy.
+        
+        Documents are parsed with ``nlp.pipe`` with the pipeline components the
+        scorers do not use disabled, and metrics history is written once for
+        the whole batch.
         
+        Args:
+            contents (Sequence[str]): Content to evaluate
+            content_types (Union[str, Sequence[str]]): One content type for all
+                items, or one per item
+            engagement_data (Optional[Sequence[Optional[Dict]]]): Optional
+                engagement data per item
+            batch_size (int): Number of texts spaCy buffers per batch
+            n_process (int): Number of worker processes for spaCy
+            store_metrics (bool): Whether to append results to the metrics history
+            
+        Returns:
+            List[Dict]: Metrics for each item, in input order
+        """
+        contents = list(contents)
+        if isinstance(content_types, str):
+            content_types = [content_types] * len(contents)
+        else:
+            content_types = list(content_types)
+        if engagement_data is None:
+            engagement_data = [None] * len(contents)
+        else:
+            engagement_data = list(engagement_data)
+        if not len(contents) == len(content_types) == len(engagement_data):
+            raise ValueError("contents, content_types and engagement_data must have the same length")
+        
+        docs = self.nlp.pipe(contents, batch_size=batch_size, n_process=n_process,
+                             disable=self.disabled_pipes)
+        results = [
+            self._score_doc(doc, content_type, engagement)
+            for doc, content_type, engagement in zip(docs, content_types, engagement_data)
+        ]
+        
+        if store_metrics and results:
+            self._store_metrics_batch(list(zip(results, content_types)))
+        return results
+    
+    def _score_doc(self, doc, content_type: str, engagement_data: Optional[Dict] = None) -> Dict:
+        """Compute all metrics for a parsed document from a single feature pass."""
+        features = self._extract_features(doc)
         metrics = {
             "clarity": self._evaluate_clarity(doc),
-            "engagement_potential": self._evaluate_engagement_potential(doc),
-            "professional_tone": self._evaluate_professional_tone(doc),
-            "value_proposition": self._evaluate_value_proposition(doc),
-            "call_to_action": self._evaluate_call_to_action(doc),
-            "content_type_specific": self._evaluate_content_type_specific(doc, content_type)
+            "engagement_potential": self._evaluate_engagement_potential(features),
+            "professional_tone": self._evaluate_professional_tone(features),
+            "value_proposition": self._evaluate_value_proposition(features),
+            "call_to_action": self._evaluate_call_to_action(features),
+            "content_type_specific": self._evaluate_content_type_specific(features, content_type)
         }
         
         if engagement_data:
@@ -64,9 +169,78 @@ class ContentEvaluator:
                 engagement_data
             )
         
-        self._store_metrics(metrics, content_type)
         return metrics
     
+    def _extract_features(self, doc) -> Dict:
+        """
+        Walk the document once and collect everything the scorers need.
+        
+        Returns:
+            Dict: Token count, question marks, lexicon hits (lowercased token
+            counts for words in any scorer lexicon), POS counts, personal
+            pronoun and action verb counts, per-sentence data (length, the
+            sentence lexicons it matches and whether it opens with an
+            imperative verb), entity label counts and paragraph splits.
+        """
+        questions = 0
+        personal_pronouns = 0
+        action_verbs = 0
+        lexicon_hits = Counter()
+        pos_counts = Counter()
+        
+        for token in doc:
+            lower = token.lower_
+            pos = token.pos_
+            pos_counts[pos] += 1
+            if token.text.endswith('?'):
+                questions += 1
+            if lower in LEXICON_WORDS:
+                lexicon_hits[lower] += 1
+            if pos == 'PRON' and lower in PERSONAL_PRONOUNS:
+                personal_pronouns += 1
+            if pos == 'VERB' and lower in ENGAGEMENT_ACTION_VERBS:
+                action_verbs += 1
+        
+        sentences = []
+        for sent in doc.sents:
+            sent_text = sent.text.lower()
+            matches = frozenset(
+                name for name, words in SENTENCE_LEXICONS.items()
+                if any(word in sent_text for word in words)
+            )
+            first = sent[0]
+            sentences.append({
+                "length": len(sent),
+                "matches": matches,
+                "imperative": first.pos_ == 'VERB' and first.tag_ == 'VB'
+            })
+        
+        return {
+            "n_tokens": len(doc),
+            "questions": questions,
+            "personal_pronouns": personal_pronouns,
+            "action_verbs": action_verbs,
+            "lexicon_hits": lexicon_hits,
+            "pos_counts": pos_counts,
+            "sentences": sentences,
+            "entity_labels": Counter(ent.label_ for ent in doc.ents),
+            "paragraphs": doc.text.split('\n\n')
+        }
+    
+    @staticmethod
+    def _count_hits(features: Dict, words) -> int:
+        """Count tokens whose lowercased text is in ``words``."""
+        hits = features["lexicon_hits"]
+        return sum(hits[word] for word in words)
+    
+    @staticmethod
+    def _count_sentences(features: Dict, *lexicons: str) -> int:
+        """Count sentences that contain a word from every one of ``lexicons``."""
+        return sum(
+            1 for sent in features["sentences"]
+            if all(name in sent["matches"] for name in lexicons)
+        )
+    
     def _evaluate_clarity(self, doc) -> float:
         """Evaluate content clarity using multiple readability metrics."""
         text = doc.text
@@ -101,330 +275,175 @@ class ContentEvaluator:
         
         return round(clarity_score, 2)
     
-    def _evaluate_engagement_potential(self, doc) -> float:
+    def _evaluate_engagement_potential(self, features: Dict) -> float:
         """Evaluate potential engagement using linguistic features."""
         engagement_score = 0.0
-        features = {
-            'questions': 0,
-            'emotional_words': 0,
-            'personal_pronouns': 0,
-            'action_verbs': 0
-        }
-        
-        # Define engagement-related word lists
-        emotional_words = {'amazing', 'excited', 'thrilled', 'incredible', 'wonderful',
-                          'important', 'crucial', 'essential', 'valuable', 'beneficial'}
-        action_verbs = {'learn', 'discover', 'explore', 'achieve', 'transform',
-                       'improve', 'enhance', 'develop', 'create', 'build'}
-        
-        for token in doc:
-            # Count questions
-            if token.text.endswith('?'):
-                features['questions'] += 1
-            
-            # Count emotional words
-            if token.text.lower() in emotional_words:
-                features['emotional_words'] += 1
-            
-            # Count personal pronouns
-            if token.pos_ == 'PRON' and token.text.lower() in {'i', 'you', 'we', 'us'}:
-                features['personal_pronouns'] += 1
-            
-            # Count action verbs
-            if token.pos_ == 'VERB' and token.text.lower() in action_verbs:
-                features['action_verbs'] += 1
+        questions = features['questions']
+        emotional_words = self._count_hits(features, EMOTIONAL_WORDS)
+        personal_pronouns = features['personal_pronouns']
+        action_verbs = features['action_verbs']
         
         # Calculate engagement score based on features
-        total_words = len(doc)
-        if total_words > 0:
+        if features['n_tokens'] > 0:
             engagement_score = (
-                0.3 * min(features['questions'] / 2, 1) +  # Cap at 2 questions
-                0.2 * min(features['emotional_words'] / 5, 1) +  # Cap at 5 emotional words
-                0.2 * min(features['personal_pronouns'] / 3, 1) +  # Cap at 3 pronouns
-                0.3 * min(features['action_verbs'] / 3, 1)  # Cap at 3 action verbs
+                0.3 * min(questions / 2, 1) +  # Cap at 2 questions
+                0.2 * min(emotional_words / 5, 1) +  # Cap at 5 emotional words
+                0.2 * min(personal_pronouns / 3, 1) +  # Cap at 3 pronouns
+                0.3 * min(action_verbs / 3, 1)  # Cap at 3 action verbs
             )
         
         return round(min(engagement_score, 1), 2)
     
-    def _evaluate_professional_tone(self, doc) -> float:
+    def _evaluate_professional_tone(self, features: Dict) -> float:
         """Evaluate professional tone using linguistic analysis."""
         tone_score = 0.0
-        features = {
-            'formal_words': 0,
-            'jargon_words': 0,
-            'casual_words': 0,
-            'sentence_structure': 0
-        }
-        
-        # Define word lists for tone analysis
-        formal_words = {'utilize', 'implement', 'facilitate', 'optimize', 'leverage',
-                       'strategize', 'methodology', 'paradigm', 'synergy', 'initiative'}
-        casual_words = {'hey', 'guys', 'awesome', 'cool', 'stuff', 'thing',
-                       'kinda', 'sorta', 'gonna', 'wanna'}
-        
-        for token in doc:
-            # Count formal words
-            if token.text.lower() in formal_words:
-                features['formal_words'] += 1
-            
-            # Count casual words
-            if token.text.lower() in casual_words:
-                features['casual_words'] += 1
+        formal_words = self._count_hits(features, FORMAL_WORDS)
+        casual_words = self._count_hits(features, CASUAL_WORDS)
+        sentence_structure = 0
         
         # Analyze sentence structure
-        sentences = list(doc.sents)
-        if sentences:
-            avg_sentence_length = sum(len(sent) for sent in sentences) / len(sentences)
-            features['sentence_structure'] = min(avg_sentence_length / 20, 1)  # Cap at 20 words
+        lengths = [sent['length'] for sent in features['sentences']]
+        if lengths:
+            avg_sentence_length = sum(lengths) / len(lengths)
+            sentence_structure = min(avg_sentence_length / 20, 1)  # Cap at 20 words
         
         # Calculate tone score
-        total_words = len(doc)
-        if total_words > 0:
+        if features['n_tokens'] > 0:
             tone_score = (
-                0.4 * min(features['formal_words'] / 5, 1) +  # Cap at 5 formal words
-                0.3 * (1 - min(features['casual_words'] / 3, 1)) +  # Penalize casual words
-                0.3 * features['sentence_structure']
+                0.4 * min(formal_words / 5, 1) +  # Cap at 5 formal words
+                0.3 * (1 - min(casual_words / 3, 1)) +  # Penalize casual words
+                0.3 * sentence_structure
             )
         
         return round(min(tone_score, 1), 2)
     
-    def _evaluate_value_proposition(self, doc) -> float:
+    def _evaluate_value_proposition(self, features: Dict) -> float:
         """Evaluate clarity of value proposition."""
         value_score = 0.0
-        features = {
-            'benefit_phrases': 0,
-            'problem_solution': 0,
-            'unique_indicators': 0
-        }
-        
-        # Define patterns for value proposition analysis
-        benefit_indicators = {'benefit', 'advantage', 'value', 'improve', 'enhance',
-                            'increase', 'reduce', 'save', 'optimize', 'streamline'}
-        problem_indicators = {'challenge', 'problem', 'issue', 'pain', 'difficulty',
-                            'struggle', 'obstacle', 'barrier', 'hurdle'}
-        unique_indicators = {'unique', 'exclusive', 'only', 'first', 'innovative',
-                           'revolutionary', 'groundbreaking', 'cutting-edge'}
-        
-        # Analyze sentences for value proposition components
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-            
-            # Check for benefit statements
-            if any(word in sent_text for word in benefit_indicators):
-                features['benefit_phrases'] += 1
-            
-            # Check for problem-solution structure
-            if (any(word in sent_text for word in problem_indicators) and
-                any(word in sent_text for word in benefit_indicators)):
-                features['problem_solution'] += 1
-            
-            # Check for unique value indicators
-            if any(word in sent_text for word in unique_indicators):
-                features['unique_indicators'] += 1
+        benefit_phrases = self._count_sentences(features, 'benefit')
+        problem_solution = self._count_sentences(features, 'problem', 'benefit')
+        unique_indicators = self._count_sentences(features, 'unique')
         
         # Calculate value proposition score
-        total_sentences = len(list(doc.sents))
-        if total_sentences > 0:
+        if features['sentences']:
             value_score = (
-                0.4 * min(features['benefit_phrases'] / 2, 1) +  # Cap at 2 benefit phrases
-                0.4 * min(features['problem_solution'] / 1, 1) +  # Cap at 1 problem-solution
-                0.2 * min(features['unique_indicators'] / 2, 1)  # Cap at 2 unique indicators
+                0.4 * min(benefit_phrases / 2, 1) +  # Cap at 2 benefit phrases
+                0.4 * min(problem_solution / 1, 1) +  # Cap at 1 problem-solution
+                0.2 * min(unique_indicators / 2, 1)  # Cap at 2 unique indicators
             )
         
         return round(min(value_score, 1), 2)
     
-    def _evaluate_call_to_action(self, doc) -> float:
+    def _evaluate_call_to_action(self, features: Dict) -> float:
         """Evaluate call-to-action effectiveness."""
         cta_score = 0.0
-        features = {
-            'action_verbs': 0,
-            'urgency_indicators': 0,
-            'clear_direction': 0
-        }
-        
-        # Define CTA-related word lists
-        action_verbs = {'join', 'register', 'sign', 'download', 'subscribe',
-                       'learn', 'discover', 'explore', 'start', 'try'}
-        urgency_indicators = {'now', 'today', 'limited', 'exclusive', 'special',
-                            'offer', 'deadline', 'time', 'chance', 'opportunity'}
-        
-        # Analyze sentences for CTA components
-        for sent in doc.sents:
-            sent_text = sent.text.lower()
-            
-            # Check for action verbs
-            if any(word in sent_text for word in action_verbs):
-                features['action_verbs'] += 1
-            
-            # Check for urgency indicators
-            if any(word in sent_text for word in urgency_indicators):
-                features['urgency_indicators'] += 1
-            
-            # Check for clear direction (imperative sentences)
-            if sent[0].pos_ == 'VERB' and sent[0].tag_ == 'VB':
-                features['clear_direction'] += 1
+        action_verbs = self._count_sentences(features, 'cta_action')
+        urgency_indicators = self._count_sentences(features, 'urgency')
+        # Clear direction means imperative sentences
+        clear_direction = sum(1 for sent in features['sentences'] if sent['imperative'])
         
         # Calculate CTA score
-        total_sentences = len(list(doc.sents))
-        if total_sentences > 0:
+        if features['sentences']:
             cta_score = (
-                0.4 * min(features['action_verbs'] / 2, 1) +  # Cap at 2 action verbs
-                0.3 * min(features['urgency_indicators'] / 2, 1) +  # Cap at 2 urgency indicators
-                0.3 * min(features['clear_direction'] / 1, 1)  # Cap at 1 clear direction
+                0.4 * min(action_verbs / 2, 1) +  # Cap at 2 action verbs
+                0.3 * min(urgency_indicators / 2, 1) +  # Cap at 2 urgency indicators
+                0.3 * min(clear_direction / 1, 1)  # Cap at 1 clear direction
             )
         
         return round(min(cta_score, 1), 2)
     
-    def _evaluate_content_type_specific(self, doc, content_type: str) -> Dict:
+    def _evaluate_content_type_specific(self, features: Dict, content_type: str) -> Dict:
         """Evaluate content-type specific metrics."""
         metrics = {}
         
         if content_type == "media":
             # Analyze media post specific features
-            metrics["visual_description_quality"] = self._evaluate_visual_description(doc)
-            metrics["media_relevance"] = self._evaluate_media_relevance(doc)
+            metrics["visual_description_quality"] = self._evaluate_visual_description(features)
+            metrics["media_relevance"] = self._evaluate_media_relevance(features)
         
         elif content_type == "article":
             # Analyze article specific features
-            metrics["depth_of_insight"] = self._evaluate_depth_of_insight(doc)
-            metrics["structure_quality"] = self._evaluate_structure_quality(doc)
+            metrics["depth_of_insight"] = self._evaluate_depth_of_insight(features)
+            metrics["structure_quality"] = self._evaluate_structure_quality(features)
         
         return metrics
     
-    def _evaluate_visual_description(self, doc) -> float:
+    def _evaluate_visual_description(self, features: Dict) -> float:
         """Evaluate quality of visual descriptions in media posts."""
         score = 0.0
-        features = {
-            'descriptive_adjectives': 0,
-            'spatial_indicators': 0,
-            'visual_verbs': 0
-        }
-        
-        # Define visual description related words
-        descriptive_adjs = {'clear', 'vibrant', 'detailed', 'sharp', 'colorful',
-                          'striking', 'captivating', 'engaging', 'dynamic', 'vivid'}
-        spatial_indicators = {'above', 'below', 'left', 'right', 'center',
-                            'foreground', 'background', 'top', 'bottom', 'middle'}
-        visual_verbs = {'show', 'display', 'depict', 'illustrate', 'present',
-                       'highlight', 'feature', 'demonstrate', 'reveal', 'portray'}
+        # Each token counts towards the first matching list only
+        descriptive_adjectives = self._count_hits(features, DESCRIPTIVE_ADJECTIVES)
+        spatial_indicators = self._count_hits(features, SPATIAL_INDICATORS - DESCRIPTIVE_ADJECTIVES)
+        visual_verbs = self._count_hits(
+            features, VISUAL_VERBS - DESCRIPTIVE_ADJECTIVES - SPATIAL_INDICATORS
+        )
         
-        for token in doc:
-            if token.text.lower() in descriptive_adjs:
-                features['descriptive_adjectives'] += 1
-            elif token.text.lower() in spatial_indicators:
-                features['spatial_indicators'] += 1
-            elif token.text.lower() in visual_verbs:
-                features['visual_verbs'] += 1
-        
-        total_words = len(doc)
-        if total_words > 0:
+        if features['n_tokens'] > 0:
             score = (
-                0.4 * min(features['descriptive_adjectives'] / 3, 1) +
-                0.3 * min(features['spatial_indicators'] / 2, 1) +
-                0.3 * min(features['visual_verbs'] / 2, 1)
+                0.4 * min(descriptive_adjectives / 3, 1) +
+                0.3 * min(spatial_indicators / 2, 1) +
+                0.3 * min(visual_verbs / 2, 1)
             )
         
         return round(min(score, 1), 2)
     
-    def _evaluate_media_relevance(self, doc) -> float:
+    def _evaluate_media_relevance(self, features: Dict) -> float:
         """Evaluate relevance of media content to the text."""
-        score = 0.0
-        features = {
-            'media_references': 0,
-            'contextual_links': 0
-        }
-        
-        # Define media reference indicators
-        media_refs = {'image', 'photo', 'picture', 'video', 'graphic',
-                     'infographic', 'visual', 'illustration', 'diagram', 'chart'}
-        
-        for token in doc:
-            if token.text.lower() in media_refs:
-                features['media_references'] += 1
+        media_references = self._count_hits(features, MEDIA_REFERENCES)
+        contextual_links = 0
         
         # Check for contextual links between text and media
-        sentences = list(doc.sents)
-        if len(sentences) > 1:
+        sentence_count = len(features['sentences'])
+        if sentence_count > 1:
             # Simple check for contextual flow
-            features['contextual_links'] = min(len(sentences) / 5, 1)
+            contextual_links = min(sentence_count / 5, 1)
         
         score = (
-            0.6 * min(features['media_references'] / 2, 1) +
-            0.4 * features['contextual_links']
+            0.6 * min(media_references / 2, 1) +
+            0.4 * contextual_links
         )
         
         return round(min(score, 1), 2)
     
-    def _evaluate_depth_of_insight(self, doc) -> float:
+    def _evaluate_depth_of_insight(self, features: Dict) -> float:
         """Evaluate depth of insight in articles."""
         score = 0.0
-        features = {
-            'expert_terms': 0,
-            'data_references': 0,
-            'analysis_indicators': 0
-        }
-        
-        # Define depth indicators
-        expert_terms = {'research', 'study', 'analysis', 'findings', 'data',
-                       'statistics', 'trend', 'pattern', 'correlation', 'impact'}
-        analysis_indicators = {'because', 'therefore', 'thus', 'consequently',
-                             'however', 'although', 'while', 'whereas', 'despite'}
-        
-        for token in doc:
-            if token.text.lower() in expert_terms:
-                features['expert_terms'] += 1
-            elif token.text.lower() in analysis_indicators:
-                features['analysis_indicators'] += 1
+        # Each token counts towards the first matching list only
+        expert_terms = self._count_hits(features, EXPERT_TERMS)
+        analysis_indicators = self._count_hits(features, ANALYSIS_INDICATORS - EXPERT_TERMS)
         
         # Check for data references
-        for ent in doc.ents:
-            if ent.label_ in ['CARDINAL', 'PERCENT', 'QUANTITY']:
-                features['data_references'] += 1
+        entity_labels = features['entity_labels']
+        data_references = sum(entity_labels[label] for label in DATA_ENTITY_LABELS)
         
-        total_words = len(doc)
-        if total_words > 0:
+        if features['n_tokens'] > 0:
             score = (
-                0.4 * min(features['expert_terms'] / 5, 1) +
-                0.3 * min(features['data_references'] / 3, 1) +
-                0.3 * min(features['analysis_indicators'] / 3, 1)
+                0.4 * min(expert_terms / 5, 1) +
+                0.3 * min(data_references / 3, 1) +
+                0.3 * min(analysis_indicators / 3, 1)
             )
         
         return round(min(score, 1), 2)
     
-    def _evaluate_structure_quality(self, doc) -> float:
+    def _evaluate_structure_quality(self, features: Dict) -> float:
         """Evaluate structure quality of articles."""
         score = 0.0
-        features = {
-            'heading_structure': 0,
-            'paragraph_length': 0,
-            'transition_words': 0
-        }
-        
-        # Define structure indicators
-        transition_words = {'first', 'second', 'finally', 'moreover', 'furthermore',
-                          'additionally', 'however', 'nevertheless', 'consequently',
-                          'therefore', 'thus', 'hence', 'accordingly'}
-        
-        # Analyze document structure
-        sentences = list(doc.sents)
-        paragraphs = doc.text.split('\n\n')
+        paragraph_length = 0
+        paragraphs = features['paragraphs']
         
         # Check paragraph length variation
         if len(paragraphs) > 1:
             para_lengths = [len(p.split()) for p in paragraphs]
-            features['paragraph_length'] = 1 - (np.std(para_lengths) / np.mean(para_lengths))
+            paragraph_length = 1 - (np.std(para_lengths) / np.mean(para_lengths))
         
         # Count transition words
-        for token in doc:
-            if token.text.lower() in transition_words:
-                features['transition_words'] += 1
+        transition_words = self._count_hits(features, TRANSITION_WORDS)
         
         # Calculate structure score
-        total_words = len(doc)
-        if total_words > 0:
+        if features['n_tokens'] > 0:
             score = (
-                0.4 * features['paragraph_length'] +
-                0.3 * min(features['transition_words'] / 5, 1) +
+                0.4 * paragraph_length +
+                0.3 * min(transition_words / 5, 1) +
                 0.3 * min(len(paragraphs) / 5, 1)  # Reward having multiple paragraphs
             )
         
@@ -468,42 +487,34 @@ class ContentEvaluator:
             "metrics": metrics
         }
         
-        with open(self.feedback_file, 'r+') as f:
-            data = json.load(f)
-            data["feedback_history"].append(feedback_entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        self.store.append("feedback_history", feedback_entry)
     
     def _store_metrics(self, metrics: Dict, content_type: str) -> None:
         """Store metrics in the metrics history."""
-        metrics_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "content_type": content_type,
-            "metrics": metrics
-        }
-        
-        with open(self.feedback_file, 'r+') as f:
-            data = json.load(f)
-            data["metrics_history"].append(metrics_entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        self._store_metrics_batch([(metrics, content_type)])
+    
+    def _store_metrics_batch(self, items: List) -> None:
+        """Store several (metrics, content_type) pairs with a single append."""
+        timestamp = datetime.now().isoformat()
+        entries = [
+            {
+                "timestamp": timestamp,
+                "content_type": content_type,
+                "metrics": metrics
+            }
+            for metrics, content_type in items
+        ]
+        
+        self.store.extend("metrics_history", entries)
     
-    def get_feedback_history(self, content_type: Optional[str] = None) -> List[Dict]:
-        """Retrieve feedback history, optionally filtered by content type."""
-        with open(self.feedback_file, 'r') as f:
-            data = json.load(f)
-            if content_type:
-                return [entry for entry in data["feedback_history"] 
-                       if entry["content_type"] == content_type]
-            return data["feedback_history"]
+    def get_feedback_history(self, content_type: Optional[str] = None,
+                             since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """Retrieve feedback history, optionally filtered by content type and ISO time window."""
+        return list(self.store.iter("feedback_history", content_type=content_type,
+                                    since=since, until=until))
     
-    def get_metrics_history(self, content_type: Optional[str] = None) -> List[Dict]:
-        """Retrieve metrics history, optionally filtered by content type."""
-        with open(self.feedback_file, 'r') as f:
-            data = json.load(f)
-            if content_type:
-                return [entry for entry in data["metrics_history"] 
-                       if entry["content_type"] == content_type]
-            return data["metrics_history"] 
\ No newline at end of file
+    def get_metrics_history(self, content_type: Optional[str] = None,
+                            since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """Retrieve metrics history, optionally filtered by content type and ISO time window."""
+        return list(self.store.iter("metrics_history", content_type=content_type,
+                                    since=since, until=until))
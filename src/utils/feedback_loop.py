@@ -14,6 +14,7 @@ import pandas as pd
 from linkedin_api import Linkedin
 import requests
 from collections import Counter
+from .storage import atomic_write_json, ensure_json, open_store, update_json
 
 class FeedbackLoop:
     """Implements a continuous improvement feedback loop for content generation."""
@@ -24,8 +25,14 @@ class FeedbackLoop:
         self.improvements_path = self.feedback_dir / "improvements.json"
         self.model_path = self.feedback_dir / "ml_model.json"
         self.voice_feedback_path = self.feedback_dir / "voice_feedback.json"
+        self.logger = logging.getLogger(__name__)
         self._ensure_files()
         
+        # Feedback entries live in the configured store (append-only logs
+        # next to the legacy JSON files, or SQLite)
+        self.store = open_store(self.feedback_path)
+        self.voice_store = open_store(self.voice_feedback_path)
+        
         # Initialize LinkedIn API if credentials are provided
         self.linkedin_api = None
         if linkedin_username and linkedin_password:
@@ -45,14 +52,10 @@ class FeedbackLoop:
             os.makedirs(self.feedback_dir, exist_ok=True)
             
             # Initialize feedback file if it doesn't exist
-            if not self.feedback_path.exists():
-                with open(self.feedback_path, 'w') as f:
-                    json.dump({"feedback": []}, f)
+            ensure_json(self.feedback_path, {"feedback": []})
             
             # Initialize improvements file if it doesn't exist
-            if not self.improvements_path.exists():
-                with open(self.improvements_path, 'w') as f:
-                    json.dump({"best_practices": {}, "ml_insights": []}, f)
+            ensure_json(self.improvements_path, {"best_practices": {}, "ml_insights": []})
         except Exception as e:
             raise RuntimeError(f"Failed to initialize feedback system: {str(e)}")
 
@@ -99,14 +102,7 @@ class FeedbackLoop:
     def analyze_patterns(self) -> Dict:
         """Analyze patterns using machine learning."""
         try:
-            # Load feedback data
-            with open(self.feedback_path, 'r') as f:
-                data = json.load(f)
-            
-            if not data["feedback"]:
-                return {"patterns": [], "clusters": {}}
-            
-            # Convert feedback to DataFrame
+            # Stream feedback entries straight into a DataFrame
             df = pd.DataFrame([
                 {
                     "content_id": entry["content_id"],
@@ -114,9 +110,12 @@ class FeedbackLoop:
                     "clarity": entry["metrics"].get("clarity", 0),
                     "call_to_action": entry["metrics"].get("call_to_action", 0)
                 }
-                for entry in data["feedback"]
+                for entry in self.store.iter("feedback")
             ])
             
+            if df.empty:
+                return {"patterns": [], "clusters": {}}
+            
             # Prepare features for clustering
             features = df[["engagement", "clarity", "call_to_action"]].values
             scaled_features = self.scaler.fit_transform(features)
@@ -145,11 +144,12 @@ class FeedbackLoop:
                         patterns.append(f"High-performing cluster {cluster_id} found - analyze top posts for success factors")
             
             # Save ML insights
-            with open(self.improvements_path, 'r+') as f:
-                improvements_data = json.load(f)
+            def _save_insights(improvements_data):
                 improvements_data["ml_insights"] = patterns
-                f.seek(0)
-                json.dump(improvements_data, f, indent=2)
+                return improvements_data
+
+            update_json(self.improvements_path, _save_insights,
+                        default={"best_practices": {}, "ml_insights": []})
             
             return {
                 "patterns": patterns,
@@ -185,8 +185,7 @@ class FeedbackLoop:
             
             # Save insights to file
             report_path = self.feedback_dir / f"analysis_report_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            with open(report_path, 'w') as f:
-                json.dump(all_insights, f, indent=2)
+            atomic_write_json(report_path, all_insights)
             
             print(f"Analysis complete. Report saved to {report_path}")
 
@@ -216,26 +215,24 @@ class FeedbackLoop:
     def analyze_feedback(self) -> Dict:
         """Analyze feedback and return insights based on actual feedback data."""
         try:
-            with open(self.feedback_path, 'r') as f:
-                feedback_data = json.load(f)
-            
-            feedback = feedback_data["feedback"]
-            if not feedback:
-                return {
-                    "metric_trends": {},
-                    "recommendations": ["No feedback data available yet for analysis"]
-                }
-            
-            # Calculate average metrics
+            # Calculate average metrics in one streaming pass
             metrics_sum = {}
             metrics_count = {}
+            comments = []
             
-            for entry in feedback:
+            for entry in self.store.iter("feedback"):
+                comments.append(entry["comments"])
                 for metric, value in entry["metrics"].items():
                     if isinstance(value, (int, float)):  # Only process numerical metrics
                         metrics_sum[metric] = metrics_sum.get(metric, 0) + value
                         metrics_count[metric] = metrics_count.get(metric, 0) + 1
             
+            if not comments:
+                return {
+                    "metric_trends": {},
+                    "recommendations": ["No feedback data available yet for analysis"]
+                }
+            
             # Calculate averages and identify areas for improvement
             metric_trends = {}
             recommendations = []
@@ -251,7 +248,7 @@ class FeedbackLoop:
                     recommendations.append(f"Consider enhancing {metric} for better performance")
             
             # Add general recommendations based on comments analysis
-            comments_text = " ".join(entry["comments"] for entry in feedback)
+            comments_text = " ".join(comments)
             if "engaging" in comments_text.lower():
                 recommendations.append("Multiple feedback entries mention engagement - consider adding more interactive elements")
             if "clarity" in comments_text.lower():
@@ -285,9 +282,6 @@ class FeedbackLoop:
     def add_feedback(self, content_id: str, metrics: Dict, comments: str):
         """Add new feedback with timestamp."""
         try:
-            with open(self.feedback_path, 'r') as f:
-                data = json.load(f)
-            
             feedback_entry = {
                 "content_id": content_id,
                 "timestamp": datetime.now().isoformat(),
@@ -295,24 +289,16 @@ class FeedbackLoop:
                 "comments": comments
             }
             
-            data["feedback"].append(feedback_entry)
-            
-            with open(self.feedback_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            self.store.append("feedback", feedback_entry)
         except Exception as e:
             print(f"Warning: Could not add feedback: {str(e)}")
     
-    def get_feedback_history(self, content_type: Optional[str] = None) -> List[Dict]:
-        """Get feedback history, optionally filtered by content type."""
+    def get_feedback_history(self, content_type: Optional[str] = None,
+                             since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """Get feedback history, optionally filtered by content type and ISO time window."""
         try:
-            with open(self.feedback_path, 'r') as f:
-                data = json.load(f)
-            
-            feedback = data["feedback"]
-            if content_type:
-                feedback = [f for f in feedback if f.get("content_type") == content_type]
-            
-            return feedback
+            return list(self.store.iter("feedback", content_type=content_type,
+                                        since=since, until=until))
         except Exception as e:
             print(f"Warning: Could not retrieve feedback history: {str(e)}")
             return []
@@ -332,28 +318,17 @@ class FeedbackLoop:
                 - edits_made (list)
         """
         try:
-            # Load existing feedback
-            if self.voice_feedback_path.exists():
-                with open(self.voice_feedback_path, 'r') as f:
-                    voice_feedback = json.load(f)
-            else:
-                voice_feedback = {"feedback_entries": []}
-            
             # Add timestamp
             feedback["timestamp"] = datetime.now().isoformat()
             
-            # Add to feedback entries
-            voice_feedback["feedback_entries"].append({
+            # Append to feedback entries
+            self.voice_store.append("feedback_entries", {
                 "content_id": content_id,
                 **feedback
             })
             
-            # Save updated feedback
-            with open(self.voice_feedback_path, 'w') as f:
-                json.dump(voice_feedback, f, indent=2)
-            
             # Analyze patterns if we have enough data
-            if len(voice_feedback["feedback_entries"]) >= 5:
+            if self.voice_store.count("feedback_entries") >= 5:
                 self.analyze_voice_patterns()
                 
         except Exception as e:
@@ -367,15 +342,10 @@ class FeedbackLoop:
             Dictionary containing voice pattern analysis
         """
         try:
-            if not self.voice_feedback_path.exists():
-                return {"error": "No voice feedback data available"}
-            
-            with open(self.voice_feedback_path, 'r') as f:
-                voice_feedback = json.load(f)
-            
-            # Extract metrics for analysis
+            # Extract metrics and edits for analysis in one streaming pass
             metrics = []
-            for entry in voice_feedback["feedback_entries"]:
+            edits = []
+            for entry in self.voice_store.iter("feedback_entries"):
                 metrics.append([
                     entry.get("voice_authenticity", 0),
                     entry.get("tone_alignment", 0),
@@ -383,9 +353,11 @@ class FeedbackLoop:
                     entry.get("personal_touch", 0),
                     entry.get("professional_depth", 0)
                 ])
+                if "edits_made" in entry:
+                    edits.extend(entry["edits_made"])
             
             if not metrics:
-                return {"error": "No metrics available for analysis"}
+                return {"error": "No voice feedback data available"}
             
             # Convert to numpy array for analysis
             metrics_array = np.array(metrics)
@@ -400,17 +372,12 @@ class FeedbackLoop:
             }
             
             # Identify common edits
-            edits = []
-            for entry in voice_feedback["feedback_entries"]:
-                if "edits_made" in entry:
-                    edits.extend(entry["edits_made"])
-            
             edit_patterns = Counter(edits).most_common(5)
             
             return {
                 "average_scores": avg_scores,
                 "common_edits": edit_patterns,
-                "total_feedback_entries": len(voice_feedback["feedback_entries"])
+                "total_feedback_entries": len(metrics)
             }
             
         except Exception as e:
@@ -0,0 +1,268 @@
+"""
+Streaming ingestion of the LinkedIn posts CSV into a typed columnar cache.
+
+The export (``data`` at the repo root) starts with a row of empty cells,
+quotes multi-line post bodies and writes counts with thousands separators
+("3,593"). ``ingest_csv`` streams it with ``csv.reader``, so memory is
+bounded by ``chunksize`` rows, and coerces the numeric columns of each
+chunk with pandas. Rows with the wrong number of fields or unparseable
+numbers are written to ``<stem>-rejects.csv`` with their line number and
+reason instead of aborting the load.
+
+The result is saved as an ``.npz`` keyed by a content hash of the CSV:
+numeric columns as int64/float64 arrays and each text column as one
+UTF-8 buffer plus character offsets. ``load_posts_frame`` returns it as a DataFrame and
+only re-parses the CSV when its contents change.
+
+    python -m src.utils.ingestion --csv data
+"""
+import argparse
+import csv
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.embedding_index import hash_file
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = Path('data')
+CACHE_DIR = Path('data_store/ingested')
+CHUNK_SIZE = 5000
+
+HEADER_MARKER = 'POST_ID'
+INT_COLUMNS = ('LIKES', 'COMMENTS', 'SHARES', 'IMPRESSIONS')
+FLOAT_COLUMNS = ('ENGAGEMENT_RATE',)
+
+_frames: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+_frames_lock = threading.Lock()
+
+
+def cache_path(csv_path: Path, source_hash: str, cache_dir: Path = CACHE_DIR) -> Path:
+    """Path of the columnar cache for a given CSV content hash."""
+    return Path(cache_dir) / f"{Path(csv_path).stem}-posts-{source_hash[:16]}.npz"
+
+
+def reject_path(csv_path: Path, cache_dir: Path = CACHE_DIR) -> Path:
+    """Path of the file collecting rows that could not be ingested."""
+    return Path(cache_dir) / f"{Path(csv_path).stem}-rejects.csv"
+
+
+def _records(reader) -> Iterator[Tuple[int, List[str]]]:
+    """Yield ``(first line number, fields)`` for every non-blank record."""
+    line = 1
+    for fields in reader:
+        if any(field and not field.isspace() for field in fields):
+            yield line, fields
+        line = reader.line_num + 1
+
+
+def _coerce_chunk(rows: List[List[str]], lines: List[int],
+                  columns: List[str]) -> Tuple[pd.DataFrame, List[List[Any]]]:
+    """
+    Convert one chunk of string rows to typed columns.
+
+    Blank numeric cells become 0; anything else that does not parse once
+    thousands separators are removed rejects the whole row.
+
+    Returns:
+        Tuple[pd.DataFrame, List[List[Any]]]: Typed rows that parsed, and
+            ``[line, reason, *fields]`` for those that did not
+    """
+    frame = pd.DataFrame(rows, columns=columns, dtype=object)
+    bad = np.zeros(len(frame), dtype=bool)
+    reasons = [[] for _ in range(len(frame))]
+
+    for column in columns:
+        is_int = column in INT_COLUMNS
+        if not is_int and column not in FLOAT_COLUMNS:
+            continue
+        raw = frame[column]
+        values = np.array(pd.to_numeric(raw, errors='coerce'), dtype=np.float64)
+        # Only cells the fast parse rejected ("3,593", blanks) take the slow path
+        for i in np.flatnonzero(np.isnan(values)):
+            cleaned = raw.iat[i].replace(',', '').strip() or '0'
+            try:
+                values[i] = float(cleaned)
+            except ValueError:
+                pass
+        invalid = np.isnan(values)
+        if is_int:
+            invalid |= np.isinf(values) | (np.nan_to_num(values) % 1 != 0)
+        for i in np.flatnonzero(invalid):
+            reasons[i].append(f"{column}: {raw.iat[i]!r}")
+        bad |= invalid
+        values[invalid] = 0
+        frame[column] = values.astype(np.int64) if is_int else values
+
+    rejects = [[lines[i], "; ".join(reasons[i])] + rows[i] for i in np.flatnonzero(bad)]
+    return frame.loc[~bad].reset_index(drop=True), rejects
+
+
+def ingest_csv(csv_path: Path = DATA_PATH, cache_dir: Path = CACHE_DIR,
+               chunksize: int = CHUNK_SIZE) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parse the posts CSV in chunks and write the typed columnar cache.
+
+    Args:
+        csv_path (Path): LinkedIn posts export.
+        cache_dir (Path): Directory for the ``.npz`` cache and reject file.
+        chunksize (int): Number of records coerced at a time.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: The typed posts and a report with
+            ``rows``, ``rejected``, ``cache_path`` and ``reject_path``
+    """
+    csv_path, cache_dir = Path(csv_path), Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source_hash = hash_file(csv_path)
+    rejects_file = reject_path(csv_path, cache_dir)
+    rejects_tmp = rejects_file.with_name(rejects_file.name + '.tmp')
+
+    chunks: List[pd.DataFrame] = []
+    rejected = 0
+    with open(csv_path, 'r', newline='', encoding='utf-8-sig') as f, \
+            open(rejects_tmp, 'w', newline='', encoding='utf-8') as rf:
+        records = _records(csv.reader(f))
+        header = next((fields for _, fields in records if HEADER_MARKER in (x.strip() for x in fields)), None)
+        if header is None:
+            raise ValueError(f"No {HEADER_MARKER} header row found in {csv_path}")
+        keep = [i for i, name in enumerate(header) if name.strip()]
+        columns = [header[i].strip() for i in keep]
+        writer = csv.writer(rf)
+        writer.writerow(['_LINE', '_REASON'] + columns)
+
+        rows: List[List[str]] = []
+        lines: List[int] = []
+
+        def flush() -> int:
+            frame, bad = _coerce_chunk(rows, lines, columns)
+            chunks.append(frame)
+            writer.writerows(bad)
+            rows.clear()
+            lines.clear()
+            return len(bad)
+
+        for line, fields in records:
+            if len(fields) < len(header) or any(x.strip() for x in fields[len(header):]):
+                writer.writerow([line, f"expected {len(header)} fields, got {len(fields)}"] + fields)
+                rejected += 1
+                continue
+            rows.append(fields[:len(header)] if len(keep) == len(header) else [fields[i] for i in keep])
+            lines.append(line)
+            if len(rows) >= chunksize:
+                rejected += flush()
+        rejected += flush()
+
+    frame = pd.concat(chunks, ignore_index=True)
+    if rejected:
+        os.replace(rejects_tmp, rejects_file)
+        logger.warning(f"Rejected {rejected} rows of {csv_path}; see {rejects_file}")
+    else:
+        rejects_tmp.unlink()
+        if rejects_file.exists():
+            rejects_file.unlink()
+
+    path = cache_path(csv_path, source_hash, cache_dir)
+    _save_frame(path, frame, source_hash)
+    logger.info(f"Ingested {len(frame)} posts from {csv_path} into {path}")
+    return frame, {"rows": len(frame), "rejected": rejected, "cache_path": str(path),
+                   "reject_path": str(rejects_file) if rejected else None}
+
+
+def _save_frame(path: Path, frame: pd.DataFrame, source_hash: str) -> None:
+    arrays = {"columns": np.array(frame.columns.tolist(), dtype=str),
+              "source_hash": np.array(source_hash)}
+    for column in frame.columns:
+        if column in INT_COLUMNS or column in FLOAT_COLUMNS:
+            arrays[column] = frame[column].to_numpy()
+            continue
+        values = frame[column].tolist()
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in values], out=offsets[1:])
+        arrays[f"{column}__data"] = np.frombuffer(''.join(values).encode('utf-8'), dtype=np.uint8)
+        arrays[f"{column}__offsets"] = offsets
+
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+    for stale in path.parent.glob(path.name.rsplit('-', 1)[0] + '-*.npz'):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove stale posts cache {stale}: {e}")
+
+
+def _load_frame(path: Path) -> pd.DataFrame:
+    data = {}
+    with np.load(path, allow_pickle=False) as saved:
+        for column in saved['columns'].tolist():
+            if column in saved.files:
+                data[column] = saved[column]
+                continue
+            text = saved[f"{column}__data"].tobytes().decode('utf-8')
+            offsets = saved[f"{column}__offsets"].tolist()
+            data[column] = pd.Series([text[start:end]
+                                      for start, end in zip(offsets[:-1], offsets[1:])], dtype=object)
+    return pd.DataFrame(data)
+
+
+def load_posts_frame(csv_path: Path = DATA_PATH, cache_dir: Path = CACHE_DIR,
+                     refresh: bool = False) -> pd.DataFrame:
+    """
+    Return the typed posts table, ingesting the CSV only when it changed.
+
+    Args:
+        csv_path (Path): LinkedIn posts export.
+        cache_dir (Path): Directory for the ``.npz`` cache and reject file.
+        refresh (bool): Re-parse the CSV even if a cache exists.
+
+    Returns:
+        pd.DataFrame: One row per valid post; count columns are int64,
+            ``ENGAGEMENT_RATE`` is float64 and the rest are strings
+    """
+    csv_path, cache_dir = Path(csv_path), Path(cache_dir)
+    stat = os.stat(csv_path)
+    key, current = str(csv_path.resolve()), (stat.st_mtime_ns, stat.st_size)
+
+    with _frames_lock:
+        cached = _frames.get(key)
+        if cached is not None and cached[0] == current and not refresh:
+            return cached[1].copy()
+
+        frame: Optional[pd.DataFrame] = None
+        path = cache_path(csv_path, hash_file(csv_path), cache_dir)
+        if path.exists() and not refresh:
+            try:
+                frame = _load_frame(path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Posts cache {path} is unreadable ({e}); re-ingesting")
+        if frame is None:
+            frame, _ = ingest_csv(csv_path, cache_dir)
+        _frames[key] = (current, frame)
+        return frame.copy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest the LinkedIn posts CSV into the columnar cache")
+    parser.add_argument("--csv", type=Path, default=DATA_PATH)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    frame, report = ingest_csv(args.csv, args.cache_dir, args.chunksize)
+    print(f"{report['rows']} posts -> {report['cache_path']}")
+    if report['rejected']:
+        print(f"{report['rejected']} rejected rows -> {report['reject_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Process-wide registry for heavy NLP models (SentenceTransformer, spaCy).
+
+Each model is loaded at most once per process, even when several threads ask
+for it at the same time, and the wall-clock cost of every load is recorded so
+cold-start time can be inspected with ``model_registry.load_timings()``.
+"""
+import logging
+import threading
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_TRANSFORMER_MODEL = 'all-MiniLM-L6-v2'
+SPACY_MODEL = 'en_core_web_sm'
+
+
+class ModelRegistry:
+    """Thread-safe, lazily populated cache of loaded models."""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._timings: Dict[str, float] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._failed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        Register a loader for a model without loading it.
+
+        Args:
+            name (str): Registry key, e.g. ``"spacy:en_core_web_sm"``
+            loader (Callable[[], Any]): Zero-argument function returning the model
+        """
+        with self._lock:
+            self._loaders.setdefault(name, loader)
+
+    def get(self, name: str, loader: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Return the model registered under ``name``, loading it on first use.
+
+        Concurrent callers for the same key block on a per-key lock so the
+        loader runs only once; other keys can load in parallel.
+
+        Args:
+            name (str): Registry key
+            loader (Optional[Callable[[], Any]]): Loader to register if the key is unknown
+
+        Returns:
+            Any: The loaded model
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if loader is not None:
+                self._loaders.setdefault(name, loader)
+            if name not in self._loaders:
+                raise KeyError(f"No loader registered for model '{name}'")
+            key_lock = self._key_locks.setdefault(name, threading.Lock())
+
+        with key_lock:
+            model = self._models.get(name)
+            if model is None:
+                start = time.perf_counter()
+                model = self._loaders[name]()
+                elapsed = time.perf_counter() - start
+                self._models[name] = model
+                self._timings[name] = elapsed
+                logger.info(f"Loaded model {name} in {elapsed:.2f}s")
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a model has already been loaded."""
+        return name in self._models
+
+    def warm(self, names: Optional[Iterable[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Pre-load models so the first request does not pay the cold-start cost.
+
+        Failures (e.g. an optional package that is not installed) are logged
+        and skipped rather than raised, and later warm-ups do not retry them.
+        Models that are already loaded are skipped, so repeated calls are cheap.
+
+        Args:
+            names (Optional[Iterable[str]]): Keys to load; defaults to every registered model
+            background (bool): Load in a daemon thread and return it instead of blocking
+
+        Returns:
+            Optional[threading.Thread]: The loader thread when ``background`` is True
+        """
+        with self._lock:
+            keys = list(names) if names is not None else list(self._loaders)
+            keys = [name for name in keys if name not in self._models and name not in self._failed]
+        if not keys:
+            return None
+
+        def _warm():
+            for name in keys:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    self._failed[name] = str(e)
+                    logger.warning(f"Could not warm model {name}: {str(e)}")
+
+        if background:
+            thread = threading.Thread(target=_warm, name="model-warmup", daemon=True)
+            thread.start()
+            return thread
+        _warm()
+        return None
+
+    def load_timings(self) -> Dict[str, float]:
+        """Get load time in seconds for every model loaded so far."""
+        return dict(self._timings)
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """Drop one loaded model (or all of them) so it is reloaded on next use."""
+        with self._lock:
+            if name is None:
+                self._models.clear()
+                self._timings.clear()
+                self._failed.clear()
+            else:
+                self._models.pop(name, None)
+                self._timings.pop(name, None)
+                self._failed.pop(name, None)
+
+
+def _load_sentence_transformer(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def _load_spacy(model_name: str):
+    import spacy
+    return spacy.load(model_name)
+
+
+def get_sentence_transformer(model_name: str = SENTENCE_TRANSFORMER_MODEL):
+    """Get the shared SentenceTransformer instance for ``model_name``."""
+    return model_registry.get(f"sentence_transformer:{model_name}",
+                              partial(_load_sentence_transformer, model_name))
+
+
+def get_spacy_model(model_name: str = SPACY_MODEL):
+    """Get the shared spaCy pipeline for ``model_name``."""
+    return model_registry.get(f"spacy:{model_name}", partial(_load_spacy, model_name))
+
+
+# Singleton instance for easy import
+model_registry = ModelRegistry()
+model_registry.register(f"sentence_transformer:{SENTENCE_TRANSFORMER_MODEL}",
+                        partial(_load_sentence_transformer, SENTENCE_TRANSFORMER_MODEL))
+model_registry.register(f"spacy:{SPACY_MODEL}", partial(_load_spacy, SPACY_MODEL))
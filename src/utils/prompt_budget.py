@@ -0,0 +1,302 @@
+"""
+Token-budget-aware prompt assembly.
+
+Few-shot examples, brand guidance and feedback used to be concatenated into
+prompts without limit. ``PromptAssembler`` collects a prompt as named
+sections, measures them with ``count_tokens`` and fits the optional ones
+into a token budget:
+
+- ``drop``: keep the most relevant items whole and drop the rest
+- ``truncate``: cut each item at a word boundary to fit the space left
+- ``summarize``: shorten each item to its leading sentences first, then drop
+
+Required sections are always kept. Optional sections are filled in priority
+order, and within a section items are considered from most to least
+relevant but rendered in their original order.
+
+    assembler = PromptAssembler(max_tokens=1500, reserved_tokens=200)
+    assembler.add("instructions", base_prompt, required=True)
+    assembler.add_items("examples", posts, relevance=scores, strategy="summarize",
+                        header="Examples:\\n", item_format="Example {number}:\\n{item}\\n")
+    prompt, report = assembler.assemble()
+"""
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ENV = "LIFT_PROMPT_TOKEN_BUDGET"
+DEFAULT_PROMPT_BUDGET = 3000
+
+STRATEGIES = ("drop", "truncate", "summarize")
+ELLIPSIS = " …"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def default_budget() -> int:
+    """Prompt token budget from ``LIFT_PROMPT_TOKEN_BUDGET`` (default 3000)."""
+    try:
+        return int(os.environ.get(BUDGET_ENV, DEFAULT_PROMPT_BUDGET))
+    except ValueError:
+        logger.warning(f"Invalid {BUDGET_ENV}; using {DEFAULT_PROMPT_BUDGET}")
+        return DEFAULT_PROMPT_BUDGET
+
+
+def truncate_to_tokens(text: str, max_tokens: int,
+                       counter: Callable[[str], int] = count_tokens) -> str:
+    """
+    Cut ``text`` at a word boundary so it fits in ``max_tokens``.
+
+    Args:
+        text (str): Text to shorten
+        max_tokens (int): Token limit, including the trailing ellipsis
+        counter (Callable[[str], int]): Token counter
+
+    Returns:
+        str: ``text`` unchanged if it fits, otherwise its longest fitting
+            prefix followed by an ellipsis (empty if nothing fits)
+    """
+    if counter(text) <= max_tokens:
+        return text
+    words = text.split(" ")
+    low, high = 0, len(words) - 1
+    # Binary search for the longest word prefix that fits with the ellipsis
+    while low < high:
+        middle = (low + high + 1) // 2
+        if counter(" ".join(words[:middle]) + ELLIPSIS) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low]).rstrip() + ELLIPSIS if low else ""
+
+
+def summarize_to_tokens(text: str, max_tokens: int,
+                        counter: Callable[[str], int] = count_tokens) -> str:
+    """
+    Shorten ``text`` to its leading sentences within ``max_tokens``.
+
+    An extractive summary: posts and examples lead with their hook, so the
+    opening sentences carry most of the style signal. If even the first
+    sentence is too long it is truncated.
+
+    Args:
+        text (str): Text to shorten
+        max_tokens (int): Token limit
+        counter (Callable[[str], int]): Token counter
+
+    Returns:
+        str: The summary
+    """
+    if counter(text) <= max_tokens:
+        return text
+    summary = ""
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        candidate = f"{summary} {sentence}" if summary else sentence
+        if counter(candidate + ELLIPSIS) > max_tokens:
+            break
+        summary = candidate
+    if not summary:
+        return truncate_to_tokens(text, max_tokens, counter)
+    return summary + ELLIPSIS
+
+
+class PromptAssembler:
+    """Build a prompt from sections that fit a token budget."""
+
+    def __init__(self, max_tokens: Optional[int] = None, reserved_tokens: int = 0,
+                 counter: Callable[[str], int] = count_tokens):
+        """
+        Initialize the assembler.
+
+        Args:
+            max_tokens (Optional[int]): Token budget for the whole prompt; defaults to
+                ``LIFT_PROMPT_TOKEN_BUDGET``
+            reserved_tokens (int): Tokens set aside for text added later (e.g. brand guidance)
+            counter (Callable[[str], int]): Token counter
+        """
+        self.max_tokens = max_tokens if max_tokens is not None else default_budget()
+        self.reserved_tokens = reserved_tokens
+        self.counter = counter
+        self.sections: List[Dict] = []
+
+    def add(self, name: str, text: str, required: bool = False, priority: int = 0,
+            strategy: str = "truncate") -> "PromptAssembler":
+        """
+        Add a block of text as a section.
+
+        Args:
+            name (str): Section name used in the report
+            text (str): Section text
+            required (bool): Always keep the section in full
+            priority (int): Lower priorities get budget first
+            strategy (str): How to shrink the section (``drop``, ``truncate`` or ``summarize``)
+
+        Returns:
+            PromptAssembler: self, for chaining
+        """
+        return self.add_items(name, [text] if text else [], required=required, priority=priority,
+                              strategy=strategy)
+
+    def add_items(self, name: str, items: Sequence[str], relevance: Optional[Sequence[float]] = None,
+                  strategy: str = "drop", header: str = "", footer: str = "",
+                  item_format: str = "{item}", required: bool = False, priority: int = 0,
+                  max_item_tokens: Optional[int] = None, min_item_tokens: int = 8) -> "PromptAssembler":
+        """
+        Add a list of items (examples, feedback entries, ...) as one section.
+
+        Args:
+            name (str): Section name used in the report
+            items (Sequence[str]): Item texts
+            relevance (Optional[Sequence[float]]): Score per item, higher is more relevant;
+                defaults to the given order
+            strategy (str): ``drop``, ``truncate`` or ``summarize``
+            header (str): Text before the items, included only if an item is kept
+            footer (str): Text after the items, included only if an item is kept
+            item_format (str): Format with ``{item}`` and ``{number}`` (1-based, after trimming)
+            required (bool): Always keep every item in full
+            priority (int): Lower priorities get budget first
+            max_item_tokens (Optional[int]): Per-item cap applied before fitting
+                (``summarize`` and ``truncate`` only)
+            min_item_tokens (int): Shortened items below this size are dropped instead
+
+        Returns:
+            PromptAssembler: self, for chaining
+
+        Raises:
+            ValueError: If the name is taken, the strategy is unknown or ``relevance``
+                has the wrong length
+        """
+        if any(section["name"] == name for section in self.sections):
+            raise ValueError(f"Duplicate prompt section: {name}")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown truncation strategy: {strategy}")
+        if relevance is None:
+            relevance = [-index for index in range(len(items))]
+        if len(relevance) != len(items):
+            raise ValueError("relevance must have one score per item")
+        self.sections.append({
+            "name": name,
+            "items": list(items),
+            "relevance": list(relevance),
+            "strategy": strategy,
+            "header": header,
+            "footer": footer,
+            "item_format": item_format,
+            "required": required,
+            "priority": priority,
+            "max_item_tokens": max_item_tokens,
+            "min_item_tokens": min_item_tokens
+        })
+        return self
+
+    def _shrink(self, section: Dict, text: str, limit: int) -> str:
+        if section["strategy"] == "summarize":
+            return summarize_to_tokens(text, limit, self.counter)
+        return truncate_to_tokens(text, limit, self.counter)
+
+    def _render(self, section: Dict, kept: List[Tuple[int, str]]) -> str:
+        if not kept:
+            return ""
+        body = "".join(section["item_format"].format(item=text, number=number)
+                       for number, (_, text) in enumerate(sorted(kept), 1))
+        return f"{section['header']}{body}{section['footer']}"
+
+    def _fit(self, section: Dict, available: int) -> Tuple[List[Tuple[int, str]], Dict]:
+        """Choose (and shorten) the items of ``section`` that fit in ``available`` tokens."""
+        stats = {"items": len(section["items"]), "kept": 0, "dropped": 0, "truncated": 0, "summarized": 0}
+        items = list(enumerate(section["items"]))
+        if section["required"]:
+            stats["kept"] = len(items)
+            return items, stats
+
+        cap = section["max_item_tokens"]
+        can_shrink = section["strategy"] != "drop"
+        kept: List[Tuple[int, str]] = []
+        shortened = 0
+        order = sorted(range(len(items)), key=lambda i: section["relevance"][i], reverse=True)
+        for index in order:
+            original = text = items[index][1]
+            if cap is not None and can_shrink:
+                text = self._shrink(section, text, cap)
+            candidate = kept + [(index, text)]
+            if self.counter(self._render(section, candidate)) > available:
+                candidate = None
+                if can_shrink:
+                    # Shrink the item to whatever room is left, if that is worth keeping
+                    room = available - self.counter(self._render(section, kept + [(index, "")]))
+                    if room >= section["min_item_tokens"]:
+                        text = self._shrink(section, text, room)
+                        if text and self.counter(self._render(section, kept + [(index, text)])) <= available:
+                            candidate = kept + [(index, text)]
+            if candidate is None:
+                stats["dropped"] += 1
+                continue
+            kept = candidate
+            shortened += text != original
+        stats["kept"] = len(kept)
+        if can_shrink:
+            stats["summarized" if section["strategy"] == "summarize" else "truncated"] = shortened
+        return kept, stats
+
+    def fit(self) -> Tuple[Dict[str, str], Dict]:
+        """
+        Fit the sections into the budget without joining them.
+
+        Useful when the sections go into a template rather than being
+        concatenated.
+
+        Returns:
+            Tuple[Dict[str, str], Dict]: Rendered text per section name and a report
+                with ``budget``, ``reserved``, ``used``, ``remaining``, ``over_budget``
+                and per-section ``tokens``/``items``/``kept``/``dropped``/``truncated``/``summarized``
+        """
+        available = self.max_tokens - self.reserved_tokens
+        rendered: Dict[str, str] = {}
+        report_sections: Dict[str, Dict] = {}
+
+        # Required sections first, then optional ones by priority
+        order = sorted(range(len(self.sections)),
+                       key=lambda i: (not self.sections[i]["required"], self.sections[i]["priority"], i))
+        for position in order:
+            section = self.sections[position]
+            kept, stats = self._fit(section, max(0, available))
+            text = self._render(section, kept)
+            tokens = self.counter(text)
+            available -= tokens
+            rendered[section["name"]] = text
+            report_sections[section["name"]] = {"tokens": tokens, "strategy": section["strategy"], **stats}
+
+        used = sum(section["tokens"] for section in report_sections.values())
+        report = {
+            "budget": self.max_tokens,
+            "reserved": self.reserved_tokens,
+            "used": used,
+            "remaining": self.max_tokens - self.reserved_tokens - used,
+            "over_budget": used + self.reserved_tokens > self.max_tokens,
+            "sections": {section["name"]: report_sections[section["name"]] for section in self.sections}
+        }
+        if report["over_budget"]:
+            logger.warning(f"Required prompt sections exceed the token budget "
+                           f"({used} + {self.reserved_tokens} reserved > {self.max_tokens})")
+        return rendered, report
+
+    def assemble(self) -> Tuple[str, Dict]:
+        """
+        Fit the sections into the budget and join them in the order they were added.
+
+        Returns:
+            Tuple[str, Dict]: The prompt and the report from ``fit``, with ``used``
+                and ``remaining`` measured on the joined prompt
+        """
+        rendered, report = self.fit()
+        prompt = "".join(rendered[section["name"]] for section in self.sections)
+        report["used"] = self.counter(prompt)
+        report["remaining"] = self.max_tokens - self.reserved_tokens - report["used"]
+        return prompt, report
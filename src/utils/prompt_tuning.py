@@ -1,30 +1,35 @@
 from typing import Dict, List, Optional
+import heapq
 import json
 from pathlib import Path
 import logging
 from datetime import datetime
 from .evaluation import ContentEvaluator
+from .prompt_budget import PromptAssembler
+from .storage import ensure_json, open_store, update_json
 
 class PromptTuner:
     """Implements prompt-based fine-tuning using few-shot learning and adaptive prompting."""
     
-    def __init__(self, examples_file: str = "data/content_examples.json"):
+    def __init__(self, examples_file: str = "data/content_examples.json",
+                 evaluator: Optional[ContentEvaluator] = None):
         self.examples_file = examples_file
-        self.evaluator = ContentEvaluator()
+        # The spaCy pipeline behind the evaluator comes from the shared model
+        # registry, so building a fresh evaluator here no longer reloads it.
+        self.evaluator = evaluator or ContentEvaluator()
         self.logger = logging.getLogger(__name__)
+        self.last_budget_report: Optional[Dict] = None
         self._ensure_examples_file()
+        # Examples and adaptation history live in the configured store
+        self.store = open_store(self.examples_file)
     
     def _ensure_examples_file(self):
         """Ensure examples file exists with proper structure."""
-        examples_path = Path(self.examples_file)
-        if not examples_path.exists():
-            examples_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(examples_path, 'w') as f:
-                json.dump({
-                    "examples": [],
-                    "prompt_templates": {},
-                    "adaptation_history": []
-                }, f, indent=2)
+        ensure_json(Path(self.examples_file), {
+            "examples": [],
+            "prompt_templates": {},
+            "adaptation_history": []
+        })
     
     def add_example(self, content: str, content_type: str, 
                    metrics: Dict, context: Dict) -> None:
@@ -45,12 +50,7 @@ class PromptTuner:
             "context": context
         }
         
-        with open(self.examples_file, 'r+') as f:
-            data = json.load(f)
-            data["examples"].append(example)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        self.store.append("examples", example)
     
     def get_few_shot_examples(self, content_type: str, 
                             metric_threshold: float = 0.8) -> List[Dict]:
@@ -64,30 +64,31 @@ class PromptTuner:
         Returns:
             List[Dict]: Selected examples
         """
-        with open(self.examples_file, 'r') as f:
-            data = json.load(f)
-            
-        # Filter examples by content type and metric threshold
-        examples = [
-            ex for ex in data["examples"]
-            if ex["content_type"] == content_type and
-            all(score >= metric_threshold for score in ex["metrics"].values())
-        ]
-        
-        # Sort by timestamp (most recent first)
-        examples.sort(key=lambda x: x["timestamp"], reverse=True)
+        # Stream examples filtered by content type and metric threshold
+        examples = (
+            ex for ex in self.store.iter("examples", content_type=content_type)
+            if all(score >= metric_threshold for score in ex["metrics"].values())
+        )
         
-        return examples[:5]  # Return top 5 examples
+        # Keep the 5 most recent without sorting the whole history
+        return heapq.nlargest(5, examples, key=lambda x: x["timestamp"])
     
     def adapt_prompt(self, base_prompt: str, content_type: str,
-                    feedback: Optional[Dict] = None) -> str:
+                    feedback: Optional[Dict] = None, token_budget: Optional[int] = None) -> str:
         """
         Adapt prompt based on feedback and examples.
         
+        Examples and feedback are fitted into ``token_budget`` (default
+        ``LIFT_PROMPT_TOKEN_BUDGET``) around the base prompt: examples are
+        shortened to their leading sentences and the lowest-scoring ones are
+        dropped first, feedback entries are truncated. The budget report is
+        kept in ``last_budget_report`` and in the adaptation history.
+        
         Args:
             base_prompt (str): Original prompt template
             content_type (str): Type of content
             feedback (Optional[Dict]): Recent feedback
+            token_budget (Optional[int]): Token budget for the adapted prompt
             
         Returns:
             str: Adapted prompt
@@ -95,54 +96,55 @@ class PromptTuner:
         # Get high-quality examples
         examples = self.get_few_shot_examples(content_type)
         
-        # Start with the base prompt
-        adapted_prompt = base_prompt
+        # Start with the base prompt, which is always kept in full
+        assembler = PromptAssembler(token_budget)
+        assembler.add("base", base_prompt, required=True)
         
-        # Add examples if available
-        if examples:
-            adapted_prompt += "\n\nHere are some successful examples:\n"
-            for i, example in enumerate(examples, 1):
-                adapted_prompt += f"\nExample {i}:\n"
-                adapted_prompt += f"Context: {json.dumps(example['context'])}\n"
-                adapted_prompt += f"Content: {example['content']}\n"
-                adapted_prompt += f"Metrics: {json.dumps(example['metrics'])}\n"
+        # Add examples if available, best average metric first
+        assembler.add_items(
+            "examples",
+            [f"Context: {json.dumps(example['context'])}\n"
+             f"Content: {example['content']}\n"
+             f"Metrics: {json.dumps(example['metrics'])}" for example in examples],
+            relevance=[sum(example["metrics"].values()) / max(len(example["metrics"]), 1) for example in examples],
+            strategy="summarize",
+            header="\n\nHere are some successful examples:\n",
+            item_format="\nExample {number}:\n{item}\n",
+            priority=1
+        )
         
         # Incorporate feedback if available
-        if feedback:
-            adapted_prompt += "\n\nRecent feedback and improvements:\n"
-            for key, value in feedback.items():
-                adapted_prompt += f"- {key}: {value}\n"
+        assembler.add_items(
+            "feedback",
+            [f"{key}: {value}" for key, value in (feedback or {}).items()],
+            strategy="truncate",
+            header="\n\nRecent feedback and improvements:\n",
+            item_format="- {item}\n",
+            priority=0
+        )
+        adapted_prompt, self.last_budget_report = assembler.assemble()
         
         # Store adaptation history
-        self._store_adaptation(base_prompt, adapted_prompt, content_type)
+        self._store_adaptation(base_prompt, adapted_prompt, content_type, self.last_budget_report)
         
         return adapted_prompt
     
     def _store_adaptation(self, original: str, adapted: str, 
-                         content_type: str) -> None:
+                         content_type: str, budget: Optional[Dict] = None) -> None:
         """Store prompt adaptation history."""
         adaptation = {
             "timestamp": datetime.now().isoformat(),
             "content_type": content_type,
             "original_prompt": original,
-            "adapted_prompt": adapted
+            "adapted_prompt": adapted,
+            "budget": budget
         }
         
-        with open(self.examples_file, 'r+') as f:
-            data = json.load(f)
-            data["adaptation_history"].append(adaptation)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        self.store.append("adaptation_history", adaptation)
     
     def get_adaptation_history(self, content_type: Optional[str] = None) -> List[Dict]:
         """Retrieve adaptation history, optionally filtered by content type."""
-        with open(self.examples_file, 'r') as f:
-            data = json.load(f)
-            if content_type:
-                return [entry for entry in data["adaptation_history"] 
-                       if entry["content_type"] == content_type]
-            return data["adaptation_history"]
+        return list(self.store.iter("adaptation_history", content_type=content_type))
     
     def update_prompt_templates(self, content_type: str, 
                               templates: Dict[str, str]) -> None:
@@ -153,14 +155,11 @@ class PromptTuner:
             content_type (str): Type of content
             templates (Dict[str, str]): New prompt templates
         """
-        with open(self.examples_file, 'r+') as f:
-            data = json.load(f)
-            if "prompt_templates" not in data:
-                data["prompt_templates"] = {}
-            data["prompt_templates"][content_type] = templates
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+        def _update(data):
+            data.setdefault("prompt_templates", {})[content_type] = templates
+            return data
+
+        update_json(Path(self.examples_file), _update)
     
     def get_prompt_templates(self, content_type: str) -> Dict[str, str]:
         """Retrieve prompt templates for a content type."""
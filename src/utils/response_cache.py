@@ -0,0 +1,277 @@
+"""
+Persistent cache of LLM responses keyed by model, sampling settings and prompt.
+
+Retries, Streamlit reruns and repeated calendar requests often send exactly
+the same formatted prompt. ``ResponseCache`` stores each response in a local
+SQLite database under a SHA-256 of (model, temperature, max_tokens, prompt),
+expires entries after a TTL and evicts the least recently used ones beyond
+``max_entries``. With ``semantic_threshold`` set, a miss falls back to the
+stored prompt whose embedding is most similar to the new one, if the cosine
+similarity is at least the threshold.
+
+The agents use the cache returned by ``get_response_cache()``, which is off
+unless ``LIFT_RESPONSE_CACHE`` is set.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.tokens import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV = "LIFT_RESPONSE_CACHE"
+CACHE_PATH_ENV = "LIFT_RESPONSE_CACHE_PATH"
+CACHE_TTL_ENV = "LIFT_RESPONSE_CACHE_TTL"
+CACHE_MAX_ENTRIES_ENV = "LIFT_RESPONSE_CACHE_MAX_ENTRIES"
+CACHE_SEMANTIC_ENV = "LIFT_RESPONSE_CACHE_SEMANTIC_THRESHOLD"
+
+DEFAULT_CACHE_PATH = "data/response_cache.db"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    settings TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    response TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    embedding BLOB,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+CREATE INDEX IF NOT EXISTS idx_responses_settings ON responses (settings, created_at);
+"""
+
+
+def _default_encoder(texts: List[str]) -> np.ndarray:
+    from src.utils.model_registry import get_sentence_transformer
+    return get_sentence_transformer().encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, LRU eviction and optional semantic hits."""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, semantic_threshold: Optional[float] = None,
+                 encoder: Optional[Encoder] = None, clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path (str): SQLite database path (created if missing)
+            ttl_seconds (float): Entries older than this are never returned (0 disables expiry)
+            max_entries (int): Least recently used entries beyond this are evicted
+            semantic_threshold (Optional[float]): Cosine similarity needed for a near-duplicate
+                hit; None disables semantic lookups
+            encoder (Optional[Encoder]): Text embedding function for semantic lookups;
+                defaults to the shared SentenceTransformer
+            clock (Callable[[], float]): Wall clock, injectable for tests
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.encoder = encoder or _default_encoder
+        self._clock = clock
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0,
+                       "saved_input_tokens": 0, "saved_output_tokens": 0, "saved_cost": 0.0}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _settings(model: str, temperature: float, max_tokens: Optional[int]) -> str:
+        return json.dumps([model, round(float(temperature), 4), max_tokens])
+
+    @classmethod
+    def make_key(cls, model: str, temperature: float, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Cache key: SHA-256 of the model, sampling settings and formatted prompt."""
+        digest = hashlib.sha256(cls._settings(model, temperature, max_tokens).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        vector = np.asarray(self.encoder([prompt]), dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, model: str, temperature: float, prompt: str,
+            max_tokens: Optional[int] = None) -> Optional[Dict]:
+        """
+        Look up a response.
+
+        Args:
+            model (str): Model name
+            temperature (float): Sampling temperature
+            prompt (str): The fully formatted prompt
+            max_tokens (Optional[int]): Completion limit of the request
+
+        Returns:
+            Optional[Dict]: ``text``, ``input_tokens``, ``output_tokens``, ``model`` and
+                ``cache`` (``"exact"`` or ``"semantic"``), or None on a miss
+        """
+        now = self._clock()
+        oldest = now - self.ttl_seconds if self.ttl_seconds else float("-inf")
+        conn = self._connection()
+        key = self.make_key(model, temperature, prompt, max_tokens)
+        row = conn.execute(
+            "SELECT key, response, input_tokens, output_tokens FROM responses "
+            "WHERE key = ? AND created_at >= ?", (key, oldest)
+        ).fetchone()
+        kind = "exact"
+
+        if row is None and self.semantic_threshold is not None:
+            row = self._nearest(conn, self._settings(model, temperature, max_tokens), prompt, oldest)
+            kind = "semantic"
+
+        if row is None:
+            with self._stats_lock:
+                self._stats["misses"] += 1
+            return None
+
+        hit_key, response, input_tokens, output_tokens = row
+        with conn:
+            conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, hit_key))
+        with self._stats_lock:
+            self._stats["hits"] += 1
+            if kind == "semantic":
+                self._stats["semantic_hits"] += 1
+            self._stats["saved_input_tokens"] += input_tokens
+            self._stats["saved_output_tokens"] += output_tokens
+            self._stats["saved_cost"] += estimate_cost(model, input_tokens, output_tokens) or 0.0
+        return {"text": response, "input_tokens": input_tokens, "output_tokens": output_tokens,
+                "model": model, "cache": kind}
+
+    def _nearest(self, conn: sqlite3.Connection, settings: str, prompt: str, oldest: float):
+        """Return the most similar stored row above the threshold, if any."""
+        rows = conn.execute(
+            "SELECT key, response, input_tokens, output_tokens, embedding FROM responses "
+            "WHERE settings = ? AND created_at >= ? AND embedding IS NOT NULL", (settings, oldest)
+        ).fetchall()
+        if not rows:
+            return None
+        try:
+            query = self._embed(prompt)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup skipped: {str(e)}")
+            return None
+        matrix = np.stack([np.frombuffer(row[4], dtype=np.float32) for row in rows])
+        if matrix.shape[1] != query.shape[0]:
+            return None
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.semantic_threshold:
+            return None
+        logger.info(f"Semantic cache hit (similarity {scores[best]:.3f})")
+        return rows[best][:4]
+
+    def put(self, model: str, temperature: float, prompt: str, response: Dict,
+            max_tokens: Optional[int] = None) -> None:
+        """
+        Store a response and evict expired or least recently used entries.
+
+        Args:
+            model (str): Model name
+            temperature (float): Sampling temperature
+            prompt (str): The fully formatted prompt
+            response (Dict): ``text`` plus optional ``input_tokens``/``output_tokens``
+            max_tokens (Optional[int]): Completion limit of the request
+        """
+        embedding = None
+        if self.semantic_threshold is not None:
+            try:
+                embedding = self._embed(prompt).tobytes()
+            except Exception as e:
+                logger.warning(f"Could not embed prompt for the semantic cache: {str(e)}")
+        now = self._clock()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, settings, prompt, response, input_tokens, "
+                "output_tokens, embedding, created_at, last_used, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (self.make_key(model, temperature, prompt, max_tokens),
+                 self._settings(model, temperature, max_tokens), prompt, response["text"],
+                 response.get("input_tokens", 0), response.get("output_tokens", 0), embedding, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+            "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+        )
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and estimated savings for this process."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self)
+        return stats
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, or None if caching is disabled.
+
+    Configured with ``LIFT_RESPONSE_CACHE`` (``1``/``true`` to enable),
+    ``LIFT_RESPONSE_CACHE_PATH``, ``LIFT_RESPONSE_CACHE_TTL`` (seconds),
+    ``LIFT_RESPONSE_CACHE_MAX_ENTRIES`` and
+    ``LIFT_RESPONSE_CACHE_SEMANTIC_THRESHOLD`` (e.g. ``0.95``).
+    """
+    global _cache
+    if os.environ.get(CACHE_ENV, "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            threshold = os.environ.get(CACHE_SEMANTIC_ENV)
+            _cache = ResponseCache(
+                os.environ.get(CACHE_PATH_ENV, DEFAULT_CACHE_PATH),
+                ttl_seconds=float(os.environ.get(CACHE_TTL_ENV, DEFAULT_TTL)),
+                max_entries=int(os.environ.get(CACHE_MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES)),
+                semantic_threshold=float(threshold) if threshold else None
+            )
+        return _cache
@@ -1,38 +1,126 @@
-import json
+import os
+import threading
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+
+from src.utils.bm25 import BM25Index, reciprocal_rank_fusion
+from src.utils.embedding_index import EmbeddingIndex, INDEX_DIR
+from src.utils.model_registry import get_sentence_transformer
 
 try:
-    from sentence_transformers import SentenceTransformer, util
+    import sentence_transformers
     _HAS_ST = True
 except ImportError:
     _HAS_ST = False
 
 MODEL_NAME = 'all-MiniLM-L6-v2'
 POSTS_PATH = Path('data_store/authentic_posts.json')
+# Set to 1 to fuse embedding and BM25 rankings (reciprocal rank fusion)
+FUSION_ENV = 'LIFT_RETRIEVAL_FUSION'
+# Candidates taken from each retriever before fusion, per requested result
+FUSION_DEPTH = 10
+
+_indexes: Dict[Path, EmbeddingIndex] = {}
+_bm25_indexes: Dict[Path, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def _encode(texts: List[str]):
+    return get_sentence_transformer(MODEL_NAME).encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
 
+def get_embedding_index(posts_path: Path = POSTS_PATH) -> EmbeddingIndex:
+    """Return the process-wide embedding index for ``posts_path``, refreshed if the file changed."""
+    key = Path(posts_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = EmbeddingIndex(posts_path, INDEX_DIR, MODEL_NAME)
+    return index.ensure(_encode)
 
-def retrieve_relevant_posts(user_topic: str, top_k: int = 2, posts_path: Path = POSTS_PATH) -> List[str]:
+
+def update_embedding_index(posts_path: Path = POSTS_PATH) -> Dict[str, int]:
+    """
+    Bring the embedding index up to date with ``posts_path``, encoding only new or changed posts.
+
+    Args:
+        posts_path (Path): Path to authentic_posts.json.
+    Returns:
+        Dict[str, int]: Posts ``reused``, ``encoded`` and ``dropped`` by the update
+            (all reused if the index was already current).
+    """
+    if not _HAS_ST:
+        raise ImportError("sentence-transformers is required for semantic retrieval. Please install it via pip.")
+    index = get_embedding_index(posts_path)
+    return index.last_update or {'reused': len(index.posts), 'encoded': 0, 'dropped': 0}
+
+
+def get_bm25_index(posts_path: Path = POSTS_PATH) -> BM25Index:
+    """Return the process-wide BM25 index for ``posts_path``, refreshed if the file changed."""
+    key = Path(posts_path).resolve()
+    with _indexes_lock:
+        index = _bm25_indexes.get(key)
+        if index is None:
+            index = _bm25_indexes[key] = BM25Index(posts_path, INDEX_DIR)
+    return index.ensure()
+
+
+def retrieve_keyword_posts(user_topic: str, top_k: int = 2, posts_path: Path = POSTS_PATH) -> List[str]:
+    """
+    Retrieve the best keyword matches for a topic with BM25.
+
+    Needs neither sentence-transformers nor torch; a query takes well under
+    a millisecond on thousands of posts. If fewer than ``top_k`` posts share
+    a term with the topic, the rest are filled in corpus order so callers
+    still get style examples, as with semantic retrieval.
+
+    Args:
+        user_topic (str): The topic to match against posts.
+        top_k (int): Number of top posts to return.
+        posts_path (Path): Path to authentic_posts.json.
+    Returns:
+        List[str]: List of post contents.
+    """
+    index = get_bm25_index(posts_path)
+    rows = index.search(user_topic, top_k)
+    if len(rows) < top_k:
+        matched = set(rows)
+        rows += [i for i in range(len(index.posts)) if i not in matched][:top_k - len(rows)]
+    return [index.posts[i]["content"] for i in rows]
+
+
+def retrieve_relevant_posts(user_topic: str, top_k: int = 2, posts_path: Path = POSTS_PATH,
+                            fusion: Optional[bool] = None, **filters) -> List[str]:
     """
     Retrieve the most relevant authentic posts for a given topic using semantic similarity.
+
+    Post embeddings come from a persistent index that is only rebuilt when
+    authentic_posts.json changes, so a query costs one encode plus one
+    matrix-vector product (or, with ``LIFT_RETRIEVAL_BACKEND=ivf``, a scan of
+    the few IVF lists nearest the query).
+
     Args:
         user_topic (str): The topic to match against posts.
         top_k (int): Number of top posts to return.
         posts_path (Path): Path to authentic_posts.json.
+        fusion (Optional[bool]): Fuse the semantic ranking with BM25 by reciprocal rank
+            fusion; defaults to ``LIFT_RETRIEVAL_FUSION``.
+        **filters: Metadata filters: ``topic``, ``content_type``, ``since`` and ``until``.
     Returns:
         List[str]: List of post contents.
     """
     if not _HAS_ST:
         raise ImportError("sentence-transformers is required for semantic retrieval. Please install it via pip.")
-    with open(posts_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    posts = data.get("authentic_posts", [])
-    post_texts = [post["content"] for post in posts if post.get("content")]
-    if not post_texts:
+    index = get_embedding_index(posts_path)
+    if not index.posts:
         return []
-    model = SentenceTransformer(MODEL_NAME)
-    topic_embedding = model.encode(user_topic, convert_to_tensor=True)
-    post_embeddings = model.encode(post_texts, convert_to_tensor=True)
-    similarities = util.pytorch_cos_sim(topic_embedding, post_embeddings)[0]
-    top_indices = similarities.argsort(descending=True)[:top_k]
-    return [post_texts[i] for i in top_indices] 
\ No newline at end of file
+    topic_embedding = _encode([user_topic])
+    if fusion is None:
+        fusion = os.environ.get(FUSION_ENV, "").lower() in ("1", "true", "yes", "on")
+    if not fusion:
+        return [index.posts[i]["content"] for i in index.search(topic_embedding, top_k, **filters)]
+
+    depth = max(top_k * FUSION_DEPTH, top_k)
+    semantic = index.search(topic_embedding, depth, **filters)
+    lexical = get_bm25_index(posts_path).search(user_topic, depth, mask=index.filter_mask(**filters))
+    return [index.posts[i]["content"] for i in reciprocal_rank_fusion([semantic, lexical], top_k=top_k)]
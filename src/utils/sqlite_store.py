@@ -0,0 +1,314 @@
+"""
+SQLite storage engine for feedback, metrics, voice feedback and examples.
+
+``SQLiteStore`` exposes the same methods as ``JsonlStore`` but keeps entries
+in indexed tables, so filtering by content type, content id or time window
+is an index lookup instead of a scan. The database runs in WAL mode so
+readers do not block the writer. Enable it with ``LIFT_STORAGE_BACKEND=sqlite``
+and import existing data with::
+
+    python -m src.utils.sqlite_store migrate --db data/lift_store.db
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.utils.storage import DEFAULT_SQLITE_PATH, AppendOnlyLog, log_base_path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Stream name (the list key in the legacy JSON document) -> table
+STREAM_TABLES = {
+    "feedback_history": "feedback",
+    "feedback": "feedback",
+    "metrics_history": "metrics_history",
+    "feedback_entries": "voice_feedback",
+    "examples": "examples",
+    "adaptation_history": "adaptation_history"
+}
+
+# Legacy JSON documents and the streams each one holds
+DEFAULT_SOURCES = {
+    "data/feedback.json": ["feedback_history", "metrics_history"],
+    "feedback_data/feedback.json": ["feedback"],
+    "feedback_data/voice_feedback.json": ["feedback_entries"],
+    "data/content_examples.json": ["examples", "adaptation_history"]
+}
+
+
+def source_key(json_path: str) -> str:
+    """
+    Name a legacy JSON document the same way whatever the working directory.
+
+    Args:
+        json_path (str): Path to the document
+
+    Returns:
+        str: Its resolved path, relative to the project root when inside it
+    """
+    path = Path(json_path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _schema() -> str:
+    statements = []
+    for table in sorted(set(STREAM_TABLES.values())):
+        statements.append(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            content_type TEXT,
+            content_id TEXT,
+            timestamp TEXT,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{table}_type_time ON {table} (source, content_type, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_{table}_time ON {table} (source, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_{table}_content_id ON {table} (content_id, timestamp);
+        """)
+    statements.append("""
+        CREATE TABLE IF NOT EXISTS migrations (
+            source TEXT NOT NULL,
+            stream TEXT NOT NULL,
+            entries INTEGER NOT NULL,
+            migrated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, stream)
+        );
+    """)
+    return "\n".join(statements)
+
+
+class SQLiteStore:
+    """Indexed SQLite replacement for the list fields of one JSON document."""
+
+    def __init__(self, db_path: str, source: str):
+        """
+        Initialize the store.
+
+        Args:
+            db_path (str): Path to the SQLite database (created if missing)
+            source (str): The legacy JSON document this store stands in for;
+                entries from different documents share tables but not rows
+        """
+        self.db_path = Path(db_path)
+        self.source = source_key(source)
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_schema())
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite connections are not shareable."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _table(stream: str) -> str:
+        try:
+            return STREAM_TABLES[stream]
+        except KeyError:
+            raise ValueError(f"Unknown stream: {stream}")
+
+    def _row(self, entry: Dict[str, Any]) -> tuple:
+        content_id = entry.get("content_id")
+        return (
+            self.source,
+            entry.get("content_type"),
+            str(content_id) if content_id is not None else None,
+            entry.get("timestamp"),
+            json.dumps(entry, ensure_ascii=False)
+        )
+
+    def append(self, stream: str, entry: Dict[str, Any]) -> None:
+        """Append an entry to ``stream``."""
+        self.extend(stream, [entry])
+
+    def extend(self, stream: str, entries: Iterable[Dict[str, Any]]) -> None:
+        """Append several entries to ``stream`` in one transaction."""
+        table = self._table(stream)
+        rows = [self._row(entry) for entry in entries]
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(self._insert_sql(table), rows)
+
+    @staticmethod
+    def _insert_sql(table: str) -> str:
+        return (f"INSERT INTO {table} (source, content_type, content_id, timestamp, payload) "
+                f"VALUES (?, ?, ?, ?, ?)")
+
+    def iter(self, stream: str, content_type: Optional[str] = None,
+             since: Optional[str] = None, until: Optional[str] = None,
+             content_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries of ``stream`` in insertion order using the indexes.
+
+        Args:
+            stream (str): Stream name
+            content_type (Optional[str]): Only yield entries with this content type
+            since (Optional[str]): Only yield entries with ``timestamp >= since`` (ISO format)
+            until (Optional[str]): Only yield entries with ``timestamp < until`` (ISO format)
+            content_id (Optional[str]): Only yield entries for this content id
+
+        Yields:
+            Dict[str, Any]: Entries
+        """
+        clauses, params = ["source = ?"], [self.source]
+        if content_type:
+            clauses.append("content_type = ?")
+            params.append(content_type)
+        if content_id is not None:
+            clauses.append("content_id = ?")
+            params.append(str(content_id))
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        query = (f"SELECT payload FROM {self._table(stream)} "
+                 f"WHERE {' AND '.join(clauses)} ORDER BY id")
+        for (payload,) in self._connection().execute(query, params):
+            yield json.loads(payload)
+
+    def count(self, stream: str) -> int:
+        """Number of entries in ``stream``."""
+        (count,) = self._connection().execute(
+            f"SELECT COUNT(*) FROM {self._table(stream)} WHERE source = ?", (self.source,)
+        ).fetchone()
+        return count
+
+    def flush(self) -> None:
+        """Writes are committed per call; nothing is buffered."""
+
+    def is_migrated(self, stream: str) -> bool:
+        """Check whether ``stream`` of this source was already imported."""
+        row = self._connection().execute(
+            "SELECT 1 FROM migrations WHERE source = ? AND stream = ?", (self.source, stream)
+        ).fetchone()
+        return row is not None
+
+    def import_stream(self, stream: str, entries: Iterable[Dict[str, Any]],
+                      batch_size: int = 1000) -> Optional[int]:
+        """
+        Import ``stream`` once, atomically with the record that it was imported.
+
+        The rows and the ``migrations`` row are written in one transaction,
+        so an interrupted import leaves nothing behind and can simply be
+        re-run. The database is write-locked for the duration, so a
+        concurrent import of the same stream waits and then skips it.
+
+        Args:
+            stream (str): Stream name
+            entries (Iterable[Dict[str, Any]]): Entries to import, read lazily
+            batch_size (int): Rows per insert statement
+
+        Returns:
+            Optional[int]: Number of entries imported, or None if ``stream``
+                of this source was already imported
+        """
+        table = self._table(stream)
+        conn = self._connection()
+        total = 0
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ? AND stream = ?",
+                            (self.source, stream)).fetchone() is not None:
+                return None
+            rows = []
+            for entry in entries:
+                rows.append(self._row(entry))
+                if len(rows) >= batch_size:
+                    conn.executemany(self._insert_sql(table), rows)
+                    total += len(rows)
+                    rows = []
+            conn.executemany(self._insert_sql(table), rows)
+            total += len(rows)
+            conn.execute("INSERT INTO migrations (source, stream, entries) VALUES (?, ?, ?)",
+                         (self.source, stream, total))
+        return total
+
+
+def _legacy_entries(json_path: str, stream: str) -> List[Dict[str, Any]]:
+    """The ``stream`` list of a legacy JSON document ([] if it cannot be read)."""
+    try:
+        with open(json_path, 'r') as f:
+            entries = json.load(f).get(stream, [])
+    except (json.JSONDecodeError, AttributeError) as e:
+        logger.warning(f"Could not read {stream} from {json_path}: {e}")
+        return []
+    return entries if isinstance(entries, list) else []
+
+
+def migrate_json_to_sqlite(db_path: str, sources: Optional[Dict[str, List[str]]] = None) -> Dict[str, int]:
+    """
+    Import existing JSON/JSONL history into the SQLite database.
+
+    A stream's append-only log is read if it exists, otherwise the list in
+    the JSON document itself; nothing is written next to either. Each
+    (source, stream) pair is keyed on the document's resolved path and
+    imported in a single transaction together with its ``migrations`` row,
+    so an interrupted run imports nothing for the stream it was on and
+    re-running the migration is a no-op from any directory.
+
+    Args:
+        db_path (str): SQLite database path
+        sources (Optional[Dict[str, List[str]]]): JSON documents and their
+            streams; defaults to every known feedback/metrics/examples file
+
+    Returns:
+        Dict[str, int]: Number of entries imported per ``source:stream``
+    """
+    imported = {}
+    for json_path, streams in (sources or DEFAULT_SOURCES).items():
+        store = SQLiteStore(db_path, source=json_path)
+        for stream in streams:
+            key = f"{store.source}:{stream}"
+            log = AppendOnlyLog(log_base_path(json_path, stream))
+            if not Path(json_path).exists() and not log.exists():
+                continue
+            if store.is_migrated(stream):
+                logger.info(f"Skipping {key}: already migrated")
+                continue
+            total = store.import_stream(
+                stream, log.iter_entries() if log.exists() else _legacy_entries(json_path, stream)
+            )
+            if total is None:
+                logger.info(f"Skipping {key}: already migrated")
+                continue
+            imported[key] = total
+            logger.info(f"Migrated {total} entries from {key}")
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite feedback store tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import existing JSON history files")
+    migrate.add_argument("--db", default=DEFAULT_SQLITE_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        imported = migrate_json_to_sqlite(args.db)
+        for key, count in imported.items():
+            print(f"{key}: {count} entries")
+        print(f"Migration complete ({sum(imported.values())} entries)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
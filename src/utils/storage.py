@@ -0,0 +1,584 @@
+"""
+Append-only JSON Lines storage for feedback, metrics and example history.
+
+History used to live in list fields of a single JSON document that was
+loaded, appended to and rewritten on every write. Each of those lists is now
+an ``AppendOnlyLog``: one JSON object per line, appended with a single
+``write`` call, with fsyncs batched and the log periodically compacted into
+a snapshot file. ``JsonlStore`` groups the logs that replace one JSON
+document and imports its existing entries the first time a log is opened.
+
+On-disk layout for ``data/feedback.json``'s ``metrics_history`` list::
+
+    data/feedback.metrics_history.snapshot-000002.jsonl   # compacted entries
+    data/feedback.metrics_history.log-000002.jsonl        # appended since
+    data/feedback.metrics_history.lock                    # cross-process lock
+
+Several processes (e.g. gunicorn workers) and threads may write the same
+files: appends and compaction are serialized with a ``FileLock`` and JSON
+documents that are still rewritten whole go through ``update_json``, which
+replaces the file atomically via a temp file and rename.
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_RE = re.compile(r'\.(snapshot|log)-(\d{6})\.jsonl$')
+
+
+class FileLock:
+    """
+    Advisory lock on a ``.lock`` file, shared by threads and processes.
+
+    Every acquisition opens its own descriptor, so threads of one process
+    exclude each other just like separate processes do. Nested acquisition
+    by the thread that already holds the lock is a no-op.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """
+        Hold the lock for the duration of a ``with`` block.
+
+        Args:
+            shared (bool): Take a shared (reader) lock instead of an exclusive one;
+                without ``fcntl`` every lock is exclusive
+        """
+        if getattr(self._local, 'depth', 0):
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.01)
+            self._local.depth = 1
+            try:
+                yield
+            finally:
+                self._local.depth = 0
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+def _lock_for(path: Path) -> FileLock:
+    path = Path(path)
+    return FileLock(path.with_name(path.name + '.lock'))
+
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write ``data`` as JSON so readers see either the old or the new file, never a mix.
+
+    The document is written to a temp file in the same directory, fsynced
+    and renamed over ``path``.
+
+    Args:
+        path (Path): Target file
+        data (Any): JSON-serialisable document
+        indent (Optional[int]): Indentation passed to ``json.dump``
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def update_json(path: Path, update: Callable[[Any], Any], default: Any = None) -> Any:
+    """
+    Read-modify-write a JSON document under an exclusive cross-process lock.
+
+    Args:
+        path (Path): JSON document
+        update (Callable[[Any], Any]): Receives the current document (or a copy of
+            ``default`` if the file is missing) and returns the new one
+        default (Any): Document to start from when the file does not exist
+
+    Returns:
+        Any: The document that was written
+    """
+    path = Path(path)
+    with _lock_for(path).locked():
+        if path.exists():
+            with open(path, 'r') as f:
+                data = json.load(f)
+        else:
+            data = json.loads(json.dumps(default))
+        data = update(data)
+        atomic_write_json(path, data)
+    return data
+
+
+def ensure_json(path: Path, default: Any) -> None:
+    """Create ``path`` with ``default`` unless it exists; safe to race from several workers."""
+    path = Path(path)
+    if path.exists():
+        return
+    with _lock_for(path).locked():
+        if not path.exists():
+            atomic_write_json(path, default)
+
+
+def _sync_and_close(fd: int) -> None:
+    """Finalizer for a log writer left open when its log is collected or at exit."""
+    try:
+        os.fsync(fd)
+        os.close(fd)
+    except OSError:
+        pass
+
+
+def _count_entries(path: Path, offset: int = 0) -> int:
+    """Count the readable entries of a segment from byte ``offset`` on."""
+    count = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            count += 1
+    return count
+
+
+class AppendOnlyLog:
+    """A JSON Lines log made of one snapshot segment plus live log segments."""
+
+    def __init__(self, base_path: Path, fsync_every: int = 32, fsync_interval: float = 1.0,
+                 compact_bytes: int = 8 * 1024 * 1024):
+        """
+        Open (or create) the log.
+
+        Args:
+            base_path (Path): Path prefix of the segment files
+            fsync_every (int): fsync after this many appends...
+            fsync_interval (float): ...or when this many seconds passed since the last fsync
+            compact_bytes (int): Compact once the live log grows past this size (0 disables)
+        """
+        self.base_path = Path(base_path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._generation = 0
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+        self._finalizer: Optional[weakref.finalize] = None
+        # Entry count and the segment sizes it covers: (snapshot name, {log name: size})
+        self._count: Optional[int] = None
+        self._counted: Optional[Tuple[Optional[str], Dict[str, int]]] = None
+        self.file_lock = FileLock(self.base_path.with_name(self.base_path.name + '.lock'))
+
+    # -- segment bookkeeping -------------------------------------------------
+
+    def _segment_path(self, kind: str, generation: int) -> Path:
+        return self.base_path.with_name(f"{self.base_path.name}.{kind}-{generation:06d}.jsonl")
+
+    def _all_segments(self) -> List[Tuple[str, int, Path]]:
+        """List every (kind, generation, path) segment file of this log."""
+        segments = []
+        if self.base_path.parent.exists():
+            prefix = self.base_path.name + '.'
+            for path in self.base_path.parent.iterdir():
+                if not path.name.startswith(prefix):
+                    continue
+                match = _SEGMENT_RE.search(path.name)
+                if match and path.name == f"{self.base_path.name}{match.group(0)}":
+                    segments.append((match.group(1), int(match.group(2)), path))
+        return segments
+
+    def _segments(self) -> Tuple[Optional[Tuple[int, Path]], List[Tuple[int, Path]]]:
+        """Return the newest snapshot and the live logs that follow it, oldest first."""
+        segments = self._all_segments()
+        snapshots = [(gen, path) for kind, gen, path in segments if kind == 'snapshot']
+        snapshot = max(snapshots) if snapshots else None
+        start = snapshot[0] if snapshot else 0
+        logs = sorted((gen, path) for kind, gen, path in segments if kind == 'log' and gen >= start)
+        return snapshot, logs
+
+    def exists(self) -> bool:
+        """Check whether any segment of this log exists on disk."""
+        snapshot, logs = self._segments()
+        return snapshot is not None or bool(logs)
+
+    def _ensure_writer(self) -> None:
+        """Open the newest log, reopening if another process compacted ours away."""
+        if self._fd is not None and os.fstat(self._fd).st_nlink == 0:
+            self._close_writer()
+        if self._fd is None:
+            self._open_writer()
+
+    def _open_writer(self) -> None:
+        snapshot, logs = self._segments()
+        generations = [g for g, _ in logs] + ([snapshot[0]] if snapshot else [])
+        self._generation = max(generations) if generations else 0
+        self.base_path.parent.mkdir(parents=True, exist_ok=True)
+        self._attach_writer(self._segment_path('log', self._generation))
+
+    def _attach_writer(self, path: Path) -> None:
+        """Open ``path`` for appending; the fd is synced and closed at exit or when the log is collected."""
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._finalizer = weakref.finalize(self, _sync_and_close, self._fd)
+
+    def _close_writer(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        os.close(self._fd)
+        self._fd = None
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append a single entry."""
+        self.extend([entry])
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append several entries with one ``write`` call.
+
+        The write happens under the log's exclusive file lock, so it can never
+        land in a segment that a concurrent compaction is about to remove.
+
+        Args:
+            entries (Iterable[Dict[str, Any]]): JSON-serialisable entries
+        """
+        lines = [json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries]
+        if not lines:
+            return
+        data = ''.join(lines).encode('utf-8')
+        with self._lock, self.file_lock.locked():
+            self._ensure_writer()
+            self._write_all(data)
+            self._pending += len(lines)
+            if (self._pending >= self.fsync_every or
+                    time.monotonic() - self._last_fsync >= self.fsync_interval):
+                self._fsync()
+            if self.compact_bytes and os.fstat(self._fd).st_size >= self.compact_bytes:
+                self.compact()
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def _fsync(self) -> None:
+        if self._fd is not None and self._pending:
+            os.fsync(self._fd)
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+
+    def flush(self) -> None:
+        """Force pending appends to stable storage."""
+        with self._lock:
+            self._fsync()
+
+    def close(self) -> None:
+        """Flush and close the writer; the log reopens on the next append."""
+        with self._lock:
+            if self._fd is not None:
+                self._fsync()
+                self._close_writer()
+
+    def compact(self) -> None:
+        """
+        Merge the snapshot and live logs into a new snapshot segment.
+
+        New appends go to a fresh log of the next generation before the
+        snapshot is written (to a temp file, then renamed into place), and old
+        segments are removed only after the rename. A crash at any point
+        leaves a set of segments that still reads back every entry once.
+        The exclusive file lock is held throughout, so writers in other
+        processes wait and then reopen the new log.
+        """
+        with self._lock, self.file_lock.locked():
+            self._ensure_writer()
+            self._fsync()
+            snapshot, logs = self._segments()
+            sources = ([snapshot[1]] if snapshot else []) + [path for _, path in logs]
+
+            self._close_writer()
+            self._generation += 1
+            self._attach_writer(self._segment_path('log', self._generation))
+
+            target = self._segment_path('snapshot', self._generation)
+            tmp = target.with_name(target.name + '.tmp')
+            with open(tmp, 'wb') as out:
+                for source in sources:
+                    with open(source, 'rb') as f:
+                        for line in f:
+                            if line.strip():
+                                out.write(line if line.endswith(b'\n') else line + b'\n')
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, target)
+
+            # Also sweeps segments left behind by a compaction that crashed
+            for kind, generation, path in self._all_segments():
+                if generation < self._generation:
+                    try:
+                        path.unlink()
+                    except OSError as e:
+                        logger.warning(f"Could not remove compacted segment {path}: {e}")
+            logger.info(f"Compacted {len(sources)} segments into {target}")
+
+    def write_snapshot(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Seed an empty log with existing entries (used for one-time imports)."""
+        target = self._segment_path('snapshot', 0)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        count = 0
+        with self.file_lock.locked():
+            with open(tmp, 'w', encoding='utf-8') as out:
+                for entry in entries:
+                    out.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    count += 1
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, target)
+        self._count = self._counted = None
+        logger.info(f"Imported {count} entries into {target}")
+
+    # -- reading -------------------------------------------------------------
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_entries()
+
+    def iter_entries(self, predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+                     ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries in append order without loading the whole log.
+
+        The segment files are opened together under a shared lock, so the
+        reader sees a consistent set even if a compaction runs meanwhile.
+
+        Args:
+            predicate (Optional[Callable]): Only yield entries for which this returns True
+
+        Yields:
+            Dict[str, Any]: Log entries
+        """
+        files = []
+        with self.file_lock.locked(shared=True):
+            snapshot, logs = self._segments()
+            paths = ([snapshot[1]] if snapshot else []) + [path for _, path in logs]
+            for path in paths:
+                try:
+                    files.append((path, open(path, 'r', encoding='utf-8')))
+                except FileNotFoundError:
+                    continue
+        for path, f in files:
+            with f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable line in {path}")
+                        continue
+                    if predicate is None or predicate(entry):
+                        yield entry
+
+    def count(self) -> int:
+        """
+        Number of entries, including those appended by other processes.
+
+        Only the bytes appended to the live logs since the last call are
+        read; a compaction or import (a new snapshot) triggers a full recount.
+        """
+        with self._lock, self.file_lock.locked(shared=True):
+            snapshot, logs = self._segments()
+            sizes = {}
+            for _, path in logs:
+                try:
+                    sizes[path.name] = path.stat().st_size
+                except FileNotFoundError:
+                    continue
+            snapshot_name = snapshot[1].name if snapshot else None
+
+            counted = self._counted
+            if (self._count is None or counted[0] != snapshot_name
+                    or any(sizes.get(name, -1) < size for name, size in counted[1].items())):
+                self._count = _count_entries(snapshot[1]) if snapshot else 0
+                counted = (snapshot_name, {})
+            for _, path in logs:
+                offset = counted[1].get(path.name, 0)
+                if path.name in sizes and sizes[path.name] > offset:
+                    self._count += _count_entries(path, offset)
+            self._counted = (snapshot_name, sizes)
+            return self._count
+
+
+STORAGE_BACKEND_ENV = "LIFT_STORAGE_BACKEND"
+SQLITE_PATH_ENV = "LIFT_SQLITE_PATH"
+DEFAULT_SQLITE_PATH = "data/lift_store.db"
+
+
+def log_base_path(json_path: Path, stream: str) -> Path:
+    """Path prefix of the segment files holding ``stream`` of a legacy JSON document."""
+    json_path = Path(json_path)
+    return json_path.with_name(f"{json_path.stem}.{stream}")
+
+
+class JsonlStore:
+    """The append-only logs that replace the list fields of one JSON document."""
+
+    def __init__(self, json_path: str, **log_options):
+        """
+        Initialize the store.
+
+        Args:
+            json_path (str): The legacy JSON document; logs live next to it
+            **log_options: Passed through to ``AppendOnlyLog``
+        """
+        self.json_path = Path(json_path)
+        self.log_options = log_options
+        self._logs: Dict[str, AppendOnlyLog] = {}
+        self._lock = threading.Lock()
+
+    def log(self, stream: str) -> AppendOnlyLog:
+        """Get the log for ``stream`` (a list key of the JSON document)."""
+        with self._lock:
+            log = self._logs.get(stream)
+            if log is None:
+                log = AppendOnlyLog(log_base_path(self.json_path, stream), **self.log_options)
+                with log.file_lock.locked():
+                    if not log.exists():
+                        self._import_legacy(stream, log)
+                self._logs[stream] = log
+            return log
+
+    def _import_legacy(self, stream: str, log: AppendOnlyLog) -> None:
+        """Move entries from the JSON document's list into a fresh log, once."""
+        if not self.json_path.exists():
+            return
+        try:
+            with open(self.json_path, 'r') as f:
+                entries = json.load(f).get(stream, [])
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Could not import {stream} from {self.json_path}: {e}")
+            return
+        if entries:
+            log.write_snapshot(entries)
+
+    def append(self, stream: str, entry: Dict[str, Any]) -> None:
+        """Append an entry to ``stream``."""
+        self.log(stream).append(entry)
+
+    def extend(self, stream: str, entries: Iterable[Dict[str, Any]]) -> None:
+        """Append several entries to ``stream`` at once."""
+        self.log(stream).extend(entries)
+
+    def iter(self, stream: str, content_type: Optional[str] = None,
+             since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries of ``stream``, optionally filtered by content type and time window.
+
+        Args:
+            stream (str): Stream name
+            content_type (Optional[str]): Only yield entries with this ``content_type``
+            since (Optional[str]): Only yield entries with ``timestamp >= since`` (ISO format)
+            until (Optional[str]): Only yield entries with ``timestamp < until`` (ISO format)
+
+        Yields:
+            Dict[str, Any]: Entries in append order
+        """
+        def predicate(entry):
+            if content_type and entry.get("content_type") != content_type:
+                return False
+            timestamp = entry.get("timestamp") or ""
+            if since and timestamp < since:
+                return False
+            if until and timestamp >= until:
+                return False
+            return True
+
+        filtered = content_type or since or until
+        return self.log(stream).iter_entries(predicate if filtered else None)
+
+    def count(self, stream: str) -> int:
+        """Number of entries in ``stream``."""
+        return self.log(stream).count()
+
+    def flush(self) -> None:
+        """fsync every open log."""
+        for log in list(self._logs.values()):
+            log.flush()
+
+
+def open_store(json_path: str):
+    """
+    Open the history store that replaces the list fields of ``json_path``.
+
+    The backend is chosen with the ``LIFT_STORAGE_BACKEND`` environment
+    variable: ``jsonl`` (default) keeps append-only logs next to the JSON
+    file, ``sqlite`` uses the indexed database at ``LIFT_SQLITE_PATH``
+    (``data/lift_store.db`` by default). Both expose the same methods.
+
+    Args:
+        json_path (str): The legacy JSON document
+
+    Returns:
+        JsonlStore or SQLiteStore: The store
+    """
+    backend = os.environ.get(STORAGE_BACKEND_ENV, "jsonl").lower()
+    if backend == "sqlite":
+        from src.utils.sqlite_store import SQLiteStore
+        return SQLiteStore(os.environ.get(SQLITE_PATH_ENV, DEFAULT_SQLITE_PATH), source=json_path)
+    if backend != "jsonl":
+        logger.warning(f"Unknown storage backend '{backend}', using jsonl")
+    return JsonlStore(json_path)
@@ -0,0 +1,88 @@
+"""
+Rough token counting and cost estimation for Anthropic models.
+
+Token counts are estimated from character length (about four characters per
+token for English text). That is accurate enough for rate limiting, budget
+checks and cost reporting; the API's ``usage`` field is preferred whenever a
+real response is available. ``count_tokens`` approximates a BPE tokenizer
+locally for prompt budgets, where the extra accuracy matters.
+"""
+import re
+from typing import Dict, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+
+# USD per million (input, output) tokens
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "claude-3-opus-20240229": (15.0, 75.0),
+    "claude-3-sonnet-20240229": (3.0, 15.0),
+    "claude-3-5-sonnet-20240620": (3.0, 15.0),
+    "claude-3-5-sonnet-20241022": (3.0, 15.0),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "claude-3-5-haiku-20241022": (0.8, 4.0)
+}
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimate the number of tokens in ``text``.
+
+    Args:
+        text (Optional[str]): Text to measure
+
+    Returns:
+        int: Estimated token count (at least 1 for non-empty text)
+    """
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """
+    Estimate the USD cost of a request.
+
+    Args:
+        model_name (str): Model used for the request
+        input_tokens (int): Prompt tokens
+        output_tokens (int): Completion tokens
+
+    Returns:
+        Optional[float]: Cost in USD, or None if the model's pricing is unknown
+    """
+    pricing = MODEL_PRICING.get(model_name)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+# Pre-tokenizer in the style of byte-level BPE tokenizers: contractions,
+# words with their leading space, short digit groups, punctuation runs and
+# whitespace runs each start a new token
+_PRETOKEN_PATTERN = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+")
+# Characters per extra token once a word is longer than a typical vocabulary entry
+_LONG_WORD_CHARS = 6
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Count tokens with a local approximation of a BPE tokenizer.
+
+    Slower than ``estimate_tokens`` but much closer to real counts for
+    prompts with lists, indentation, numbers and punctuation, which is what
+    prompt budgets need.
+
+    Args:
+        text (Optional[str]): Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    count = 0
+    for piece in _PRETOKEN_PATTERN.findall(text):
+        length = len(piece.lstrip(" "))
+        count += 1 + max(0, length - _LONG_WORD_CHARS - 1) // _LONG_WORD_CHARS if length else 1
+    return count
@@ -0,0 +1,98 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from src.analytics import dashboard_data
+from src.analytics.dashboard_data import (
+    FIGURES_FILE, DashboardData, get_dashboard_data, ranked_counts, write_figure_specs
+)
+from src.analytics.run_analysis import ContentAnalyzer
+
+pytest.importorskip("plotly")
+
+POSTS = [
+    {"post_id": "1", "content_type": "text", "content": "Hiring culture matters", "metrics": {"likes": 10}},
+    {"post_id": "2", "content_type": "video", "content": "Culture first", "metrics": {"likes": 2, "comments": 4}},
+    {"post_id": "3", "content_type": "text", "content": "Leadership notes", "metrics": {"likes": 1}},
+]
+
+
+@pytest.fixture
+def analysis_dir(tmp_path):
+    analyzer = ContentAnalyzer(output_dir=str(tmp_path / "analysis"))
+    analyzer.post_data = POSTS
+    analyzer.analyze()
+    analyzer.save_analysis()
+    return tmp_path / "analysis"
+
+
+def count_parses(monkeypatch):
+    calls = []
+    original = dashboard_data._parse_json
+
+    def parse(raw):
+        calls.append(raw)
+        return original(raw)
+
+    monkeypatch.setattr(dashboard_data, "_parse_json", parse)
+    return calls
+
+
+def test_ranked_counts_accepts_saved_objects_and_pairs():
+    assert ranked_counts({"text": 1, "video": 3, "article": 1}) == [("video", 3), ("text", 1), ("article", 1)]
+    assert ranked_counts([["culture", 4], ["hiring", 2]]) == [("culture", 4), ("hiring", 2)]
+    assert ranked_counts(None) == []
+
+
+def test_analysis_job_writes_figures_the_dashboard_uses(analysis_dir, monkeypatch):
+    assert (analysis_dir / FIGURES_FILE).exists()
+    monkeypatch.setattr(dashboard_data, "build_figure_specs", lambda *args: pytest.fail("rebuilt figures"))
+
+    figures = DashboardData(analysis_dir).figures()
+
+    assert figures["content_types"]["data"][0]["type"] == "pie"
+    assert figures["topics"]["layout"]["title"]["text"] == "Top 10 Topics"
+    assert figures["success_rates"]["data"][0]["type"] == "bar"
+
+
+def test_files_are_reparsed_only_when_their_content_changes(analysis_dir, monkeypatch):
+    calls = count_parses(monkeypatch)
+    data = DashboardData(analysis_dir)
+    results_file = analysis_dir / "analysis_results.json"
+
+    first = data.analysis()
+    assert data.analysis() is first and len(calls) == 1
+
+    # Rewritten with the same bytes: new mtime, same hash
+    results_file.write_bytes(results_file.read_bytes())
+    os.utime(results_file, ns=(0, 10 ** 9))
+    assert data.analysis() is first and len(calls) == 1
+
+    results = json.loads(results_file.read_text())
+    results["total_posts"] = 99
+    results_file.write_text(json.dumps(results))
+    assert data.analysis()["total_posts"] == 99 and len(calls) == 2
+
+
+def test_stale_figures_are_rebuilt_once_per_change(analysis_dir):
+    data = DashboardData(analysis_dir)
+    pd.DataFrame([{"content_type": "text", "total_posts": 2, "successful_posts": 2, "success_rate": 100.0}]) \
+        .to_csv(analysis_dir / "success_rates.csv", index=False)
+
+    figures = data.figures()
+    assert list(figures["success_rates"]["data"][0]["x"]) == ["text"]
+    assert data.figures() is figures
+
+    write_figure_specs(analysis_dir)
+    stored = json.loads((analysis_dir / FIGURES_FILE).read_text())
+    assert stored["figures"] == figures
+
+
+def test_missing_files_and_shared_instance(tmp_path):
+    data = get_dashboard_data(tmp_path)
+
+    assert data is get_dashboard_data(tmp_path)
+    assert data.analysis() is None and data.top_posts() is None
+    assert data.figures() == {"content_types": None, "success_rates": None, "topics": None}
@@ -0,0 +1,133 @@
+import random
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.analytics import post_explorer
+from src.analytics.post_explorer import SORTS, PostExplorer, date_filters, get_post_explorer, write_post_index
+from src.analytics.run_analysis import ContentAnalyzer
+
+
+def make_frame(count, seed=0):
+    rng = random.Random(seed)
+    likes = [rng.randint(0, 30) for _ in range(count)]
+    return pd.DataFrame({
+        "post_id": [str(i) for i in range(count)],
+        "content": [f"post {i}" for i in range(count)],
+        "content_type": [rng.choice(["Text", "video", None]) for _ in range(count)],
+        "topic": [rng.choice(["Hiring", "culture ", None]) for _ in range(count)],
+        "date": [rng.choice([f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}", "2025-02-30", None])
+                 for _ in range(count)],
+        "likes": likes,
+        "comments": [0] * count,
+        "shares": [0] * count,
+        "engagement_score": likes
+    })
+
+
+@pytest.fixture
+def explorer(tmp_path):
+    write_post_index(tmp_path / "posts.db", make_frame(300))
+    return PostExplorer(tmp_path / "posts.db")
+
+
+def walk(explorer, page_size=7, **query):
+    ids, cursor = [], None
+    while True:
+        page = explorer.page(after=cursor, page_size=page_size, **query)
+        assert len(page["rows"]) <= page_size
+        ids.extend(row["post_id"] for row in page["rows"])
+        cursor = page["next"]
+        if cursor is None:
+            return ids
+
+
+def expected(frame, sort, keep=None):
+    column, direction = SORTS[sort]
+    table = frame.assign(id=range(1, len(frame) + 1), date=post_explorer._post_dates(frame["date"]))
+    if keep is not None:
+        table = table[keep(table)]
+    ordered = table.sort_values([column, "id"], ascending=direction == "ASC")
+    return ordered["post_id"].tolist()
+
+
+@pytest.mark.parametrize("sort", list(SORTS))
+def test_keyset_pages_cover_every_post_in_order(explorer, sort):
+    assert walk(explorer, sort=sort) == expected(make_frame(300), sort)
+
+
+@pytest.mark.parametrize("probe_limit", [0, 5000])
+def test_filters_match_with_either_index(explorer, monkeypatch, probe_limit):
+    monkeypatch.setattr(post_explorer, "PROBE_LIMIT", probe_limit)
+    frame = make_frame(300)
+    dates = post_explorer._post_dates(frame["date"])
+
+    def keep(table):
+        return ((table["content_type"].str.lower() == "text") & (table["topic"] == "culture ")
+                & (table["date"] >= "2025-03-01") & (table["date"] <= "2025-06-30")
+                & (table["engagement_score"] >= 10))
+
+    for sort in ("score_desc", "date_asc"):
+        ids = walk(explorer, sort=sort, content_type="Text", topic="culture", date_from="2025-03-01",
+                   date_to="2025-06-30", min_score=10)
+        assert ids == expected(frame, sort, keep) and ids
+    assert "2025-02-30" not in set(dates)
+
+
+def test_facets_dates_and_invalid_queries(explorer):
+    facets = explorer.facets()
+
+    assert {value for value, _ in facets["content_type"]} == {"text", "video", "unknown"}
+    assert {value for value, _ in facets["topic"]} == {"hiring", "culture"}
+    assert sum(count for _, count in facets["content_type"]) == 300
+    dates = [day for day in post_explorer._post_dates(make_frame(300)["date"]) if day]
+    assert explorer.date_range() == (min(dates), max(dates))
+    with pytest.raises(ValueError):
+        explorer.page(sort="likes")
+    with pytest.raises(ValueError):
+        explorer.page(page_size=1000)
+
+
+def test_default_date_range_keeps_undated_posts(explorer):
+    first, last = explorer.date_range()
+    full = (date.fromisoformat(first), date.fromisoformat(last))
+    frame = make_frame(300)
+    undated = set(frame["post_id"][post_explorer._post_dates(frame["date"]) == ""])
+    assert undated
+
+    date_from, date_to = date_filters(full, (first, last))
+    default = walk(explorer, sort="date_asc", date_from=date_from, date_to=date_to)
+    assert len(default) == 300 and undated <= set(default)
+
+    narrowed = date_filters((full[0], date(2025, 6, 30)), (first, last))
+    assert narrowed == (first, "2025-06-30")
+    assert not undated & set(walk(explorer, date_from=narrowed[0], date_to=narrowed[1]))
+    assert date_filters(full[0], (first, last)) == (None, None)
+
+def test_slow_queries_time_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(post_explorer, "PROBE_LIMIT", 0)
+    write_post_index(tmp_path / "posts.db", make_frame(20000))
+
+    with pytest.raises(TimeoutError):
+        PostExplorer(tmp_path / "posts.db", timeout_ms=0).page(sort="date_desc", min_score=1000)
+
+
+def test_analysis_job_writes_the_index_and_the_explorer_reopens_it(tmp_path):
+    posts = [{"post_id": str(i), "content": f"post {i}", "content_type": "Text", "topic": "Hiring",
+              "timestamp": f"2025-03-0{i + 1}", "metrics": {"likes": i}} for i in range(3)]
+    analyzer = ContentAnalyzer(output_dir=str(tmp_path))
+    analyzer.post_data = posts
+    analyzer.analyze()
+    analyzer.save_analysis()
+
+    explorer = get_post_explorer(tmp_path)
+    assert explorer is get_post_explorer(tmp_path)
+    assert explorer.page(topic="hiring")["rows"][0] == {
+        "post_id": "2", "date": "2025-03-03", "content_type": "text", "topic": "hiring", "likes": 2,
+        "comments": 0, "shares": 0, "engagement_score": 2.0, "content": "post 2"}
+
+    analyzer.post_data = posts[:1]
+    analyzer.analyze()
+    analyzer.save_analysis()
+    assert [row["post_id"] for row in explorer.page()["rows"]] == ["0"]
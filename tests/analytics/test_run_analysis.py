@@ -0,0 +1,78 @@
+import csv
+import importlib.util
+from pathlib import Path
+
+from src.analytics.run_analysis import ContentAnalyzer
+from src.utils.ingestion import ingest_csv
+
+_BENCH = Path(__file__).resolve().parents[2] / "benchmarks" / "bench_content_analyzer.py"
+_spec = importlib.util.spec_from_file_location("bench_content_analyzer", _BENCH)
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+POSTS = [
+    {"post_id": "1", "content_type": "Text", "content": "Leadership means asking. Leadership, listening!",
+     "metrics": {"likes": 10, "comments": 2, "shares": 1}},
+    {"post_id": "2", "content": "Hiring hiring culture café Σίσυφος 2025 abcd1",
+     "metrics": {"likes": 3, "comments": 9}},
+    {"post_id": "3", "content_type": "text", "content": "", "metrics": {"likes": 10, "comments": 2, "shares": 1}},
+    {"content_type": "video", "content": "These would have been\nthe culture notes"},
+    {"post_id": "5", "content_type": "Video", "metrics": {"likes": 1, "shares": 9}},
+    {"post_id": "6", "content_type": "article", "content": "Culture\tculture", "metrics": {"likes": 10}},
+    {"post_id": "7", "content_type": "text", "content": "Short", "metrics": {"likes": 12, "comments": 1}}
+]
+
+
+def run_both(tmp_path, posts):
+    legacy, _ = bench._run(bench.LegacyContentAnalyzer, posts, tmp_path / "legacy")
+    current, _ = bench._run(ContentAnalyzer, posts, tmp_path / "current")
+    return legacy, current
+
+
+def test_analyze_matches_the_loop_implementation(tmp_path):
+    legacy, current = run_both(tmp_path, POSTS)
+
+    assert bench.same_output(legacy, tmp_path / "legacy", current, tmp_path / "current")
+    assert list(current["content_type_distribution"]) == ["text", "unknown", "video", "article"]
+    assert dict(current["top_topics"])["culture"] == 4
+
+
+def test_analyze_matches_on_a_synthetic_corpus(tmp_path):
+    legacy, current = run_both(tmp_path, bench.make_posts(500, seed=3))
+
+    assert bench.same_output(legacy, tmp_path / "legacy", current, tmp_path / "current")
+
+
+def test_top_posts_keep_file_order_for_ties(tmp_path):
+    _, current = run_both(tmp_path, POSTS)
+
+    with open(tmp_path / "current" / "top_posts.csv", encoding="utf-8") as f:
+        rows = f.read().splitlines()
+    assert [row.split(",")[0] for row in rows[1:]] == ["5", "2", "1", "3", "7"]
+    assert current["average_engagement"]["likes"] == 46 / 7
+
+
+def test_ingested_table_is_analyzed_like_the_equivalent_post_records(tmp_path):
+    header = ["POST_ID", "POST_TEXT", "LIKES", "COMMENTS", "SHARES", "CONTENT_TYPE", "DATE", "TOPIC"]
+    rows = [["1", "Hiring is hard. Really hard.", "3,593", "116", "515", "Text-only", "2025-01-02", "hiring"],
+            ["2", "Culture eaten for breakfast", "40", "", "0", "", "", ""],
+            ["3", "Culture notes", "40", "2", "0", "text-only", "2025-01-03", "culture"]]
+    with open(tmp_path / "posts.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] * len(header))
+        writer.writerow(header)
+        writer.writerows(rows)
+    table, _ = ingest_csv(tmp_path / "posts.csv", tmp_path / "cache")
+
+    from_table = ContentAnalyzer(output_dir=str(tmp_path / "table"))
+    from_table.frame = table
+    from_records = ContentAnalyzer(output_dir=str(tmp_path / "records"))
+    from_records.post_data = [
+        {"post_id": post_id, "content": text, "content_type": content_type, "timestamp": date, "topic": topic,
+         "metrics": {"likes": int(likes.replace(",", "")), "comments": int(comments or 0), "shares": int(shares)}}
+        for post_id, text, likes, comments, shares, content_type, date, topic in rows
+    ]
+
+    assert bench.same_output(from_table.analyze(), tmp_path / "table", from_records.analyze(), tmp_path / "records")
+    assert from_table.scored_posts["date"].tolist() == ["2025-01-02", "", "2025-01-03"]
+    assert from_table.scored_posts["type_key"].tolist() == ["text-only", "", "text-only"]
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops bursts of concurrent connections
+    request_queue_size = 128
+
+
+class StubAnthropicAPI:
+    """Local stand-in for the Messages API that echoes the prompt back after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.error_status = None
+        self.chunk_delay = 0.0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = StubServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append(body)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    stub.respond(self, body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        return Handler
+
+    @staticmethod
+    def reply_text(body) -> str:
+        return f"echo: {body['messages'][-1]['content']}"
+
+    def respond(self, handler, body) -> None:
+        if self.error_status:
+            payload = json.dumps({"type": "error", "error": {"type": "invalid_request_error",
+                                                             "message": "stub error"}}).encode()
+            handler.send_response(self.error_status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+        if body.get("stream"):
+            self.respond_stream(handler, body)
+            return
+        payload = json.dumps({
+            "id": f"msg_{len(self.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": self.reply_text(body)}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 10}
+        }).encode()
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def respond_stream(self, handler, body) -> None:
+        """Send the reply as server-sent events, one word per text delta."""
+        def event(name, data):
+            handler.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+            handler.wfile.flush()
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        event("message_start", {"type": "message_start", "message": {
+            "id": f"msg_{len(self.requests)}", "type": "message", "role": "assistant",
+            "model": body["model"], "content": [], "stop_reason": None, "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 0}}})
+        event("content_block_start", {"type": "content_block_start", "index": 0,
+                                      "content_block": {"type": "text", "text": ""}})
+        for word in self.reply_text(body).split(" "):
+            time.sleep(self.chunk_delay)
+            event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                          "delta": {"type": "text_delta", "text": word + " "}})
+        event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                "usage": {"output_tokens": 10}})
+        event("message_stop", {"type": "message_stop"})
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    """Run a stub Messages API and point the content agents at it."""
+    with StubAnthropicAPI(delay=0.2) as stub:
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("LIFT_ANTHROPIC_BASE_URL", stub.base_url)
+        yield stub
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from src.models.clients import get_client
+from src.models.content_agents import ArticleContentAgent, MediaContentAgent, TextContentAgent
+
+
+def test_agents_share_one_client(stub_api):
+    agents = [TextContentAgent(), MediaContentAgent(), ArticleContentAgent()]
+    assert all(agent.client is get_client(api_key="test-key") for agent in agents)
+
+    assert agents[0].generate_content("Hello").startswith("echo: Hello")
+    assert stub_api.requests[-1]["max_tokens"] == 1000
+
+
+def test_agenerate_content_keeps_many_requests_in_flight(stub_api):
+    stub_api.delay = 0.5
+    agents = [TextContentAgent(), MediaContentAgent(), ArticleContentAgent()]
+
+    async def run():
+        return await asyncio.gather(*(
+            agents[i % 3].agenerate_content(f"post {i}") for i in range(48)
+        ))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert [result.split("\n")[0] for result in results] == [f"echo: post {i}" for i in range(48)]
+    assert {request["max_tokens"] for request in stub_api.requests} == {1000, 2000}
+    # 48 sequential calls would take ~24s against the 0.5s stub
+    assert stub_api.max_in_flight >= 24
+    assert elapsed < 6
+
+
+def test_agenerate_content_reports_api_errors(stub_api):
+    stub_api.error_status = 400
+    result = asyncio.run(TextContentAgent().agenerate_content("Hello"))
+    assert result.startswith("Error generating content:")
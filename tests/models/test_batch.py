@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from src.models.base_agent import BaseAgent
+from src.models.batch import BatchGenerator, TokenBucket
+from src.models.model_interface import ModelInterface
+
+
+class FakeAgent(BaseAgent):
+    """Agent that fails the first ``failures`` calls per prompt, then echoes it."""
+
+    def __init__(self, failures=0, error=ConnectionError, delay=0.02):
+        super().__init__("claude-3-haiku-20240307")
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+        self.calls = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def create_message(self, prompt, context=None):
+        with self._lock:
+            self.calls[context["topic"]] = self.calls.get(context["topic"], 0) + 1
+            attempt = self.calls[context["topic"]]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if attempt <= self.failures:
+                raise self.error("temporary failure")
+            return {"text": f"post about {context['topic']}", "input_tokens": 100,
+                    "output_tokens": 50, "model": self.model_name}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def generate_content(self, prompt, context=None):
+        return self.create_message(prompt, context)["text"]
+
+    def analyze_content(self, content):
+        return {}
+
+
+@pytest.fixture
+def model(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    return ModelInterface()
+
+
+def _items(n):
+    return [{"content_type": "media", "context": {"topic": f"topic {i}", "purpose": "test", "media_type": "image"}}
+            for i in range(n)]
+
+
+def test_batch_respects_concurrency_and_streams_results(model):
+    agent = model.agents["media"] = FakeAgent()
+    generator = BatchGenerator(model, max_concurrency=3)
+
+    results = list(generator.run(_items(12)))
+
+    assert sorted(result["index"] for result in results) == list(range(12))
+    assert all(result["status"] == "ok" for result in results)
+    assert [result["completed"] for result in results] == list(range(1, 13))
+    assert results[0]["total"] == 12
+    assert agent.max_in_flight == 3
+    assert results[0]["cost"] == pytest.approx((100 * 0.25 + 50 * 1.25) / 1_000_000)
+    assert generator.summary()["output_tokens"] == 600
+
+
+def test_batch_retries_transient_errors_only(model):
+    model.agents["media"] = FakeAgent(failures=2)
+    sleeps = []
+    results = list(BatchGenerator(model, max_concurrency=2, max_retries=3, sleep=sleeps.append).run(_items(4)))
+    assert all(result["status"] == "ok" and result["attempts"] == 3 for result in results)
+    assert len(sleeps) == 8 and all(0 <= delay <= 2.0 for delay in sleeps)
+
+    model.agents["media"] = FakeAgent(failures=1, error=ValueError)
+    results = list(BatchGenerator(model, max_retries=3, sleep=lambda _: None).run(_items(2)))
+    assert all(result["status"] == "error" and result["attempts"] == 1 for result in results)
+
+
+def test_batch_reports_invalid_items(model):
+    model.agents["media"] = FakeAgent()
+    items = _items(1) + [{"content_type": "media", "context": {"topic": "missing fields"}}]
+    results = {result["index"]: result for result in BatchGenerator(model).run(items)}
+    assert results[0]["status"] == "ok"
+    assert results[1]["status"] == "error" and "media_type" in results[1]["error"]
+
+
+
+def test_batch_yields_every_result_when_an_item_raises(model, monkeypatch):
+    model.agents["media"] = FakeAgent()
+    prepare_prompt = model.prepare_prompt
+
+    def flaky_prepare_prompt(content_type, context):
+        if context["topic"] == "topic 1":
+            raise KeyError("x")
+        return prepare_prompt(content_type, context)
+
+    monkeypatch.setattr(model, "prepare_prompt", flaky_prepare_prompt)
+    generator = BatchGenerator(model, max_concurrency=2)
+    results = {result["index"]: result for result in generator.run(_items(3) + ["not a dict"])}
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert [results[i]["status"] for i in range(4)] == ["ok", "error", "ok", "error"]
+    assert results[1]["error"] == "KeyError: 'x'" and results[1]["content_type"] == "media"
+    assert results[3]["error"].startswith("AttributeError") and results[3]["id"] == 3
+    assert generator.summary()["failed"] == 2
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=2.0, clock=lambda: now[0], sleep=sleep)
+    waits = [bucket.acquire() for _ in range(6)]
+    assert waits[:2] == [0.0, 0.0]
+    assert now[0] == pytest.approx(2.0)
+    assert not bucket.try_acquire()
@@ -0,0 +1,22 @@
+import asyncio
+
+from src.models.content_agents import TextContentAgent
+from src.utils import response_cache
+
+
+def test_agents_reuse_cached_responses(stub_api, tmp_path, monkeypatch):
+    monkeypatch.setenv("LIFT_RESPONSE_CACHE", "1")
+    monkeypatch.setenv("LIFT_RESPONSE_CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(response_cache, "_cache", None)
+    agent = TextContentAgent()
+
+    first = agent.generate_content("Hello")
+    assert agent.generate_content("Hello") == first
+    assert "".join(agent.stream_content("Hello")) == first
+    assert asyncio.run(agent.agenerate_content("Hello")) == first
+    assert len(stub_api.requests) == 1
+
+    agent.temperature = 0.2
+    agent.generate_content("Hello")
+    assert len(stub_api.requests) == 2
+    assert response_cache.get_response_cache().stats()["hits"] == 3
@@ -0,0 +1,60 @@
+import copy
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from src.models.prompts import CompiledTemplate, PromptTemplates
+
+_BENCH = Path(__file__).resolve().parents[2] / "benchmarks" / "bench_prompt_templates.py"
+_spec = importlib.util.spec_from_file_location("bench_prompt_templates", _BENCH)
+bench = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench)
+
+CONTEXTS = [
+    None,
+    {},
+    {"topic": "Hybrid teams", "tone": ""},
+    {"topic": "Feedback", "authentic_examples": ["First post", "Second post", "3", "4", "5"],
+     "key_points": ["One", "Two"], "content": "Draft 100% done", "content_type": "article",
+     "target_metrics": ["reach"], "media_type": "Video", "brand_voice": "Warm"}
+]
+
+
+@pytest.mark.parametrize("name", bench.TEMPLATES)
+@pytest.mark.parametrize("context", CONTEXTS)
+def test_matches_legacy_output_and_context_defaults(name, context):
+    legacy_context, context = copy.deepcopy(context), copy.deepcopy(context)
+
+    expected = getattr(bench.LegacyPromptTemplates, name)(legacy_context)
+
+    assert getattr(PromptTemplates, name)(context) == expected
+    assert context == legacy_context
+
+
+def test_example_braces_stay_literal():
+    prompt = PromptTemplates.get_text_post_template({"authentic_examples": ["Output went {up} 40%"]})
+
+    assert "Example 1:\nOutput went {up} 40%\n---" in prompt
+    assert "about: Leadership" in prompt
+
+
+def test_compile_rejects_fields_without_defaults():
+    with pytest.raises(ValueError, match="topic"):
+        CompiledTemplate("Write about {topic}")
+    with pytest.raises(ValueError, match="Unsupported"):
+        CompiledTemplate("{brand.voice}", defaults={"brand": {}})
+
+
+def test_missing_required_field_raises():
+    template = CompiledTemplate("{intro} on {topic}", defaults={"topic": "Leadership"}, required=["intro"])
+
+    with pytest.raises(KeyError, match="intro"):
+        template.render({})
+    assert template.render({}, intro="Notes") == "Notes on Leadership"
+
+
+def test_format_specs_and_conversions():
+    template = CompiledTemplate("{score:.1f} {name!r} {name}", defaults={"score": 0.25, "name": "x"})
+
+    assert template.render({"score": 3.14159}) == "3.1 'x' x"
@@ -0,0 +1,42 @@
+from src.models.content_agents import TextContentAgent
+
+
+def test_stream_content_yields_deltas_and_records_latency(stub_api):
+    stub_api.delay = 0.0
+    stub_api.chunk_delay = 0.01
+    agent = TextContentAgent()
+
+    deltas = list(agent.stream_content("one two three"))
+
+    assert len(deltas) > 3
+    assert "".join(deltas).startswith("echo: one two three")
+    assert stub_api.requests[-1]["stream"] is True
+    metrics = agent.stream_metrics[-1]
+    assert 0 < metrics["time_to_first_token"] < metrics["total_latency"]
+    assert metrics["characters"] == len("".join(deltas))
+
+
+def test_stream_content_reports_api_errors(stub_api):
+    stub_api.error_status = 400
+    agent = TextContentAgent()
+
+    deltas = list(agent.stream_content("Hello"))
+
+    assert deltas[-1].startswith("Error generating content:")
+    assert agent.stream_metrics[-1]["total_latency"] > 0
+
+
+def test_each_stream_reports_its_own_metrics_on_a_shared_agent(stub_api):
+    stub_api.delay = 0.0
+    stub_api.chunk_delay = 0.0
+    agent = TextContentAgent()
+    short, long = [], []
+
+    first = agent.stream_content("short", on_metrics=short.append)
+    second = agent.stream_content("a much longer prompt", on_metrics=long.append)
+    first_text = "".join(first)
+    second_text = "".join(second)
+
+    assert short[0]["characters"] == len(first_text)
+    assert long[0]["characters"] == len(second_text) != len(first_text)
+    assert agent.stream_metrics[-1] is long[0]
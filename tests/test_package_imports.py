@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_model_interface_does_not_load_analytics_dependencies():
+    loaded = run(
+        "import sys\n"
+        "from src.models.model_interface import ModelInterface\n"
+        "print(','.join(m for m in ('sklearn', 'pandas', 'linkedin_api', 'nltk') if m in sys.modules))"
+    )
+    assert loaded == ""
+
+
+def test_public_names_resolve_lazily_to_the_same_objects():
+    output = run(
+        "import sys\n"
+        "import src, src.utils\n"
+        "assert 'src.utils.feedback_loop' not in sys.modules\n"
+        "from src.utils.feedback_loop import FeedbackLoop\n"
+        "from src.utils.brand_knowledge import BrandKnowledge\n"
+        "assert src.FeedbackLoop is FeedbackLoop and src.utils.FeedbackLoop is FeedbackLoop\n"
+        "assert isinstance(src.utils.brand_knowledge, BrandKnowledge)\n"
+        "from src.utils import ContentEvaluator, response_cache\n"
+        "assert set(src.utils.__all__) <= set(dir(src.utils))\n"
+        "print(ContentEvaluator.__module__, response_cache.__name__)"
+    )
+    assert output.splitlines()[-1] == "src.utils.evaluation src.utils.response_cache"
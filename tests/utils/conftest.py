@@ -0,0 +1,28 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def nlp():
+    """The evaluator's spaCy pipeline, or a blank English pipeline with a sentencizer."""
+    spacy = pytest.importorskip("spacy")
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        blank = spacy.blank("en")
+        blank.add_pipe("sentencizer")
+        return blank
+
+
+@pytest.fixture
+def evaluator(nlp, tmp_path, monkeypatch):
+    """A ContentEvaluator writing to a temporary feedback file."""
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("tokenizers/punkt")
+        nltk.data.find("corpora/stopwords")
+    except LookupError:
+        pytest.skip("NLTK punkt/stopwords data not installed")
+
+    from src.utils import evaluation
+    monkeypatch.setattr(evaluation, "get_spacy_model", lambda name: nlp)
+    return evaluation.ContentEvaluator(feedback_file=str(tmp_path / "feedback.json"))
@@ -0,0 +1,108 @@
+import json
+
+import numpy as np
+
+from src.utils.ann_index import ExactSearch, IVFIndex
+from src.utils.embedding_index import EmbeddingIndex, normalize_rows
+
+VOCAB = ["hiring", "sales", "leadership", "culture"]
+
+
+def encode(texts):
+    return np.array([[text.lower().count(word) + 0.1 for word in VOCAB] for text in texts], dtype=np.float32)
+
+
+def clustered(rows=2000, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = normalize_rows(rng.standard_normal((20, dim)))
+    return normalize_rows(centres[rng.integers(0, 20, rows)] + 0.3 * rng.standard_normal((rows, dim)))
+
+
+def test_ivf_matches_exact_search_when_probing_every_list():
+    matrix = clustered()
+    ivf = IVFIndex.build(matrix, n_lists=16, seed=1)
+    exact = ExactSearch(matrix)
+    query = matrix[7]
+
+    assert ivf.search(query, 10, n_probe=16) == exact.search(query, 10)
+    assert sorted(ivf.ids.tolist()) == list(range(len(matrix)))
+
+
+def test_ivf_recall_at_k_against_exact_search():
+    matrix = clustered()
+    ivf = IVFIndex.build(matrix, n_lists=32, n_probe=8, seed=1)
+    exact = ExactSearch(matrix)
+
+    found = total = 0
+    for query in matrix[:50]:
+        truth = set(exact.search(query, 5))
+        found += len(truth & set(ivf.search(query, 5)))
+        total += len(truth)
+
+    assert found / total >= 0.9
+
+
+def test_ivf_filters_only_return_eligible_rows():
+    matrix = clustered()
+    ivf = IVFIndex.build(matrix, n_lists=16, n_probe=2, seed=1)
+    mask = np.zeros(len(matrix), dtype=bool)
+    mask[::50] = True
+
+    result = ivf.search(matrix[3], 5, mask=mask)
+
+    assert result == ExactSearch(matrix).search(matrix[3], 5, mask=mask)
+    assert all(mask[i] for i in result)
+
+
+def test_save_and_load_memory_maps_vectors(tmp_path):
+    matrix = clustered(rows=300)
+    ivf = IVFIndex.build(matrix, n_lists=8, n_probe=3)
+    ivf.save(tmp_path / "posts")
+
+    loaded = IVFIndex.load(tmp_path / "posts")
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.n_probe == 3
+    assert loaded.search(matrix[0], 4) == ivf.search(matrix[0], 4)
+    assert IVFIndex.load(tmp_path / "missing") is None
+
+
+def write_posts(path):
+    posts = [
+        {"post_id": "0", "content": "Hiring hiring", "metadata": {"topic": "Hiring", "content_type": "text-only",
+                                                                  "posting_date": "2025-04-28"}},
+        {"post_id": "1", "content": "Hiring sales", "metadata": {"topic": "Sales", "content_type": "text w/image",
+                                                                 "posting_date": "2025-05-10"}},
+        {"post_id": "2", "content": "Hiring culture", "metadata": {"topic": "Culture", "content_type": "text-only",
+                                                                   "posting_date": "2025-06-01"}},
+        {"post_id": "3", "content": "Leadership", "metadata": {"topic": "Hiring"}}
+    ]
+    path.write_text(json.dumps({"authentic_posts": posts}), encoding="utf-8")
+
+
+def test_embedding_index_metadata_filters(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path)
+    index = EmbeddingIndex(posts_path, tmp_path / "index", backend="exact").ensure(encode)
+    query = encode(["hiring"])
+
+    assert index.search(query, 4)[0] == 0
+    assert index.search(query, 4, topic="hiring") == [0, 3]
+    assert index.search(query, 4, content_type=["TEXT W/IMAGE"]) == [1]
+    assert index.search(query, 4, since="2025-05-01", until="2025-05-31") == [1]
+    assert index.search(query, 4, topic="hiring", since="2025-01-01") == [0]
+
+
+def test_embedding_index_uses_prebuilt_ivf_index(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path)
+    index = EmbeddingIndex(posts_path, tmp_path / "index", backend="ivf").ensure(encode)
+    assert isinstance(index.backend, ExactSearch)
+
+    IVFIndex.build(index.matrix, n_lists=2, n_probe=2).save(index.base_path)
+    reopened = EmbeddingIndex(posts_path, tmp_path / "index", backend="ivf").ensure(encode)
+
+    assert isinstance(reopened.backend, IVFIndex)
+    assert reopened.search(encode(["hiring"]), 2, topic="Hiring") == index.search(encode(["hiring"]), 2,
+                                                                                 topic="Hiring")
+    assert len(list((tmp_path / "index").glob("*.ivf.*"))) == 2
@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+
+from src.utils import retrieval
+from src.utils.bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+
+POSTS = [
+    "Hiring is hard. Coachability beats a closing percentage.",
+    "Running a marathon taught me about running a business.",
+    "Onboarding plans make new hires productive faster. Hiring well starts with onboarding.",
+    "Notion keeps our strategy in one place."
+]
+
+
+def write_posts(path, contents):
+    posts = [{"post_id": str(i), "content": content, "metadata": {"topic": "general"}}
+             for i, content in enumerate(contents)]
+    path.write_text(json.dumps({"authentic_posts": posts}), encoding="utf-8")
+
+
+def test_tokenize_drops_stopwords_and_hashtag_marks():
+    assert tokenize("The #StrategicHiring of it is hard!") == ["strategichiring", "hard"]
+
+
+def test_search_ranks_by_bm25_and_skips_non_matches(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, POSTS)
+    index = BM25Index(posts_path, tmp_path / "index").ensure()
+
+    assert index.search("hiring onboarding", top_k=4) == [2, 0]
+    assert index.search("running", top_k=4) == [1]
+    assert index.search("kubernetes", top_k=4) == []
+    assert index.search("hiring", top_k=4, mask=np.array([False, True, True, True])) == [2]
+
+
+def test_index_is_persisted_and_rebuilt_when_posts_change(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, POSTS)
+    built = BM25Index(posts_path, tmp_path / "index").ensure()
+
+    loaded = BM25Index(posts_path, tmp_path / "index")
+    loaded.ensure()
+    assert np.array_equal(loaded.weights, built.weights)
+    assert loaded.search("hiring", 2) == built.search("hiring", 2)
+
+    write_posts(posts_path, POSTS + ["Kubernetes for founders"])
+    loaded.ensure()
+    assert loaded.search("kubernetes", 2) == [4]
+    assert len(list((tmp_path / "index").glob("*.npz"))) == 1
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    assert reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]]) == [1, 3, 2, 4]
+    assert reciprocal_rank_fusion([[5], []], top_k=1) == [5]
+
+
+def test_keyword_retrieval_fills_up_with_corpus_order(tmp_path, monkeypatch):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, POSTS)
+    monkeypatch.setattr(retrieval, "INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(retrieval, "_bm25_indexes", {})
+
+    assert retrieval.retrieve_keyword_posts("marathon", top_k=2, posts_path=posts_path) == [POSTS[1], POSTS[0]]
+
+
+def test_relevant_posts_fuse_semantic_and_keyword_rankings(tmp_path, monkeypatch):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, POSTS)
+    vocab = ["business", "hiring", "strategy"]
+    monkeypatch.setattr(retrieval, "_HAS_ST", True)
+    monkeypatch.setattr(retrieval, "_encode", lambda texts: np.array(
+        [[text.lower().count(word) + 0.01 for word in vocab] for text in texts], dtype=np.float32))
+    monkeypatch.setattr(retrieval, "INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(retrieval, "_indexes", {})
+    monkeypatch.setattr(retrieval, "_bm25_indexes", {})
+
+    semantic = retrieval.retrieve_relevant_posts("business strategy", top_k=2, posts_path=posts_path, fusion=False)
+    fused = retrieval.retrieve_relevant_posts("business strategy", top_k=2, posts_path=posts_path, fusion=True)
+
+    assert semantic[0] in (POSTS[1], POSTS[3])
+    assert set(fused) == {POSTS[1], POSTS[3]}
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+
+from src.utils.brand_knowledge import BrandKnowledge
+
+
+def _legacy_enrich_context(brief, context):
+    """The uncached BrandKnowledge.enrich_context, kept for comparison."""
+    enriched = context.copy()
+    enriched['brand'] = {
+        'company_name': brief.get('company_info', {}).get('name', ''),
+        'tagline': brief.get('company_info', {}).get('tagline', ''),
+        'voice': brief.get('brand_voice', {}).get('tone', ''),
+        'primary_audience': brief.get('target_audience', {}).get('primary', ''),
+        'key_messages': brief.get('key_messages', []),
+        'values': brief.get('values', []),
+        'unique_selling_points': brief.get('unique_selling_points', [])
+    }
+    enriched['audience'] = {
+        'primary': brief.get('target_audience', {}).get('primary', ''),
+        'pain_points': brief.get('target_audience', {}).get('pain_points', []),
+        'goals': brief.get('target_audience', {}).get('goals', [])
+    }
+    if not enriched.get('industry'):
+        enriched['industry'] = 'Leadership Development'
+    if not enriched.get('tone'):
+        enriched['tone'] = brief.get('brand_voice', {}).get('tone', '')
+    if not enriched.get('hashtags'):
+        enriched['hashtags'] = brief.get('content_strategy', {}).get('engagement', {}).get('hashtags', [])
+    return enriched
+
+
+BRIEF = {
+    "company_info": {"name": "LIFT", "tagline": "Lead higher"},
+    "brand_voice": {"tone": "warm"},
+    "target_audience": {"primary": "managers", "pain_points": ["burnout"], "goals": ["growth"]},
+    "key_messages": ["Leaders are made"],
+    "values": ["Trust"],
+    "content_strategy": {"engagement": {"hashtags": ["#leadership"]}}
+}
+
+
+def _write(path, brief):
+    path.write_text(json.dumps(brief))
+
+
+def test_enrich_context_matches_legacy_and_does_not_touch_caller(tmp_path):
+    path = tmp_path / "brand_brief.json"
+    _write(path, BRIEF)
+    knowledge = BrandKnowledge(str(path), check_interval=0)
+
+    for context in [{}, {"topic": "x", "tone": ""}, {"tone": "bold", "hashtags": ["#mine"], "brand": "old"}]:
+        view = knowledge.enrich_context(context)
+        assert dict(view) == _legacy_enrich_context(BRIEF, context)
+        snapshot = dict(context)
+        view["topic"] = "changed"
+        assert context == snapshot
+    assert "{brand[company_name]} / {tone}".format(**knowledge.enrich_context({})) == "LIFT / warm"
+
+
+def test_brand_guidance_is_compiled_once_and_reloaded_on_change(tmp_path):
+    path = tmp_path / "brand_brief.json"
+    _write(path, BRIEF)
+    knowledge = BrandKnowledge(str(path), check_interval=0)
+    versions = []
+    knowledge.subscribe(versions.append)
+
+    prompt = knowledge.format_brand_prompt("Write a post")
+    assert "Company: LIFT" in prompt and "- burnout" in prompt
+    for _ in range(100):
+        assert knowledge.format_brand_prompt("Write a post") is not None
+    assert knowledge.version == 1
+
+    # Touching the file without changing it only costs a hash check
+    os.utime(path, ns=(0, 1_000_000_000))
+    knowledge.enrich_context({})
+    assert knowledge.version == 1
+
+    _write(path, {**BRIEF, "company_info": {"name": "LIFT 2"}})
+    os.utime(path, ns=(0, 2_000_000_000))
+    assert "Company: LIFT 2" in knowledge.format_brand_prompt("Write a post")
+    assert knowledge.enrich_context({})["brand"]["company_name"] == "LIFT 2"
+    assert knowledge.version == 2 and versions == [2]
+
+
+def test_unparseable_brief_keeps_previous_version(tmp_path):
+    path = tmp_path / "brand_brief.json"
+    _write(path, BRIEF)
+    knowledge = BrandKnowledge(str(path), check_interval=0)
+
+    path.write_text('{"company_info": {"name": "half-writ')
+    os.utime(path, ns=(0, 3_000_000_000))
+    assert knowledge.get_company_info()["name"] == "LIFT"
+    assert knowledge.version == 1
+
+    _write(path, {**BRIEF, "company_info": {"name": "Fixed"}})
+    os.utime(path, ns=(0, 4_000_000_000))
+    assert knowledge.get_company_info()["name"] == "Fixed"
+    assert knowledge.version == 2
+
+
+def test_watcher_swaps_in_new_brief(tmp_path):
+    path = tmp_path / "brand_brief.json"
+    _write(path, BRIEF)
+    knowledge = BrandKnowledge(str(path), check_interval=3600)
+    reloaded = threading.Event()
+    knowledge.subscribe(lambda version: reloaded.set())
+    knowledge.start_watching(interval=0.02)
+    try:
+        _write(path, {**BRIEF, "company_info": {"name": "Watched"}})
+        os.utime(path, ns=(0, 5_000_000_000))
+        assert reloaded.wait(5)
+        assert knowledge.get_company_info()["name"] == "Watched"
+    finally:
+        knowledge.stop_watching()
+
+
+def test_forced_reload_waits_for_a_reload_in_progress(tmp_path):
+    path = tmp_path / "brand_brief.json"
+    _write(path, BRIEF)
+    knowledge = BrandKnowledge(str(path), check_interval=3600)
+    results = []
+
+    knowledge._lock.acquire()
+    forced = threading.Thread(target=lambda: results.append(knowledge.reload(force=True)))
+    forced.start()
+    assert knowledge.reload() is False
+    forced.join(0.1)
+    assert forced.is_alive()
+    knowledge._lock.release()
+    forced.join(5)
+
+    assert results == [True] and knowledge.version == 2
+
+def test_missing_brief_leaves_prompt_unchanged(tmp_path):
+    knowledge = BrandKnowledge(str(tmp_path / "missing.json"))
+    assert knowledge.format_brand_prompt("Write a post") == "Write a post"
+    assert knowledge.get_full_brief() == {}
+
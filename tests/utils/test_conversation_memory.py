@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from src.utils.conversation_memory import ConversationMemory, ConversationStore
+from src.utils.tokens import count_tokens
+
+
+def chat(memory, turns):
+    for i in range(turns):
+        memory.append("user", f"Question {i} about hiring. Please add more detail on point {i}, with examples from our last three hiring rounds.")
+        memory.append("assistant", f"Answer {i} is to hire slowly. Then explain the reasons behind {i} to every hiring manager on the team.")
+
+
+def test_keeps_recent_turns_verbatim_and_summarizes_the_rest(tmp_path):
+    memory = ConversationMemory(tmp_path / "chat.jsonl", max_turns=2, token_budget=1000, summary_tokens=96)
+    chat(memory, 5)
+
+    assert [m["content"][:10] for m in memory.messages] == ["Question 3", "Answer 3 i", "Question 4", "Answer 4 i"]
+    assert memory.summary.splitlines()[0] == "User: Question 0 about hiring. …"
+    assert "Assistant: Answer 2 is to hire slowly. …" in memory.summary
+
+    history = memory.format_history()
+    assert history.startswith("Summary of the earlier conversation:\nUser: Question 0")
+    assert "Recent messages:\nUser: Question 3 about hiring." in history
+
+
+def test_history_stays_within_the_token_budget(tmp_path):
+    memory = ConversationMemory(tmp_path / "chat.jsonl", max_turns=10, token_budget=150)
+    chat(memory, 40)
+
+    assert count_tokens(memory.format_history()) <= 150
+    assert count_tokens(memory.summary) <= memory.summary_tokens
+    assert "Answer 39" in memory.messages[-1]["content"]
+    # The rolling summary drops the oldest turns first
+    assert "Question 0 " not in memory.summary and "Answer 3" in memory.summary
+
+
+def test_reloads_lazily_from_the_append_only_file(tmp_path):
+    path = tmp_path / "history" / "chat.jsonl"
+    memory = ConversationMemory(path, max_turns=2, token_budget=1000)
+    chat(memory, 3)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+
+    reloaded = ConversationMemory(path, max_turns=2, token_budget=1000)
+    assert reloaded._messages is None
+    assert reloaded.messages == memory.messages and reloaded.summary == memory.summary
+
+    lines = path.read_text(encoding="utf-8").splitlines()[:-1]
+    assert lines[0] == ('{"role":"user","content":"Question 0 about hiring. Please add more detail on point 0, '
+                        'with examples from our last three hiring rounds."}')
+    assert len(lines) == 7 and sum(1 for line in lines if "summary" in json.loads(line)) == 1
+
+
+def test_compacts_the_file_when_folded_lines_dominate(tmp_path):
+    path = tmp_path / "chat.jsonl"
+    memory = ConversationMemory(path, max_turns=1, token_budget=1000)
+    chat(memory, 30)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 4 * (len(memory.messages) + 1)
+    reloaded = ConversationMemory(path, max_turns=1, token_budget=1000)
+    assert reloaded.messages == memory.messages and reloaded.summary == memory.summary
+
+
+def test_custom_summarizer_and_failure_fallback(tmp_path):
+    calls = []
+
+    def summarizer(summary, messages, max_tokens):
+        calls.append(len(messages))
+        return f"{summary} +{len(messages)}".strip()
+
+    memory = ConversationMemory(tmp_path / "a.jsonl", max_turns=1, token_budget=1000, summarizer=summarizer)
+    chat(memory, 3)
+    assert memory.summary == "+2 +2" and calls == [2, 2]
+
+    def broken(summary, messages, max_tokens):
+        raise RuntimeError("model unavailable")
+
+    memory = ConversationMemory(tmp_path / "b.jsonl", max_turns=1, token_budget=1000, summarizer=broken)
+    chat(memory, 2)
+    assert memory.summary.startswith("User: Question 0")
+
+
+def test_store_keeps_one_file_per_agent_and_clear_removes_it(tmp_path):
+    store = ConversationStore("abc123", history_dir=tmp_path, max_turns=2)
+    memory = store.get("LinkedIn Content Creator")
+    assert store.get("LinkedIn Content Creator") is memory
+    memory.append("user", "Hi")
+
+    assert memory.path == tmp_path / "abc123-linkedin-content-creator.jsonl" and memory.path.exists()
+    assert store.get("Article Writer").messages == []
+
+    memory.clear()
+    assert memory.messages == [] and memory.format_history() == "" and not memory.path.exists()
+
+    with pytest.raises(ValueError):
+        ConversationStore("../etc", history_dir=tmp_path)
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+
+from src.utils.embedding_index import EmbeddingIndex
+
+VOCAB = ["hiring", "sales", "leadership", "culture"]
+
+
+class CountingEncoder:
+    """Bag-of-words encoder that records how many texts it was asked to encode."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def __call__(self, texts):
+        self.encoded += len(texts)
+        return np.array([[text.lower().count(word) for word in VOCAB] for text in texts], dtype=np.float32)
+
+
+def write_posts(path, contents):
+    posts = [{"post_id": str(i), "content": content} for i, content in enumerate(contents)]
+    path.write_text(json.dumps({"authentic_posts": posts}), encoding="utf-8")
+
+
+def test_index_is_built_once_and_reused_across_instances(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, ["Hiring is hard", "Sales leadership", "Culture eats strategy"])
+    encoder = CountingEncoder()
+
+    index = EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+    assert encoder.encoded == 3
+    assert index.matrix.dtype == np.float32
+    assert isinstance(index.matrix, np.memmap)
+
+    index.ensure(encoder)
+    EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+    assert encoder.encoded == 3
+
+    manifest = json.loads(next((tmp_path / "index").glob("*.json")).read_text())
+    assert manifest["post_ids"] == ["0", "1", "2"]
+
+
+def test_index_rebuilds_when_posts_change(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, ["Hiring is hard", "Sales leadership"])
+    encoder = CountingEncoder()
+    index = EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+
+    write_posts(posts_path, ["Hiring is hard", "Sales leadership", "Culture matters"])
+    index.ensure(encoder)
+
+    # Only the new post is encoded; the other two are reused
+    assert encoder.encoded == 3
+    assert len(index.posts) == 3
+    assert len(list((tmp_path / "index").glob("*.npy"))) == 1
+
+
+def test_search_orders_by_cosine_similarity(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, ["Culture", "Hiring hiring sales", "Sales sales", "Leadership"])
+    encoder = CountingEncoder()
+    index = EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+
+    ranked = index.search(encoder(["sales"]), top_k=2)
+
+    assert ranked == [2, 1]
+
+
+def test_rebuild_only_encodes_new_or_changed_posts(tmp_path):
+    posts_path = tmp_path / "authentic_posts.json"
+    write_posts(posts_path, ["Hiring is hard", "Sales leadership", "Culture eats strategy"])
+    encoder = CountingEncoder()
+    index = EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+    before = {index.posts[i]["content"]: np.array(index.matrix[i]) for i in range(3)}
+
+    write_posts(posts_path, ["Sales leadership", "Hiring is hard", "Culture eats lunch", "New post on sales"])
+    index.ensure(encoder)
+
+    assert encoder.encoded == 3 + 2
+    assert index.last_update == {"reused": 2, "encoded": 2, "dropped": 1}
+    assert np.array_equal(index.matrix[0], before["Sales leadership"])
+    assert np.array_equal(index.matrix[1], before["Hiring is hard"])
+    assert np.allclose(index.matrix[3], np.array([0, 1, 0, 0], dtype=np.float32))
+    manifest = json.loads(next((tmp_path / "index").glob("*.json")).read_text())
+    assert len(manifest["content_hashes"]) == 4
+
+    EmbeddingIndex(posts_path, tmp_path / "index").ensure(encoder)
+    assert encoder.encoded == 5
@@ -0,0 +1,22 @@
+SAMPLES = [
+    ("Are you ready to transform your team? Join us today and learn how.", "text"),
+    ("This image shows a vibrant chart in the background.\n\nWe display the results.", "media"),
+    ("Research shows 40% of leaders struggle.\n\nHowever, data suggests a clear trend.", "article"),
+]
+
+
+def test_evaluate_many_matches_evaluate_content_in_order(evaluator):
+    contents = [content for content, _ in SAMPLES]
+    content_types = [content_type for _, content_type in SAMPLES]
+
+    batched = evaluator.evaluate_many(contents, content_types, batch_size=2, store_metrics=False)
+    single = [evaluator.evaluate_content(content, content_type) for content, content_type in SAMPLES]
+
+    assert batched == single
+
+
+def test_evaluate_many_stores_metrics_once_per_item(evaluator):
+    evaluator.evaluate_many([content for content, _ in SAMPLES], "text")
+
+    history = evaluator.get_metrics_history()
+    assert [entry["content_type"] for entry in history] == ["text"] * len(SAMPLES)
@@ -0,0 +1,62 @@
+import csv
+
+import pandas as pd
+
+from src.utils import ingestion
+from src.utils.ingestion import ingest_csv, load_posts_frame
+
+HEADER = ["POST_ID", "POST_TEXT", "LIKES", "COMMENTS", "SHARES", "CONTENT_TYPE", "ENGAGEMENT_RATE"]
+ROWS = [
+    ["1", "Hiring is hard.\n\nReally hard.", "3,593", "116", "515", "text-only", "1.05"],
+    ["2", "Culture, eaten for breakfast", "n/a", "2", "0", "text w/image", "0.2"],
+    ["3", "Short one", "17", "", "0", "text-only", "0.75"],
+    ["4", "Too few fields", "1"],
+    ["5", "Notion keeps our strategy in one place", "1,521", "151", "89", "text w/video", ""]
+]
+
+
+def write_csv(path, rows=ROWS):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] * len(HEADER))
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def test_ingest_types_columns_and_rejects_bad_rows(tmp_path):
+    csv_path = tmp_path / "posts.csv"
+    write_csv(csv_path)
+
+    frame, report = ingest_csv(csv_path, tmp_path / "cache", chunksize=2)
+
+    assert frame["POST_ID"].tolist() == ["1", "3", "5"]
+    assert frame["LIKES"].tolist() == [3593, 17, 1521]
+    assert frame["COMMENTS"].tolist() == [116, 0, 151]
+    assert frame["LIKES"].dtype == "int64" and frame["ENGAGEMENT_RATE"].dtype == "float64"
+    assert frame["POST_TEXT"][0] == "Hiring is hard.\n\nReally hard."
+
+    assert report["rows"] == 3 and report["rejected"] == 2
+    with open(report["reject_path"], newline="", encoding="utf-8") as f:
+        rejects = list(csv.reader(f))
+    assert rejects[0][:2] == ["_LINE", "_REASON"]
+    assert [row[:2] for row in rejects[1:]] == [["6", "LIKES: 'n/a'"], ["8", "expected 7 fields, got 3"]]
+
+
+def test_cache_round_trips_and_is_reused_until_csv_changes(tmp_path, monkeypatch):
+    csv_path = tmp_path / "posts.csv"
+    cache_dir = tmp_path / "cache"
+    write_csv(csv_path)
+    monkeypatch.setattr(ingestion, "_frames", {})
+
+    built = load_posts_frame(csv_path, cache_dir)
+    monkeypatch.setattr(ingestion, "_frames", {})
+    monkeypatch.setattr(ingestion, "ingest_csv", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError))
+    loaded = load_posts_frame(csv_path, cache_dir)
+    pd.testing.assert_frame_equal(loaded, built)
+
+    monkeypatch.undo()
+    monkeypatch.setattr(ingestion, "_frames", {})
+    write_csv(csv_path, ROWS[:1])
+    assert load_posts_frame(csv_path, cache_dir)["POST_ID"].tolist() == ["1"]
+    assert len(list(cache_dir.glob("*.npz"))) == 1
+    assert not list(cache_dir.glob("*rejects.csv"))
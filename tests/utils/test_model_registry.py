@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.model_registry import ModelRegistry
+
+
+def test_concurrent_get_loads_model_once():
+    registry = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("slow", loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(model) for model in results}) == 1
+    assert registry.load_timings()["slow"] >= 0.05
+
+
+def test_warm_skips_failures_and_unknown_keys_raise():
+    registry = ModelRegistry()
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ImportError("package missing")
+
+    registry.register("broken", broken)
+    registry.register("ok", lambda: "model")
+
+    registry.warm()
+    registry.warm()
+
+    assert registry.is_loaded("ok")
+    assert not registry.is_loaded("broken")
+    assert len(attempts) == 1
+    with pytest.raises(KeyError):
+        registry.get("missing")
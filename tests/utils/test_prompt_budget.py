@@ -0,0 +1,104 @@
+import pytest
+
+from src.utils.prompt_budget import PromptAssembler, summarize_to_tokens, truncate_to_tokens
+from src.utils.prompt_tuning import PromptTuner
+from src.utils.tokens import count_tokens
+
+LONG_POST = ("Leadership is a practice, not a title. " * 3 +
+             "Every week I ask my team one question and then I stop talking for a while.")
+
+
+def test_count_tokens_tracks_words_and_punctuation():
+    assert count_tokens("") == 0
+    assert count_tokens("Hello world, this is a test.") == 8
+    assert count_tokens("internationalization") > count_tokens("leader")
+
+
+def test_truncate_and_summarize_fit_the_limit():
+    truncated = truncate_to_tokens(LONG_POST, 12)
+    summary = summarize_to_tokens(LONG_POST, 20)
+
+    assert truncated.endswith("…") and count_tokens(truncated) <= 12
+    assert summary.startswith("Leadership is a practice, not a title.")
+    assert summary.endswith("…") and count_tokens(summary) <= 20
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_drop_keeps_most_relevant_items_in_original_order():
+    items = ["alpha one two three", "beta one two three", "gamma one two three"]
+    assembler = PromptAssembler(max_tokens=count_tokens("Write a post.\n") + 14)
+    assembler.add("base", "Write a post.\n", required=True)
+    assembler.add_items("examples", items, relevance=[0.1, 0.9, 0.5], strategy="drop",
+                        item_format="{number}. {item}\n")
+
+    prompt, report = assembler.assemble()
+
+    assert prompt == "Write a post.\n1. beta one two three\n2. gamma one two three\n"
+    assert report["sections"]["examples"]["dropped"] == 1
+    assert report["used"] <= report["budget"] and not report["over_budget"]
+
+
+def test_text_template_budget_trims_examples():
+    from src.models.prompts import PromptTemplates
+
+    full = PromptTemplates.get_text_post_template({"authentic_examples": [LONG_POST] * 4})
+    context = {"authentic_examples": [LONG_POST] * 4}
+    roomy = PromptTemplates.get_text_post_template(dict(context), token_budget=100000)
+    bounded = PromptTemplates.get_text_post_template(context, token_budget=250, reserved_tokens=20)
+
+    assert roomy == full
+    assert len(bounded) < len(full) and "Example 1:" in bounded
+    assert context["prompt_budget"]["used"] + 20 <= 250
+
+
+def test_summarize_shortens_items_before_dropping_them():
+    assembler = PromptAssembler(max_tokens=40, reserved_tokens=5)
+    assembler.add_items("examples", [LONG_POST, LONG_POST], strategy="summarize", header="Examples:\n",
+                        item_format="- {item}\n")
+
+    prompt, report = assembler.assemble()
+
+    section = report["sections"]["examples"]
+    assert section["summarized"] >= 1
+    assert section["kept"] + section["dropped"] == 2
+    assert report["used"] + report["reserved"] <= report["budget"]
+    assert prompt.startswith("Examples:\n- Leadership is a practice")
+
+
+def test_required_sections_are_kept_and_reported_over_budget():
+    assembler = PromptAssembler(max_tokens=5)
+    assembler.add("base", LONG_POST, required=True)
+    assembler.add_items("feedback", ["tone: warmer"], strategy="truncate")
+
+    prompt, report = assembler.assemble()
+
+    assert prompt == LONG_POST
+    assert report["over_budget"]
+    assert report["sections"]["feedback"]["kept"] == 0
+
+
+def test_invalid_sections_are_rejected():
+    assembler = PromptAssembler(max_tokens=100)
+    with pytest.raises(ValueError):
+        assembler.add_items("examples", ["a"], strategy="shuffle")
+    with pytest.raises(ValueError):
+        assembler.add_items("examples", ["a", "b"], relevance=[1.0])
+    assembler.add("base", "x")
+    with pytest.raises(ValueError):
+        assembler.add("base", "y")
+
+
+def test_adapt_prompt_fits_examples_and_feedback_into_budget(tmp_path):
+    tuner = PromptTuner(examples_file=str(tmp_path / "examples.json"), evaluator=object())
+    for score in (0.85, 0.95, 0.9):
+        tuner.add_example(LONG_POST * 3, "text", {"engagement": score}, {"topic": f"topic {score}"})
+
+    unbounded = tuner.adapt_prompt("Base prompt.", "text", feedback={"tone": "warmer"}, token_budget=100000)
+    bounded = tuner.adapt_prompt("Base prompt.", "text", feedback={"tone": "warmer"}, token_budget=250)
+
+    assert unbounded.count("Example ") == 3 and len(bounded) < len(unbounded)
+    assert bounded.startswith("Base prompt.") and "- tone: warmer" in bounded
+    report = tuner.last_budget_report
+    assert report["used"] <= 250
+    assert report["sections"]["examples"]["summarized"] + report["sections"]["examples"]["dropped"] > 0
+    assert tuner.get_adaptation_history("text")[-1]["budget"] == report
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.utils.response_cache import ResponseCache
+
+
+def _response(text):
+    return {"text": text, "input_tokens": 1000, "output_tokens": 200}
+
+
+def test_exact_hits_misses_and_savings(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.db")
+    model = "claude-3-haiku-20240307"
+
+    assert cache.get(model, 0.7, "prompt", 1000) is None
+    cache.put(model, 0.7, "prompt", _response("answer"), 1000)
+
+    assert cache.get(model, 0.7, "prompt", 1000)["text"] == "answer"
+    assert cache.get(model, 0.9, "prompt", 1000) is None
+    assert cache.get(model, 0.7, "prompt", 2000) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert stats["saved_output_tokens"] == 200
+    assert stats["saved_cost"] == pytest.approx((1000 * 0.25 + 200 * 1.25) / 1_000_000)
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    now = [1000.0]
+    cache = ResponseCache(tmp_path / "cache.db", ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+
+    cache.put("m", 0.7, "a", _response("A"))
+    now[0] += 1
+    cache.put("m", 0.7, "b", _response("B"))
+    now[0] += 1
+    assert cache.get("m", 0.7, "a")["text"] == "A"  # "b" is now least recently used
+    cache.put("m", 0.7, "c", _response("C"))
+
+    assert len(cache) == 2
+    assert cache.get("m", 0.7, "b") is None
+    now[0] += 120
+    assert cache.get("m", 0.7, "a") is None
+
+
+def test_semantic_near_duplicate_hits(tmp_path):
+    vocabulary = ["remote", "work", "productivity", "hiring", "tips"]
+
+    def encoder(texts):
+        return np.array([[text.lower().split().count(word) for word in vocabulary] for text in texts], dtype=float)
+
+    cache = ResponseCache(tmp_path / "cache.db", semantic_threshold=0.9, encoder=encoder)
+    cache.put("m", 0.7, "remote work productivity tips", _response("post"))
+
+    hit = cache.get("m", 0.7, "Some remote work productivity tips")
+    assert hit["text"] == "post" and hit["cache"] == "semantic"
+    assert cache.get("m", 0.7, "hiring tips") is None
+    assert cache.stats()["semantic_hits"] == 1
+
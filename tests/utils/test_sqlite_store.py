@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from src.utils import sqlite_store
+from src.utils.sqlite_store import SQLiteStore, migrate_json_to_sqlite
+from src.utils.storage import JsonlStore, open_store
+
+
+def test_append_and_filter(tmp_path):
+    store = SQLiteStore(tmp_path / "lift.db", source="data/feedback.json")
+    store.extend("metrics_history", [
+        {"n": i, "content_type": "text" if i % 2 else "media", "timestamp": f"2025-01-{i + 1:02d}T00:00:00"}
+        for i in range(6)
+    ])
+    store.append("feedback_history", {"n": 99, "content_type": "text", "content_id": 7})
+
+    assert [entry["n"] for entry in store.iter("metrics_history")] == list(range(6))
+    assert [entry["n"] for entry in store.iter("metrics_history", content_type="text")] == [1, 3, 5]
+    assert [entry["n"] for entry in store.iter("metrics_history", since="2025-01-02", until="2025-01-05")] == [1, 2, 3]
+    assert [entry["n"] for entry in store.iter("feedback_history", content_id=7)] == [99]
+    assert store.count("metrics_history") == 6
+
+    # Stores for other documents share the tables but not the rows
+    assert SQLiteStore(tmp_path / "lift.db", source="feedback_data/feedback.json").count("feedback") == 0
+
+
+def test_time_window_queries_use_an_index(tmp_path):
+    store = SQLiteStore(tmp_path / "lift.db", source="data/feedback.json")
+    plan = store._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT payload FROM metrics_history "
+        "WHERE source = ? AND content_type = ? AND timestamp >= ?",
+        ("data/feedback.json", "text", "2025-01-01")
+    ).fetchall()
+    assert any("USING INDEX" in row[-1] for row in plan)
+
+
+def test_migration_is_idempotent(tmp_path):
+    legacy = tmp_path / "feedback.json"
+    legacy.write_text(json.dumps({
+        "feedback_history": [{"n": 1, "content_type": "text"}],
+        "metrics_history": [{"n": 2, "content_type": "text"}, {"n": 3, "content_type": "media"}]
+    }))
+    sources = {str(legacy): ["feedback_history", "metrics_history"]}
+
+    first = migrate_json_to_sqlite(tmp_path / "lift.db", sources)
+    second = migrate_json_to_sqlite(tmp_path / "lift.db", sources)
+
+    store = SQLiteStore(tmp_path / "lift.db", source=str(legacy))
+    assert sum(first.values()) == 3 and second == {}
+    assert [entry["n"] for entry in store.iter("metrics_history")] == [2, 3]
+
+
+
+def test_migration_reads_the_json_in_place_and_keys_on_its_resolved_path(tmp_path, monkeypatch):
+    legacy = tmp_path / "feedback.json"
+    legacy.write_text(json.dumps({"metrics_history": [{"n": 1}, {"n": 2}]}))
+
+    first = migrate_json_to_sqlite(tmp_path / "lift.db", {str(legacy): ["metrics_history"]})
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith("feedback")] == ["feedback.json"]
+
+    # The same document spelled relative to another working directory
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+    second = migrate_json_to_sqlite(tmp_path / "lift.db", {"../feedback.json": ["metrics_history"]})
+
+    assert sum(first.values()) == 2 and second == {}
+    assert SQLiteStore(tmp_path / "lift.db", source="../feedback.json").count("metrics_history") == 2
+
+
+def test_interrupted_migration_leaves_no_rows_to_duplicate(tmp_path, monkeypatch):
+    legacy = tmp_path / "feedback.json"
+    legacy.write_text(json.dumps({"metrics_history": [{"n": i} for i in range(2500)]}))
+    sources = {str(legacy): ["metrics_history"]}
+    read_entries = sqlite_store._legacy_entries
+
+    def interrupted(json_path, stream):
+        for i, entry in enumerate(read_entries(json_path, stream)):
+            if i == 2100:
+                raise KeyboardInterrupt
+            yield entry
+
+    monkeypatch.setattr(sqlite_store, "_legacy_entries", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        migrate_json_to_sqlite(tmp_path / "lift.db", sources)
+    store = SQLiteStore(tmp_path / "lift.db", source=str(legacy))
+    assert store.count("metrics_history") == 0 and not store.is_migrated("metrics_history")
+
+    monkeypatch.setattr(sqlite_store, "_legacy_entries", read_entries)
+    assert migrate_json_to_sqlite(tmp_path / "lift.db", sources) == {store.source + ":metrics_history": 2500}
+    assert [entry["n"] for entry in store.iter("metrics_history")] == list(range(2500))
+
+def test_open_store_selects_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("LIFT_STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("LIFT_SQLITE_PATH", str(tmp_path / "lift.db"))
+    assert isinstance(open_store(tmp_path / "feedback.json"), SQLiteStore)
+
+    monkeypatch.setenv("LIFT_STORAGE_BACKEND", "jsonl")
+    assert isinstance(open_store(tmp_path / "feedback.json"), JsonlStore)
@@ -0,0 +1,108 @@
+import gc
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from src.utils.storage import AppendOnlyLog, JsonlStore, update_json
+
+
+def test_append_and_stream_in_order(tmp_path):
+    log = AppendOnlyLog(tmp_path / "history", fsync_every=4)
+    for i in range(10):
+        log.append({"i": i, "content_type": "text" if i % 2 else "article"})
+    log.extend([{"i": 10}, {"i": 11}])
+
+    assert [entry["i"] for entry in log] == list(range(12))
+    assert [entry["i"] for entry in log.iter_entries(lambda e: e.get("content_type") == "text")] == [1, 3, 5, 7, 9]
+    assert log.count() == 12
+
+
+def test_compaction_keeps_every_entry_once(tmp_path):
+    log = AppendOnlyLog(tmp_path / "history", compact_bytes=200)
+    for i in range(50):
+        log.append({"i": i})
+    log.compact()
+    log.append({"i": 50})
+
+    assert [entry["i"] for entry in AppendOnlyLog(tmp_path / "history")] == list(range(51))
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert len([name for name in names if ".snapshot-" in name]) == 1
+
+
+def test_count_sees_appends_and_compactions_by_other_writers(tmp_path):
+    log = AppendOnlyLog(tmp_path / "history")
+    other = AppendOnlyLog(tmp_path / "history")
+    log.extend([{"i": i} for i in range(3)])
+    assert log.count() == 3
+
+    other.extend([{"i": 3}, {"i": 4}])
+    assert log.count() == 5
+    other.compact()
+    other.append({"i": 5})
+    log.append({"i": 6})
+    assert log.count() == 7 and other.count() == 7
+
+
+def test_collected_logs_close_their_writer(tmp_path):
+    log = AppendOnlyLog(tmp_path / "history")
+    log.append({"i": 0})
+    fd = log._fd
+    del log
+    gc.collect()
+
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_reader_ignores_segments_left_by_interrupted_compaction(tmp_path):
+    base = tmp_path / "history"
+    (tmp_path / "history.snapshot-000001.jsonl").write_text('{"i": 0}\n{"i": 1}\n')
+    # Stale generation-0 segments that were already folded into snapshot 1
+    (tmp_path / "history.snapshot-000000.jsonl").write_text('{"i": 0}\n')
+    (tmp_path / "history.log-000000.jsonl").write_text('{"i": 1}\n')
+    (tmp_path / "history.log-000001.jsonl").write_text('{"i": 2}\n{"i": 3')
+
+    assert [entry["i"] for entry in AppendOnlyLog(base)] == [0, 1, 2]
+
+
+def test_store_imports_legacy_json_lists_once(tmp_path):
+    legacy = tmp_path / "feedback.json"
+    legacy.write_text(json.dumps({"metrics_history": [{"content_type": "text", "n": 1}]}))
+
+    store = JsonlStore(legacy)
+    store.append("metrics_history", {"content_type": "media", "n": 2})
+    store.flush()
+
+    reopened = JsonlStore(legacy)
+    assert [entry["n"] for entry in reopened.iter("metrics_history")] == [1, 2]
+    assert [entry["n"] for entry in reopened.iter("metrics_history", content_type="media")] == [2]
+    assert (tmp_path / "feedback.metrics_history.snapshot-000000.jsonl").exists()
+
+
+def _increment(data):
+    data["count"] += 1
+    return data
+
+
+def _concurrent_writer(workdir, writer_id):
+    log = AppendOnlyLog(workdir / "history", compact_bytes=2048)
+    for seq in range(100):
+        log.append({"writer": writer_id, "seq": seq})
+        if seq % 10 == 0:
+            update_json(workdir / "counter.json", _increment, default={"count": 0})
+    log.close()
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    workers = [multiprocessing.Process(target=_concurrent_writer, args=(tmp_path, i)) for i in range(6)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    entries = [(entry["writer"], entry["seq"]) for entry in AppendOnlyLog(tmp_path / "history")]
+    assert sorted(entries) == [(i, seq) for i in range(6) for seq in range(100)]
+    assert json.loads((tmp_path / "counter.json").read_text())["count"] == 60
+    assert not list(tmp_path.glob("*.tmp"))